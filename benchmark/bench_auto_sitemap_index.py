@@ -0,0 +1,41 @@
+import time
+import tempfile
+import datetime
+import argparse
+from pathlib import Path
+from sitemap import Sitemap, Host, AutoSitemapIndex
+
+#AutoSitemapIndex.save_files を逐次実行した場合と並行実行した場合の所要時間を比較します。
+
+def build_sitemaps (root_dir:Path, sitemap_count:int, url_count:int) -> list[Sitemap]:
+  sitemaps = []
+  for sitemap_index in range(sitemap_count):
+    sitemap = Sitemap(root_dir.joinpath("sitemap-{:d}.xml".format(sitemap_index)))
+    for url_index in range(url_count):
+      sitemap.register("http://www.example.com/{:d}/page-{:d}.html".format(sitemap_index, url_index), last_mod=datetime.datetime(2025, 1, 23))
+    sitemaps.append(sitemap)
+  return sitemaps
+
+def measure (sitemaps:list[Sitemap], root_dir:Path, workers:int|None) -> float:
+  host = Host("http", "www.example.com", root_dir)
+  auto_sitemap_index = AutoSitemapIndex(host, root_dir.joinpath("sitemap-index.xml"), sitemaps, workers=workers)
+  start = time.perf_counter()
+  auto_sitemap_index.save_files()
+  return time.perf_counter() - start
+
+def main ():
+  parser = argparse.ArgumentParser()
+  parser.add_argument("--sitemaps", type=int, default=500)
+  parser.add_argument("--urls", type=int, default=1000)
+  args = parser.parse_args()
+  with tempfile.TemporaryDirectory() as temp_dir:
+    root_dir = Path(temp_dir)
+    sitemaps = build_sitemaps(root_dir, args.sitemaps, args.urls)
+    for workers in (1, None):
+      elapsed = measure(sitemaps, root_dir, workers)
+      print("workers={:>4s}: {:.3f}s".format(str(workers), elapsed))
+    for sitemap in sitemaps:
+      sitemap.close()
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,47 @@
+import os
+import time
+import tempfile
+import datetime
+import argparse
+from pathlib import Path
+from sitemap import Sitemap, Host, DirectoryScanner
+
+#ディレクトリを手作業で走査して登録する場合と DirectoryScanner を用いる場合の所要時間を比較します。
+
+def build_tree (root_dir:Path, file_count:int, files_per_dir:int):
+  for index in range(file_count):
+    dir_index = index // files_per_dir
+    dir_path = root_dir.joinpath("section-{:d}".format(dir_index % 100), "dir-{:d}".format(dir_index))
+    if index % files_per_dir == 0:
+      dir_path.mkdir(parents=True, exist_ok=True)
+    dir_path.joinpath("page-{:d}.html".format(index)).touch()
+
+def manual_scan (host:Host, sitemap:Sitemap):
+  for dir_path, dir_names, file_names in os.walk(host.root_dir):
+    for file_name in file_names:
+      file = Path(dir_path, file_name)
+      last_mod = datetime.datetime.fromtimestamp(file.stat().st_mtime)
+      sitemap.register(host.path_to_url(file), last_mod)
+
+def measure (label:str, function):
+  start = time.perf_counter()
+  function()
+  print("{:<24s}: {:.3f}s".format(label, time.perf_counter() - start))
+
+def main ():
+  parser = argparse.ArgumentParser()
+  parser.add_argument("--files", type=int, default=1000000)
+  parser.add_argument("--files-per-dir", type=int, default=500)
+  args = parser.parse_args()
+  with tempfile.TemporaryDirectory() as temp_dir:
+    root_dir = Path(temp_dir)
+    build_tree(root_dir, args.files, args.files_per_dir)
+    host = Host("http", "www.example.com", root_dir)
+    with Sitemap(root_dir.joinpath("sitemap.xml")) as sitemap:
+      measure("manual", lambda: manual_scan(host, sitemap))
+    for workers in (1, 8):
+      with Sitemap(root_dir.joinpath("sitemap.xml")) as sitemap:
+        measure("DirectoryScanner (x{:d})".format(workers), lambda: DirectoryScanner(host, workers=workers).register_to(sitemap))
+
+if __name__ == "__main__":
+  main()
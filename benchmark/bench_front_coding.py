@@ -0,0 +1,45 @@
+import time
+import random
+import argparse
+import tracemalloc
+from sitemap import FrontCodedStrings
+from corpus import Corpus
+
+#Corpus が生成する URL を str のリストとして保持した場合と、FrontCodedStrings で保持した場合のメモリの使用量と所要時間を比較します。
+#
+#  python benchmark/bench_front_coding.py --size 10000000
+
+def measure_memory (label:str, function):
+  tracemalloc.start()
+  start = time.perf_counter()
+  result = function()
+  elapsed = time.perf_counter() - start
+  current, _ = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  print("{:<28s}: {:8.1f}MiB {:.3f}s".format(label, current / 1024 / 1024, elapsed))
+  return result, current
+
+def measure (label:str, function, count:int):
+  start = time.perf_counter()
+  function()
+  elapsed = time.perf_counter() - start
+  print("{:<28s}: {:.3f}s ({:.0f} ops/s)".format(label, elapsed, count / elapsed))
+
+def main ():
+  parser = argparse.ArgumentParser()
+  parser.add_argument("--size", type=int, default=1000000)
+  parser.add_argument("--block-size", type=int, default=16)
+  parser.add_argument("--lookups", type=int, default=100000)
+  args = parser.parse_args()
+  locs = sorted(url.loc for url in Corpus(args.size).urls())
+  print("{:d} urls, {:.1f} bytes/url on average".format(len(locs), sum(map(len, locs)) / len(locs)))
+  #各要素を複製し、list[str] 自体が保持する文字列のメモリを計測します。
+  _, list_bytes = measure_memory("list[str]", lambda: [loc.encode("utf-8").decode("utf-8") for loc in locs])
+  front_coded_locs, front_coded_bytes = measure_memory("FrontCodedStrings", lambda: FrontCodedStrings(locs, args.block_size))
+  print("{:<28s}: {:.1f}%".format("ratio", front_coded_bytes / list_bytes * 100))
+  measure("sequential decode", lambda: sum(1 for _ in front_coded_locs), len(front_coded_locs))
+  targets = random.Random(0).sample(locs, min(args.lookups, len(locs)))
+  measure("binary search", lambda: [front_coded_locs.index(target) for target in targets], len(targets))
+
+if __name__ == "__main__":
+  main()
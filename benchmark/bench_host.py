@@ -0,0 +1,40 @@
+import time
+import argparse
+import urllib.parse
+from pathlib import Path
+from sitemap import Host
+
+#Host.path_to_url の変更前の実装と、ファイルシステムを用いない変換およびまとめて変換する場合の所要時間を比較します。
+
+def legacy_path_to_url (host:Host, path:Path|str) -> str:
+  if Path(path) == host.root_dir:
+    path_str = "/"
+  else:
+    path_str = Path("/").joinpath(Path(path).relative_to(host.root_dir)).as_posix()
+    if Path(path).is_dir():
+      path_str += "/"
+  return urllib.parse.urlunparse((host.scheme, host.netloc, path_str, "", "", ""))
+
+def build_paths (count:int) -> list[str]:
+  return ["./public/category-{:d}/item-{:d}/page-{:d}.html".format(index % 50, index % 1000, index) for index in range(count)]
+
+def measure (label:str, function, paths:list[str]):
+  start = time.perf_counter()
+  function(paths)
+  elapsed = time.perf_counter() - start
+  print("{:<24s}: {:.3f}s ({:.0f} paths/s)".format(label, elapsed, len(paths) / elapsed))
+
+def main ():
+  parser = argparse.ArgumentParser()
+  parser.add_argument("--paths", type=int, default=200000)
+  args = parser.parse_args()
+  paths = build_paths(args.paths)
+  host = Host("http", "www.example.com", "./public")
+  pure_host = Host("http", "www.example.com", "./public", use_filesystem=False)
+  measure("legacy", lambda paths: [legacy_path_to_url(host, path) for path in paths], paths)
+  measure("path_to_url", lambda paths: [host.path_to_url(path) for path in paths], paths)
+  measure("path_to_url (pure)", lambda paths: [pure_host.path_to_url(path) for path in paths], paths)
+  measure("paths_to_urls (pure)", lambda paths: list(pure_host.paths_to_urls(paths)), paths)
+
+if __name__ == "__main__":
+  main()
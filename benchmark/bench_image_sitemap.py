@@ -0,0 +1,51 @@
+import time
+import resource
+import tempfile
+import argparse
+from pathlib import Path
+from sitemap import ImageSitemap
+
+#ImageSitemap の登録・保存に要する時間と、ストアの大きさを計測します。
+
+LICENSES = [
+  "https://creativecommons.org/licenses/by/4.0/",
+  "https://creativecommons.org/licenses/by-sa/4.0/",
+  "https://www.example.com/license.html",
+]
+
+GEO_LOCATIONS = [
+  "Tokyo, Japan",
+  "Osaka, Japan",
+  "Kyoto, Japan",
+]
+
+def register (image_sitemap:ImageSitemap, page_count:int, images_per_page:int):
+  for page_index in range(page_count):
+    loc = "https://www.example.com/products/category-{:d}/item-{:08d}.html".format(page_index % 100, page_index)
+    for image_index in range(images_per_page):
+      image_loc = "https://cdn.example.com/img/{:08d}-{:02d}.jpg".format(page_index, image_index)
+      image_sitemap.register(loc, image_loc, image_caption="caption {:d}".format(image_index), image_geo_location=GEO_LOCATIONS[page_index % len(GEO_LOCATIONS)], image_license=LICENSES[image_index % len(LICENSES)])
+
+def store_size (image_sitemap:ImageSitemap) -> int:
+  page_count, = image_sitemap._connection.execute("PRAGMA page_count").fetchone()
+  page_size, = image_sitemap._connection.execute("PRAGMA page_size").fetchone()
+  return page_count * page_size
+
+def main ():
+  parser = argparse.ArgumentParser()
+  parser.add_argument("--pages", type=int, default=1000000)
+  parser.add_argument("--images-per-page", type=int, default=20)
+  args = parser.parse_args()
+  with tempfile.TemporaryDirectory() as temp_dir:
+    with ImageSitemap(Path(temp_dir).joinpath("image-sitemap.xml")) as image_sitemap:
+      start = time.perf_counter()
+      register(image_sitemap, args.pages, args.images_per_page)
+      print("register  : {:.3f}s".format(time.perf_counter() - start))
+      print("store size: {:.1f}MiB".format(store_size(image_sitemap) / 1024 / 1024))
+      start = time.perf_counter()
+      image_sitemap_files = image_sitemap.save_files()
+      print("save_files: {:.3f}s ({:d} files)".format(time.perf_counter() - start, len(image_sitemap_files)))
+  print("peak RSS  : {:.1f}MiB".format(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024))
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,96 @@
+import random
+import datetime
+from typing import Iterator
+from sitemap.sitemap import URL, ChangeFreq
+
+#ベンチマークに用いる決定的な合成データを生成します。
+#同じ seed を与えれば常に同じデータが同じ順序で生成されます。
+
+WORDS = [
+  "about", "account", "archive", "article", "blog", "brand", "camera", "category", "collection", "contact",
+  "download", "event", "feature", "garden", "guide", "help", "history", "item", "journal", "kitchen",
+  "library", "market", "media", "news", "outdoor", "product", "profile", "release", "review", "sale",
+  "service", "shop", "special", "sport", "store", "support", "topic", "travel", "update", "video",
+]
+
+GEO_LOCATIONS = ["", "", "", "Tokyo, Japan", "Osaka, Japan", "Limerick, Ireland", "Seattle, USA"]
+
+LICENSES = ["", "", "https://creativecommons.org/licenses/by/4.0/", "https://www.example.com/license.html"]
+
+#パス要素の数の分布です。実際のサイトに近づけるため 2〜4 階層が多くなるよう重み付けしています。
+SEGMENT_COUNTS = [1, 2, 3, 4, 5, 6]
+SEGMENT_COUNT_WEIGHTS = [5, 25, 35, 20, 10, 5]
+
+#ページあたりの画像の数の分布です。
+IMAGE_COUNTS = [1, 2, 3, 5, 10, 20, 50]
+IMAGE_COUNT_WEIGHTS = [30, 20, 15, 15, 10, 7, 3]
+
+BASE_LAST_MOD = datetime.datetime(2025, 1, 1)
+
+class Corpus:
+
+  """ベンチマーク用の決定的な合成データを生成するクラスです。
+
+  Parameters
+  ----------
+  size : int
+    生成するレコードの数です。
+  seed : int
+    乱数の種です。
+  """
+
+  def __init__ (self, size:int, seed:int=0):
+    self.size = size
+    self.seed = seed
+
+  def _segment (self, rng:random.Random) -> str:
+    return "-".join(rng.choices(WORDS, k=rng.randint(1, 3)))
+
+  def _loc (self, rng:random.Random, index:int) -> str:
+    segment_count, = rng.choices(SEGMENT_COUNTS, SEGMENT_COUNT_WEIGHTS)
+    segments = [self._segment(rng) for _ in range(segment_count -1)]
+    segments.append("{:s}-{:d}.html".format(self._segment(rng), index))
+    return "https://www.example.com/" + "/".join(segments)
+
+  def _sentence (self, rng:random.Random) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(3, 15))).capitalize() + "."
+
+  def urls (self) -> Iterator[URL]:
+
+    """`Sitemap` に登録するページ情報を生成します。"""
+
+    rng = random.Random(self.seed)
+    change_freqs = list(ChangeFreq)
+    for index in range(self.size):
+      last_mod = BASE_LAST_MOD + datetime.timedelta(minutes=rng.randrange(365 * 24 * 60))
+      priority = rng.choice([0.5, 0.5, 0.5, 0.8, 1.0])
+      change_freq = rng.choice(change_freqs)
+      yield URL(self._loc(rng, index), last_mod, priority, change_freq)
+
+  def images (self) -> Iterator[tuple[str, str, str, str, str, str]]:
+
+    """`ImageSitemap.register` の引数となる画像情報を生成します。
+
+    Notes
+    -----
+    `size` はページの数を表し、各ページには分布に従った数の画像が生成されます。
+    """
+
+    rng = random.Random(self.seed)
+    for index in range(self.size):
+      loc = self._loc(rng, index)
+      image_count, = rng.choices(IMAGE_COUNTS, IMAGE_COUNT_WEIGHTS)
+      for image_index in range(image_count):
+        image_loc = "https://cdn.example.com/img/{:d}/{:s}-{:d}.jpg".format(index % 1000, self._segment(rng), image_index)
+        image_caption = self._sentence(rng) if rng.random() < 0.7 else ""
+        image_title = self._sentence(rng) if rng.random() < 0.3 else ""
+        yield (loc, image_loc, image_caption, rng.choice(GEO_LOCATIONS), image_title, rng.choice(LICENSES))
+
+  def sitemaps (self) -> Iterator[tuple[str, datetime.datetime]]:
+
+    """`SitemapIndex` に登録するサイトマップ情報を生成します。"""
+
+    rng = random.Random(self.seed)
+    for index in range(self.size):
+      last_mod = BASE_LAST_MOD + datetime.timedelta(minutes=rng.randrange(365 * 24 * 60))
+      yield ("https://www.example.com/sitemaps/{:s}/sitemap-{:d}.xml".format(self._segment(rng), index), last_mod)
@@ -0,0 +1,175 @@
+import sys
+import json
+import time
+import resource
+import tempfile
+import argparse
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from sitemap import Sitemap, ImageSitemap, SitemapIndex, Host, AutoSitemapIndex
+from corpus import Corpus
+
+#Sitemap, ImageSitemap, SitemapIndex, AutoSitemapIndex の各処理の所要時間、最大 RSS、書き込まれたバイト数を計測し、
+#保存されたベースラインと比較します。
+#各ケースはピーク RSS を正しく計測するため、それぞれ独立したプロセスで実行されます。
+#
+#  python benchmark/run.py --scale 10k --save-baseline
+#  python benchmark/run.py --scale 10k
+
+SCALES = {
+  "10k": 10000,
+  "1m": 1000000,
+  "10m": 10000000,
+}
+
+BENCHMARK_DIR = Path(__file__).parent
+
+def peak_rss_bytes () -> int:
+  max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  if sys.platform == "darwin":
+    return max_rss
+  else:
+    return max_rss * 1024
+
+class Timer:
+
+  def __init__ (self):
+    self.phases = {}
+
+  def measure (self, name:str, function):
+    start = time.perf_counter()
+    result = function()
+    self.phases[name] = time.perf_counter() - start
+    return result
+
+def consume (iterator):
+  for _ in iterator:
+    pass
+
+def bytes_written (sitemap_files) -> int:
+  return sum(sitemap_file.file.stat().st_size for sitemap_file in sitemap_files)
+
+def load_files (loadable, sitemap_files):
+  for sitemap_file in sitemap_files:
+    with open(sitemap_file.file, "r", encoding="utf-8") as stream:
+      loadable.load(stream)
+
+def bench_sitemap (size:int, work_dir:Path) -> dict:
+  corpus = Corpus(size)
+  timer = Timer()
+  timer.measure("generate", lambda: consume(corpus.urls()))
+  with Sitemap(work_dir.joinpath("sitemap.xml")) as sitemap:
+    timer.measure("register", lambda: consume(sitemap.register(*url) for url in corpus.urls()))
+    timer.phases["register"] -= timer.phases["generate"]
+    timer.measure("list_all", sitemap.list_all)
+    sitemap_files = timer.measure("save_files", sitemap.save_files)
+  with Sitemap(work_dir.joinpath("loaded.xml")) as loaded_sitemap:
+    timer.measure("load", lambda: load_files(loaded_sitemap, sitemap_files))
+  return {"phases": timer.phases, "bytes_written": bytes_written(sitemap_files), "files": len(sitemap_files)}
+
+def bench_image_sitemap (size:int, work_dir:Path) -> dict:
+  corpus = Corpus(size)
+  timer = Timer()
+  timer.measure("generate", lambda: consume(corpus.images()))
+  with ImageSitemap(work_dir.joinpath("image-sitemap.xml")) as image_sitemap:
+    timer.measure("register", lambda: consume(image_sitemap.register(*image) for image in corpus.images()))
+    timer.phases["register"] -= timer.phases["generate"]
+    timer.measure("list_all", image_sitemap.list_all)
+    sitemap_files = timer.measure("save_files", image_sitemap.save_files)
+  with ImageSitemap(work_dir.joinpath("loaded.xml")) as loaded_image_sitemap:
+    timer.measure("load", lambda: load_files(loaded_image_sitemap, sitemap_files))
+  return {"phases": timer.phases, "bytes_written": bytes_written(sitemap_files), "files": len(sitemap_files)}
+
+def bench_sitemap_index (size:int, work_dir:Path) -> dict:
+  corpus = Corpus(size)
+  timer = Timer()
+  timer.measure("generate", lambda: consume(corpus.sitemaps()))
+  with SitemapIndex(work_dir.joinpath("sitemap-index.xml")) as sitemap_index:
+    timer.measure("register", lambda: consume(sitemap_index.register(*sitemap) for sitemap in corpus.sitemaps()))
+    timer.phases["register"] -= timer.phases["generate"]
+    timer.measure("list_all", sitemap_index.list_all)
+    sitemap_files = timer.measure("save_files", sitemap_index.save_files)
+  with SitemapIndex(work_dir.joinpath("loaded.xml")) as loaded_sitemap_index:
+    timer.measure("load", lambda: load_files(loaded_sitemap_index, sitemap_files))
+  return {"phases": timer.phases, "bytes_written": bytes_written(sitemap_files), "files": len(sitemap_files)}
+
+def bench_auto_sitemap_index (size:int, work_dir:Path) -> dict:
+  corpus = Corpus(size)
+  timer = Timer()
+  host = Host("https", "www.example.com", work_dir)
+  with Sitemap(work_dir.joinpath("sitemap.xml")) as sitemap, ImageSitemap(work_dir.joinpath("image-sitemap.xml")) as image_sitemap:
+    sitemap.register_many(corpus.urls())
+    for image in corpus.images():
+      image_sitemap.register(*image)
+    auto_sitemap_index = AutoSitemapIndex(host, work_dir.joinpath("sitemap-index.xml"), [sitemap, image_sitemap])
+    sitemap_files = timer.measure("save_files", auto_sitemap_index.save_files)
+  return {"phases": timer.phases, "bytes_written": bytes_written(sitemap_files), "files": len(sitemap_files)}
+
+CASES = {
+  "sitemap": bench_sitemap,
+  "image_sitemap": bench_image_sitemap,
+  "sitemap_index": bench_sitemap_index,
+  "auto_sitemap_index": bench_auto_sitemap_index,
+}
+
+def run_case (name:str, size:int) -> dict:
+  with tempfile.TemporaryDirectory() as temp_dir:
+    result = CASES[name](size, Path(temp_dir))
+  result["peak_rss_bytes"] = peak_rss_bytes()
+  return result
+
+def compare (results:dict, baseline:dict, tolerance:float) -> list[str]:
+  regressions = []
+  for name, result in results.items():
+    baseline_result = baseline.get(name)
+    if baseline_result is None:
+      continue
+    metrics = [("phases." + phase, seconds, baseline_result["phases"].get(phase)) for phase, seconds in result["phases"].items()]
+    metrics.append(("peak_rss_bytes", result["peak_rss_bytes"], baseline_result.get("peak_rss_bytes")))
+    metrics.append(("bytes_written", result["bytes_written"], baseline_result.get("bytes_written")))
+    for metric, value, baseline_value in metrics:
+      if not baseline_value:
+        continue
+      ratio = value / baseline_value
+      marker = ""
+      if 1.0 + tolerance < ratio:
+        marker = "  <-- regression"
+        regressions.append("{:s}.{:s}".format(name, metric))
+      print("{:<20s} {:<22s} {:>14.3f} {:>14.3f} {:>7.2f}x{:s}".format(name, metric, value, baseline_value, ratio, marker))
+  return regressions
+
+def main ():
+  parser = argparse.ArgumentParser()
+  parser.add_argument("--scale", choices=SCALES.keys(), default="10k")
+  parser.add_argument("--cases", nargs="+", choices=CASES.keys(), default=list(CASES.keys()))
+  parser.add_argument("--baseline", type=Path, default=None, help="default: benchmark/baseline-<scale>.json")
+  parser.add_argument("--save-baseline", action="store_true")
+  parser.add_argument("--output", type=Path, default=None)
+  parser.add_argument("--tolerance", type=float, default=0.1)
+  args = parser.parse_args()
+  size = SCALES[args.scale]
+  baseline_file = args.baseline or BENCHMARK_DIR.joinpath("baseline-{:s}.json".format(args.scale))
+  results = {}
+  for name in args.cases:
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+      results[name] = executor.submit(run_case, name, size).result()
+    phases = " ".join("{:s}={:.3f}s".format(phase, seconds) for phase, seconds in results[name]["phases"].items())
+    print("{:<20s} {:s} peak_rss={:.1f}MiB bytes_written={:d}".format(name, phases, results[name]["peak_rss_bytes"] / 1024 / 1024, results[name]["bytes_written"]))
+  report = {"scale": args.scale, "size": size, "results": results}
+  if args.output:
+    args.output.write_text(json.dumps(report, indent=2))
+  if args.save_baseline:
+    baseline_file.write_text(json.dumps(report, indent=2))
+    print("baseline saved to {:s}".format(str(baseline_file)))
+  elif baseline_file.exists():
+    baseline = json.loads(baseline_file.read_text())
+    regressions = compare(results, baseline["results"], args.tolerance)
+    if regressions:
+      print("regressions: {:s}".format(", ".join(regressions)))
+      sys.exit(1)
+  else:
+    print("no baseline found at {:s}; run with --save-baseline to record one".format(str(baseline_file)))
+
+if __name__ == "__main__":
+  main()
@@ -4,3 +4,5 @@ mkdir -v -p ./src/sitemap/static/xsd
 wget -v -O ./src/sitemap/static/xsd/sitemap.xsd https://www.sitemaps.org/schemas/sitemap/09/sitemap.xsd
 wget -v -O ./src/sitemap/static/xsd/sitemap-image.xsd https://www.google.com/schemas/sitemap-image/1.1/sitemap-image.xsd
 wget -v -O ./src/sitemap/static/xsd/siteindex.xsd https://www.sitemaps.org/schemas/sitemap/siteindex.xsd
+wget -v -O ./src/sitemap/static/xsd/sitemap-news.xsd https://www.google.com/schemas/sitemap-news/0.9/sitemap-news.xsd
+wget -v -O ./src/sitemap/static/xsd/sitemap-video.xsd https://www.google.com/schemas/sitemap-video/1.1/sitemap-video.xsd
@@ -1,7 +1,16 @@
 
 from .abc import ISitemap, ISitemapFile, ILoadable
-from .sitemap import ChangeFreq, Sitemap, SitemapFile
-from .image_sitemap import ImageSitemap, ImageSitemapFile
+from .sitemap import ChangeFreq, Alternate, Sitemap, SitemapFile, CompactURLs, iterparse_urls
+from .image_sitemap import ImageLimitPolicy, ImageSitemap, ImageSitemapFile
+from .page_sitemap import PageSitemap, PageSitemapFile
+from .extension import Extension, ExtensionSitemap, ExtensionSitemapFile
+from .news_sitemap import NewsSitemap
+from .video_sitemap import VideoSitemap
 from .sitemap_index import SitemapIndex, SitemapIndexFile
-from .host import Host
+from .host import Host, HostRegistry
 from .auto_sitemap_index import AutoSitemapIndex
+from .scanner import DirectoryScanner
+from .server import SitemapServer
+from .metrics import PhaseMetric, FileMetric, StoreMetric, IMetricsCollector, MetricsRecorder, CallbackMetricsCollector
+from .diff import ChangeType, Change, FeedEntry
+from .front_coding import FrontCodedStrings
@@ -1,5 +1,7 @@
 
+import datetime
 from io import TextIOBase
+from typing import BinaryIO
 from abc import ABC, abstractmethod
 from pathlib import Path
 
@@ -15,6 +17,36 @@ class ISitemapFile (ABC):
 
     pass
 
+  @property
+  @abstractmethod
+  def last_mod (self) -> datetime.datetime|None:
+
+    """登録されたサイトマップ情報のうち、最も新しい更新日時を返します。
+
+    Returns
+    -------
+    datetime.datetime|None
+      最も新しい更新日時です。
+      登録された情報が更新日時を持たない場合は `None` が返されます。
+    """
+
+    pass
+
+  @property
+  @abstractmethod
+  def digest (self) -> str|None:
+
+    """保存されたファイルの内容の SHA-256 ハッシュ値を返します。
+
+    Returns
+    -------
+    str|None
+      16 進数で表現されたハッシュ値です。
+      まだ保存されていなければ `None` が返されます。
+    """
+
+    pass
+
   @abstractmethod
   def save (self, use_indent:bool=False):
 
@@ -54,30 +86,35 @@ class ISitemap (ABC):
 
 class ILoadable (ABC):
 
-  """file-like, str オブジェクトから読み込んだ内容を自身に反映させるための規格を提供します。"""
+  """file-like, str, bytes オブジェクトやファイルパスから読み込んだ内容を自身に反映させるための規格を提供します。"""
 
   @abstractmethod
-  def load (self, stream:TextIOBase):
+  def load (self, stream:TextIOBase|BinaryIO|Path|str):
+
+    """file-like オブジェクトまたはファイルパスから読み込んだ内容を自身に反映させます。
 
-    """file-like オブジェクトから読み込んだ内容を自身に反映させます。
+    Notes
+    -----
+    バイナリの file-like オブジェクトやファイルパスが gzip で圧縮されている場合、その内容は逐次的に展開されながら読み込まれます。
 
     Parameters
     ----------
-    stream : TextIOBase
-      読み込み元となる file-like オブジェクトです。
+    stream : TextIOBase|BinaryIO|Path|str
+      読み込み元となる file-like オブジェクト、またはファイルパスです。
     """
 
     pass
 
   @abstractmethod
-  def loads (self, source:str):
+  def loads (self, source:str|bytes):
 
-    """str オブジェクトから読み込んだ内容を自身に反映させます。
+    """str, bytes オブジェクトから読み込んだ内容を自身に反映させます。
 
     Parameters
     ----------
-    source : str
-      読み込み元になる str オブジェクトです。
+    source : str|bytes
+      読み込み元になる str, bytes オブジェクトです。
+      bytes オブジェクトは gzip で圧縮されていても構いません。
     """
 
     pass
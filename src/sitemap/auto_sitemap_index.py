@@ -1,15 +1,24 @@
-
+import time
 import datetime
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from .abc import ISitemap, ISitemapFile
 from .host import Host
 from .sitemap_index import SitemapIndex
+from .metrics import IMetricsCollector, report_phase
+from .writer import MAX_ENTRIES_PER_FILE, MAX_BYTES_PER_FILE
 
 @dataclass
 class AutoSitemapIndex (ISitemap):
 
   """複数の ISitemap オブジェクトから自動的にサイトマップインデックスを作成します。
+
+  Notes
+  -----
+  サイトマップインデックスに記録される <lastmod> には、各ファイルに記録された情報のうち最も新しい更新日時が用いられます。
+  更新日時を持たないファイル (画像サイトマップなど) はファイルの更新日時が用いられますが、
+  内容に変化のないファイルは再度書き込まれないため、その値は内容が変化した日時を表します。
   
   Attributes
   ----------
@@ -19,29 +28,89 @@ class AutoSitemapIndex (ISitemap):
     作成されたサイトマップインデックスの保存先となるファイルパスです。
   sitemaps : list[ISitemap]
     作成されるサイトマップインデックスが参照する `ISitemap` オブジェクトのリストです。
+  sitemap_indexes : list[SitemapIndex]
+    作成されるサイトマップインデックスに登録内容を追加する `SitemapIndex` オブジェクトのリストです。
+  nested : bool
+    サイトマップインデックスを入れ子の構成で保存するかを設定します。
+    真であれば各サイトマップは "sample-part.xml", "sample-part2.xml" のようなサイトマップインデックスに登録され、
+    `file` にはそれらのサイトマップインデックスを登録したサイトマップインデックスが保存されます。
+    未指定ならば `False` が設定されます。
+  max_count : int
+    一つのサイトマップインデックスのファイルに記録されるサイトマップの最大数です。
+    未指定ならば `50000` が設定されます。
+  max_bytes : int
+    一つのサイトマップインデックスのファイルの最大バイト数です。
+    未指定ならば `52428800` (50MiB) が設定されます。
+  workers : int|None
+    各サイトマップを並行して保存する際のスレッド数です。
+    `1` ならば各サイトマップは順番に保存されます。
+    未指定ならば `concurrent.futures.ThreadPoolExecutor` の既定値が用いられます。
+  metrics : IMetricsCollector|None
+    各処理の計測結果の報告先です。
+    指定された場合、各サイトマップの保存 ("save_sitemaps")、サイトマップインデックスへの登録 ("register_files") および全体 ("save_files") に要した時間と、
+    サイトマップインデックスの保存に関する計測結果が報告されます。
+    各サイトマップ自体の計測結果は、それぞれのオブジェクトに指定された報告先に報告されます。
+    未指定ならば計測は行われません。
   """
 
   host:Host
   file:Path
   sitemaps:list[ISitemap]
   sitemap_indexes:list[SitemapIndex] = field(default_factory=list)
+  nested:bool = False
+  max_count:int = MAX_ENTRIES_PER_FILE
+  max_bytes:int = MAX_BYTES_PER_FILE
+  workers:int|None = None
+  metrics:IMetricsCollector|None = None
 
   def __post_init__ (self):
     self.file = Path(self.file)
 
+  @staticmethod
+  def _last_mod (sitemap_file:ISitemapFile) -> datetime.datetime:
+    last_mod = sitemap_file.last_mod
+    if last_mod is None:
+      last_mod = datetime.datetime.fromtimestamp(sitemap_file.file.stat().st_mtime)
+    return last_mod
+
+  def _register_files (self, sitemap_index:SitemapIndex, sitemap_files:list[ISitemapFile]):
+    sitemap_index.register_many((self.host.path_to_url(sitemap_file.file), self._last_mod(sitemap_file)) for sitemap_file in sitemap_files)
+
+  def _save_sitemaps (self, use_indent:bool=False) -> list[ISitemapFile]:
+    if self.workers == 1:
+      saved_files = [sitemap.save_files(use_indent=use_indent) for sitemap in self.sitemaps]
+    else:
+      with ThreadPoolExecutor(max_workers=self.workers) as executor:
+        saved_files = list(executor.map(lambda sitemap: sitemap.save_files(use_indent=use_indent), self.sitemaps))
+    return [sitemap_file for sitemap_files in saved_files for sitemap_file in sitemap_files]
+
   def save_files (self, use_indent:bool=False) -> list[ISitemapFile]:
-    sitemap_index = SitemapIndex(self.file)
-    result = []
-    for sitemap in self.sitemaps:
-      for sitemap_file in sitemap.save_files(use_indent=use_indent):
-        loc = self.host.path_to_url(sitemap_file.file)
-        last_mod = datetime.datetime.fromtimestamp(sitemap_file.file.stat().st_mtime)
-        sitemap_index.register(loc, last_mod)
-        result.append(sitemap_file)
+    if self.metrics is not None:
+      start = time.perf_counter()
+    if self.nested:
+      index_file = self.file.with_stem("{:s}-part".format(self.file.stem))
+    else:
+      index_file = self.file
+    sitemap_index = SitemapIndex(index_file, max_count=self.max_count, max_bytes=self.max_bytes, metrics=self.metrics)
+    if self.metrics is not None:
+      phase_start = time.perf_counter()
+    result = self._save_sitemaps(use_indent=use_indent)
+    if self.metrics is not None:
+      report_phase(self.metrics, self.file, "save_sitemaps", phase_start, len(result))
+      phase_start = time.perf_counter()
+    self._register_files(sitemap_index, result)
     for sindex in self.sitemap_indexes:
-      for loc, last_mod in sindex.list_all():
-        sitemap_index.register(loc, last_mod)
+      sitemap_index.register_many(sindex.list_all())
+    if self.metrics is not None:
+      report_phase(self.metrics, self.file, "register_files", phase_start, len(result))
     saved_files = sitemap_index.save_files(use_indent=use_indent)
     result.extend(saved_files)
     sitemap_index.close()
+    if self.nested and saved_files:
+      root_sitemap_index = SitemapIndex(self.file, max_count=self.max_count, max_bytes=self.max_bytes, metrics=self.metrics)
+      self._register_files(root_sitemap_index, saved_files)
+      result.extend(root_sitemap_index.save_files(use_indent=use_indent))
+      root_sitemap_index.close()
+    if self.metrics is not None:
+      report_phase(self.metrics, self.file, "save_files", start, len(result))
     return result
@@ -0,0 +1,115 @@
+from enum import Enum
+from typing import NamedTuple, Generic, Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+class ChangeType (Enum):
+
+  """二つのサイトマップ間の差分の種類を表す列挙型です。"""
+
+  ADDED = "added"
+  REMOVED = "removed"
+  MODIFIED = "modified"
+
+class Change (NamedTuple, Generic[T]):
+
+  """二つのサイトマップ間の差分を表現します。
+
+  Attributes
+  ----------
+  change_type : ChangeType
+    差分の種類です。
+  loc : str
+    差分のあった URL です。
+  old : T|None
+    比較元の情報です。
+    `ChangeType.ADDED` ならば `None` になります。
+  new : T|None
+    比較先の情報です。
+    `ChangeType.REMOVED` ならば `None` になります。
+  """
+
+  change_type:ChangeType
+  loc:str
+  old:T|None
+  new:T|None
+
+class FeedEntry (NamedTuple, Generic[T]):
+
+  """サイトマップに記録された変更を表現します。
+
+  Attributes
+  ----------
+  sequence : int
+    変更の番号です。
+    変更が記録されるごとに単調に増加します。
+  loc : str
+    変更された URL です。
+  url : T|None
+    変更後の情報です。
+    削除された場合は `None` になります。
+  """
+
+  sequence:int
+  loc:str
+  url:T|None
+
+def _check_sorted (entries:Iterable[T], key:Callable[[T], str]) -> Iterator[T]:
+  previous = None
+  for entry in entries:
+    loc = key(entry)
+    if previous is not None and loc <= previous:
+      raise ValueError("{:s} is not sorted by loc.".format(loc))
+    previous = loc
+    yield entry
+
+def merge_diff (old:Iterable[T], new:Iterable[T], key:Callable[[T], str], equals:Callable[[T, T], bool]) -> Iterator[Change[T]]:
+
+  """URL 順に整列済みの二つの集合を一度だけ走査し、その差分を逐次返します。
+
+  Notes
+  -----
+  `old`, `new` はいずれも `key` の昇順に整列され、かつ重複が無い必要があります。
+  この条件が満たされない場合は走査中に `ValueError` が送出されます。
+
+  Parameters
+  ----------
+  old : Iterable[T]
+    比較元の情報です。
+  new : Iterable[T]
+    比較先の情報です。
+  key : Callable[[T], str]
+    情報から URL を取得する関数です。
+  equals : Callable[[T, T], bool]
+    URL が等しい二つの情報を比較し、内容に変更が無ければ `True` を返す関数です。
+
+  Returns
+  -------
+  Iterator[Change[T]]
+    URL 順に差分を返すイテレータです。
+  """
+
+  old_iterator = _check_sorted(old, key)
+  new_iterator = _check_sorted(new, key)
+  old_entry = next(old_iterator, None)
+  new_entry = next(new_iterator, None)
+  while old_entry is not None and new_entry is not None:
+    old_loc = key(old_entry)
+    new_loc = key(new_entry)
+    if old_loc < new_loc:
+      yield Change(ChangeType.REMOVED, old_loc, old_entry, None)
+      old_entry = next(old_iterator, None)
+    elif new_loc < old_loc:
+      yield Change(ChangeType.ADDED, new_loc, None, new_entry)
+      new_entry = next(new_iterator, None)
+    else:
+      if not equals(old_entry, new_entry):
+        yield Change(ChangeType.MODIFIED, old_loc, old_entry, new_entry)
+      old_entry = next(old_iterator, None)
+      new_entry = next(new_iterator, None)
+  while old_entry is not None:
+    yield Change(ChangeType.REMOVED, key(old_entry), old_entry, None)
+    old_entry = next(old_iterator, None)
+  while new_entry is not None:
+    yield Change(ChangeType.ADDED, key(new_entry), None, new_entry)
+    new_entry = next(new_iterator, None)
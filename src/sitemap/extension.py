@@ -0,0 +1,641 @@
+import time
+import typing
+import sqlite3
+import datetime
+import threading
+import importlib.resources
+import itertools
+from io import TextIOBase, StringIO, BytesIO
+from typing import NamedTuple, ClassVar, BinaryIO, Callable, Generic, Iterable, Iterator, TypeVar
+from pathlib import Path
+from xml.sax.saxutils import escape
+from xmlschema import XMLSchema
+from .abc import ISitemap, ISitemapFile, ILoadable
+from .store import Store
+from .loader import batched, decode_children, open_source
+from .metrics import IMetricsCollector, report_phase
+from .writer import MAX_ENTRIES_PER_FILE, MAX_BYTES_PER_FILE, SitemapWriter, render_element, render_text_element, write_files
+
+T = TypeVar("T", bound=tuple)
+
+_COLUMN_TYPES:dict[type, str] = {
+  str: "TEXT",
+  int: "INTEGER",
+  float: "REAL",
+  bool: "INTEGER",
+  datetime.datetime: "TEXT",
+}
+
+class ExtensionField (NamedTuple):
+
+  """拡張の要素に記録される一つの値の定義を表現します。
+
+  Attributes
+  ----------
+  name : str
+    レコード型の属性名です。ストアの列名としても用いられます。
+  path : tuple[str, ...]
+    拡張の要素から値を持つ要素までの、接頭辞を除いたタグ名の列です。
+  type : type
+    値の型です。`str`, `int`, `float`, `bool`, `datetime.datetime` のいずれかです。
+  required : bool
+    値が必須であるかを表します。
+  """
+
+  name:str
+  path:tuple[str, ...]
+  type:type
+  required:bool
+
+class Extension (Generic[T]):
+
+  """サイトマップの拡張 (<url> 直下に追加される名前空間付きの要素) を定義するクラスです。
+
+  Examples
+  --------
+  >>> class Article (NamedTuple):
+  ...   name:str
+  ...   language:str
+  ...   title:str|None = None
+  >>>
+  >>> extension = Extension(Article, "article", "http://www.example.com/schemas/article", paths={"name": "publication/name", "language": "publication/language"})
+
+  Notes
+  -----
+  拡張の内容はレコード型 (`NamedTuple`) の属性として一度だけ宣言されます。
+  各属性の型注釈から値の型と必須であるかが求められ、`X|None` と注釈された属性は省略可能な値として扱われます。
+  本クラスはその宣言から、ストアのテーブル定義、まとめて登録するための SQL 文、および変換処理を事前に生成します。
+
+  変換処理は宣言された要素の構造に従って生成された Python の関数であり、ストアから取得した行を直接文字列に変換します。
+  固定のタグは事前に連結されているため、変換時に行われる処理は値のエスケープと連結のみです。
+  要素は宣言された属性の順番で書き込まれるため、属性は XML スキーマの要素の順番通りに宣言される必要があります。
+
+  Parameters
+  ----------
+  record : type[T]
+    拡張の内容を表現するレコード型です。
+  prefix : str
+    拡張の名前空間の接頭辞です。
+  namespace : str
+    拡張の名前空間です。
+  tag : str|None
+    拡張の要素の、接頭辞を除いたタグ名です。
+    未指定ならば `prefix` と同じ値が設定されます。
+  paths : dict[str, str]|None
+    レコード型の属性名から、値を持つ要素までの "/" 区切りのパスへの対応です。
+    対応の無い属性は、拡張の要素直下にある属性名と同名の要素に記録されます。
+  key : str|None
+    一つのページに複数の要素を記録する場合に、要素を識別する属性名です。
+    未指定ならば一つのページには一つの要素のみが記録されます。
+  schema : str|None
+    読み込み時の検証に用いる XML スキーマの、パッケージ内でのパスです。
+    未指定ならば `load` メソッドは使用できません。
+  max_count : int
+    一つのファイルに記録されるページの最大数の既定値です。
+    未指定ならば `50000` が設定されます。
+
+  Raises
+  ------
+  TypeError
+    レコード型の属性に対応していない型が注釈されている場合に送出されます。
+  ValueError
+    `paths` または `key` にレコード型に存在しない属性名が指定された場合に送出されます。
+  """
+
+  def __init__ (self, record:type[T], prefix:str, namespace:str, tag:str|None=None, paths:dict[str, str]|None=None, key:str|None=None, schema:str|None=None, max_count:int=MAX_ENTRIES_PER_FILE):
+    paths = paths or {}
+    if not set(paths).issubset(record._fields) or (key is not None and key not in record._fields):
+      raise ValueError("paths and key must refer to fields of {:s}.".format(record.__name__))
+    self._record = record
+    self._prefix = prefix
+    self._namespace = namespace
+    self._tag = tag or prefix
+    self._key = key
+    self._schema_path = schema
+    self._schema = None
+    self._schema_lock = threading.Lock()
+    self._max_count = max_count
+    self._fields = []
+    hints = typing.get_type_hints(record)
+    for name in record._fields:
+      hint = hints[name]
+      arguments = typing.get_args(hint)
+      if type(None) in arguments and len(arguments) == 2:
+        value_type, = (argument for argument in arguments if argument is not type(None))
+        required = False
+      else:
+        value_type = hint
+        required = True
+      if value_type not in _COLUMN_TYPES:
+        raise TypeError("{:s}.{:s} has unsupported type {!r}.".format(record.__name__, name, hint))
+      self._fields.append(ExtensionField(name, tuple(paths.get(name, name).split("/")), value_type, required))
+    self._renderers = (self._compile_renderer(False), self._compile_renderer(True))
+
+  @property
+  def record (self) -> type[T]:
+
+    """拡張の内容を表現するレコード型を返します。"""
+
+    return self._record
+
+  @property
+  def fields (self) -> list[ExtensionField]:
+
+    """レコード型の属性の順番に並べた、各値の定義を返します。"""
+
+    return list(self._fields)
+
+  @property
+  def max_count (self) -> int:
+
+    """一つのファイルに記録されるページの最大数の既定値を返します。"""
+
+    return self._max_count
+
+  @property
+  def attributes (self) -> dict[str, str]:
+
+    """拡張を含むサイトマップのルート要素の属性を返します。"""
+
+    return {
+      "xmlns": "http://www.sitemaps.org/schemas/sitemap/0.9",
+      "xmlns:" + self._prefix: self._namespace,
+    }
+
+  @property
+  def schema (self) -> XMLSchema:
+
+    """読み込み時の検証に用いる XML スキーマを返します。
+
+    Notes
+    -----
+    XML スキーマは最初に参照された時点で構築されます。
+
+    Raises
+    ------
+    ValueError
+      XML スキーマのパスが指定されていない場合に送出されます。
+    """
+
+    if self._schema_path is None:
+      raise ValueError("{:s} has no XML schema.".format(self._record.__name__))
+    with self._schema_lock:
+      if self._schema is None:
+        schema = XMLSchema(importlib.resources.files("sitemap").joinpath("static/xsd/sitemap.xsd"), build=False)
+        schema.add_schema(importlib.resources.files("sitemap").joinpath(self._schema_path))
+        schema.build()
+        self._schema = schema
+      return self._schema
+
+  def _create_sql (self) -> list[str]:
+    columns = "".join(", \"{:s}\" {:s}".format(field.name, _COLUMN_TYPES[field.type]) for field in self._fields)
+    if self._key is None:
+      index = "CREATE UNIQUE INDEX record_page_id ON record(page_id)"
+    else:
+      index = "CREATE UNIQUE INDEX record_page_id_key ON record(page_id, \"{:s}\")".format(self._key)
+    return [
+      "CREATE TABLE page(id INTEGER PRIMARY KEY AUTOINCREMENT, loc TEXT)",
+      "CREATE UNIQUE INDEX page_loc ON page(loc)",
+      "CREATE TABLE record(id INTEGER PRIMARY KEY AUTOINCREMENT, page_id INTEGER REFERENCES page(id){:s})".format(columns),
+      index,
+    ]
+
+  def _register_sql (self) -> str:
+    names = ", ".join("\"{:s}\"".format(field.name) for field in self._fields)
+    values = ", ".join("?" for field in self._fields)
+    if self._key is None:
+      conflict = "page_id"
+    else:
+      conflict = "page_id, \"{:s}\"".format(self._key)
+    updates = ", ".join("\"{0:s}\" = excluded.\"{0:s}\"".format(field.name) for field in self._fields if field.name != self._key)
+    return "INSERT INTO record(page_id, {:s}) VALUES((SELECT id FROM page WHERE loc == ?), {:s}) ON CONFLICT({:s}) DO UPDATE SET {:s}".format(names, values, conflict, updates)
+
+  def _select_sql (self) -> str:
+    names = "".join(", record.\"{:s}\"".format(field.name) for field in self._fields)
+    return "SELECT page.loc{:s} FROM page INNER JOIN record ON record.page_id = page.id".format(names)
+
+  def to_row (self, record:T) -> tuple:
+
+    """レコードを、ストアに記録される値の組に変換します。"""
+
+    row = []
+    for field, value in zip(self._fields, record):
+      if value is None:
+        if field.required:
+          raise ValueError("{:s}.{:s} is required.".format(self._record.__name__, field.name))
+        row.append(None)
+      elif field.type is datetime.datetime:
+        row.append(value.isoformat())
+      elif field.type is bool:
+        row.append(int(value))
+      else:
+        row.append(value)
+    return tuple(row)
+
+  def from_row (self, row:Iterable) -> T:
+
+    """ストアに記録された値の組を、レコードに変換します。"""
+
+    values = []
+    for field, value in zip(self._fields, row):
+      if value is None:
+        values.append(None)
+      elif field.type is datetime.datetime:
+        values.append(datetime.datetime.fromisoformat(value))
+      elif field.type is bool:
+        values.append(bool(value))
+      else:
+        values.append(value)
+    return self._record._make(values)
+
+  def decode (self, element:dict) -> tuple:
+
+    """XML スキーマにより変換された拡張の要素を、ストアに記録される値の組に変換します。
+
+    Raises
+    ------
+    ValueError
+      必須の値を持つ要素が存在しない場合に送出されます。
+    """
+
+    row = []
+    for field in self._fields:
+      value = element
+      for tag in field.path:
+        if isinstance(value, list):
+          value = value[0]
+        if isinstance(value, dict):
+          value = value.get(self._prefix + ":" + tag)
+        if value is None:
+          break
+      if isinstance(value, dict):
+        value = value.get("$")
+      if value is None or value == "":
+        if field.required:
+          raise ValueError()
+        row.append(None)
+      elif field.type is datetime.datetime:
+        row.append(datetime.datetime.fromisoformat(str(value)).isoformat())
+      elif field.type is bool:
+        row.append(int(value in ("yes", "true", True)))
+      else:
+        row.append(field.type(value))
+    return tuple(row)
+
+  def _compile_renderer (self, use_indent:bool) -> Callable[[tuple], str]:
+
+    def indent (level:int) -> str:
+      if use_indent:
+        return "\n" + "  " * level
+      else:
+        return ""
+
+    def value_expression (index:int, value_type:type) -> str:
+      if value_type is str:
+        return "escape(row[{:d}])".format(index)
+      elif value_type is bool:
+        return "(\"yes\" if row[{:d}] else \"no\")".format(index)
+      elif value_type is datetime.datetime:
+        return "row[{:d}]".format(index)
+      else:
+        return "str(row[{:d}])".format(index)
+
+    def qualified (tag:str) -> str:
+      return self._prefix + ":" + tag
+
+    lines = ["def render (row):", "  parts = []"]
+
+    def emit (fields:list[tuple[int, ExtensionField]], depth:int, level:int, code_indent:str):
+      for tag, group in itertools.groupby(fields, key=lambda item: item[1].path[depth]):
+        group = list(group)
+        if len(group) == 1 and len(group[0][1].path) == depth +1:
+          index, field = group[0]
+          expression = "{!r} + {:s} + {!r}".format(indent(level) + "<" + qualified(tag) + ">", value_expression(index, field.type), "</" + qualified(tag) + ">")
+          if field.required:
+            lines.append("{:s}parts.append({:s})".format(code_indent, expression))
+          else:
+            lines.append("{:s}if row[{:d}] is not None:".format(code_indent, index))
+            lines.append("{:s}  parts.append({:s})".format(code_indent, expression))
+        else:
+          inner_indent = code_indent
+          if not any(field.required for _, field in group):
+            lines.append("{:s}if {:s}:".format(code_indent, " or ".join("row[{:d}] is not None".format(index) for index, _ in group)))
+            inner_indent = code_indent + "  "
+          lines.append("{:s}parts.append({!r})".format(inner_indent, indent(level) + "<" + qualified(tag) + ">"))
+          emit(group, depth +1, level +1, inner_indent)
+          lines.append("{:s}parts.append({!r})".format(inner_indent, indent(level) + "</" + qualified(tag) + ">"))
+
+    emit([(index, field._replace(path=(self._tag,) + field.path)) for index, field in enumerate(self._fields)], 0, 2, "  ")
+    lines.append("  return \"\".join(parts)")
+    namespace = {"escape": escape}
+    exec("\n".join(lines), namespace)
+    return namespace["render"]
+
+  def render_url (self, entry:tuple[str, list[tuple]], use_indent:bool=False) -> bytes:
+
+    """ページの URL と、そのページに記録された値の組のリストを <url> 要素に変換します。
+
+    Arguments
+    ---------
+    entry : tuple[str, list[tuple]]
+      ページの URL と、ストアに記録された値の組のリストの組です。
+    use_indent : bool
+      インデントを用いるかを設定します。
+
+    Returns
+    -------
+    bytes
+      UTF-8 で符号化された <url> 要素です。
+    """
+
+    loc, rows = entry
+    children = [render_text_element("loc", loc, use_indent, 2)]
+    children.extend(map(self._renderers[use_indent], rows))
+    return render_element("url", children, use_indent, 1).encode("utf-8")
+
+class ExtensionSitemapFile (ISitemapFile):
+
+  """拡張を含む単体のサイトマップのファイルを表現するクラスです。
+
+  Warnings
+  --------
+  本クラスは `ExtensionSitemap.save_files` メソッドにより生成されることを想定しています。
+  よって手動での生成は推奨されません。
+  """
+
+  def __init__ (self, extension:Extension, file:Path|str, entries:list[tuple[str, list[tuple]]], digest:str|None=None):
+    self._extension = extension
+    self._file = Path(file)
+    self._entries = entries
+    self._digest = digest
+
+  @property
+  def file (self) -> Path:
+    return self._file
+
+  @property
+  def last_mod (self) -> datetime.datetime|None:
+    return None
+
+  @property
+  def digest (self) -> str|None:
+    return self._digest
+
+  def save (self, use_indent:bool=False):
+    with SitemapWriter(self._file, "urlset", self._extension.attributes, use_indent) as writer:
+      for entry in self._entries:
+        writer.write(self._extension.render_url(entry, use_indent))
+    self._digest = writer.digest
+
+class ExtensionSitemap (Store, ISitemap, ILoadable, Generic[T]):
+
+  """`Extension` により定義された拡張を含むサイトマップを表現する基底クラスです。
+
+  Examples
+  --------
+  >>> class ArticleSitemap (ExtensionSitemap[Article]):
+  ...   EXTENSION = Extension(Article, "article", "http://www.example.com/schemas/article")
+  >>>
+  >>> sitemap = ArticleSitemap("./sample.xml")
+  >>> sitemap.register("http://www.example.com/", Article("name", "en"))
+  >>> sitemap.save_files()
+  [<sitemap.extension.ExtensionSitemapFile object at 0xXXXXXXXXXXXXXXXX>]
+
+  Notes
+  -----
+  派生クラスは `EXTENSION` に `Extension` オブジェクトを設定します。
+  テーブル定義、登録・取得・保存・読み込みの各処理はその定義から生成されるため、派生クラスで実装する必要はありません。
+  ファイルの分割は常にページ (<url>) の境界で行われます。
+
+  Parameters
+  ----------
+  file : Path|str
+    サイトマップの保存先となるファイルパスです。
+  max_count : int|None
+    一つのファイルに記録されるページの最大数です。
+    この数を越えた場合、サイトマップは複数のファイルに分割して保存されます。
+    未指定ならば `EXTENSION.max_count` が設定されます。
+  max_bytes : int
+    一つのファイルの最大バイト数です。
+    この大きさを越えた場合、サイトマップは複数のファイルに分割して保存されます。
+    未指定ならば `52428800` (50MiB) が設定されます。
+  metrics : IMetricsCollector|None
+    各処理の計測結果の報告先です。
+    指定された場合、`register_many`, `list_all`, `load`, `save_files` の各処理に要した時間、保存されたファイルの情報、およびストアの大きさが報告されます。
+    未指定ならば計測は行われません。
+  isolated_save : bool
+    `save_files` メソッドを、呼び出し時点の登録内容を複製したストアから行うかを設定します。
+    真であれば保存中も別のスレッドから登録を続けることができ、保存される内容は呼び出し時点のものに固定されます。
+    偽であれば保存が終わるまで、別のスレッドからの登録や取得は待機させられます。
+    ただし保存中は登録内容と同じ大きさのストアが一時的に作成されます。
+    また文書の作成は GIL を保持したまま行われるため、登録の処理量は向上しません。
+    未指定ならば `False` が設定されます。
+  lazy_load : bool
+    `load` メソッドで XML スキーマによる検証を <url> 要素ごとに逐次的に行うかを設定します。
+    真であれば検証済みの内容は一定件数ごとにまとめて登録され、読み込みに要するメモリの使用量はファイルの大きさに依存しなくなります。
+    ただし読み込みに要する時間は増加します。
+    未指定ならば `False` が設定されます。
+  """
+
+  EXTENSION:ClassVar[Extension]
+
+  def _db_prepare (self) -> sqlite3.Connection:
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    for sql in self.EXTENSION._create_sql():
+      connection.execute(sql)
+    return connection
+
+  def __init__ (self, file:Path|str, max_count:int|None=None, max_bytes:int=MAX_BYTES_PER_FILE, metrics:IMetricsCollector|None=None, isolated_save:bool=False, lazy_load:bool=False):
+    self._file = Path(file)
+    self._max_count = max_count or self.EXTENSION.max_count
+    self._max_bytes = max_bytes
+    self._metrics = metrics
+    self._isolated_save = isolated_save
+    self._lazy_load = lazy_load
+    self._register_sql = self.EXTENSION._register_sql()
+    self._select_sql = self.EXTENSION._select_sql()
+    self._open_store()
+
+  def _register_rows (self, rows:list[tuple]):
+    with self._lock:
+      self._connection.executemany("INSERT INTO page(loc) VALUES(?) ON CONFLICT(loc) DO NOTHING", ((loc,) for loc, *_ in rows))
+      self._connection.executemany(self._register_sql, rows)
+
+  def register (self, loc:str, record:T):
+
+    """ページに拡張の内容を登録します。
+
+    Notes
+    -----
+    `EXTENSION` に `key` が指定されていない場合、ページには一つの内容のみが記録され、登録済みのページが指定されたときは既存の内容が更新されます。
+    `key` が指定されている場合、その値が同一である内容のみが更新されます。
+
+    Arguments
+    ---------
+    loc : str
+      登録するページの URL です。
+    record : T
+      登録する拡張の内容です。
+
+    Raises
+    ------
+    ValueError
+      必須の値が `None` である場合に送出されます。
+    """
+
+    self._closeable.must_be_open()
+    self._register_rows([(loc, *self.EXTENSION.to_row(record))])
+
+  _REGISTER_BATCH_SIZE:ClassVar[int] = 10000
+
+  def register_many (self, records:Iterable[tuple[str, T]]):
+
+    """複数のページに拡張の内容をまとめて登録します。
+
+    Notes
+    -----
+    本メソッドは `register` メソッドを繰り返し呼び出した場合と同じ結果になりますが、一定件数ごとに単一の SQL 文でまとめて処理するためより高速です。
+    引数 `records` は逐次的に消費されるため、ジェネレータを指定することもできます。
+
+    Arguments
+    ---------
+    records : Iterable[tuple[str, T]]
+      登録するページの URL と拡張の内容の組の集合です。
+    """
+
+    self._closeable.must_be_open()
+    if self._metrics is not None:
+      start = time.perf_counter()
+    count = 0
+    to_row = self.EXTENSION.to_row
+    for batch in batched(((loc, *to_row(record)) for loc, record in records), self._REGISTER_BATCH_SIZE):
+      self._register_rows(batch)
+      count += len(batch)
+    if self._metrics is not None:
+      report_phase(self._metrics, self._file, "register_many", start, count)
+
+  def unregister (self, loc:str):
+
+    """ページに登録された全ての拡張の内容を削除します。
+
+    Notes
+    -----
+    削除するページが存在しない場合であっても、このメソッドは必ず成功します。
+
+    Arguments
+    ---------
+    loc : str
+      削除するページの URL です。
+    """
+
+    self._closeable.must_be_open()
+    with self._lock:
+      self._connection.execute("DELETE FROM record WHERE page_id == (SELECT id FROM page WHERE loc == ?)", (loc,))
+      self._connection.execute("DELETE FROM page WHERE loc == ?", (loc,))
+
+  def clear (self):
+
+    """登録された全ての内容を削除します。"""
+
+    self._closeable.must_be_open()
+    with self._lock:
+      self._connection.execute("DELETE FROM record")
+      self._connection.execute("DELETE FROM page")
+
+  def get (self, loc:str) -> list[T]|None:
+
+    """ページに登録された拡張の内容を取得します。
+
+    Arguments
+    ---------
+    loc : str
+      取得するページの URL です。
+
+    Returns
+    -------
+    list[T]|None
+      登録された順に並べた拡張の内容です。
+      ページが登録されていなければ `None` が返されます。
+    """
+
+    self._closeable.must_be_open()
+    found_columns = self._fetch_all(self._select_sql + " WHERE page.loc == ? ORDER BY record.id ASC", (loc,))
+    if found_columns:
+      return [self.EXTENSION.from_row(row[1:]) for row in found_columns]
+    else:
+      return None
+
+  def _iter_entries (self) -> Iterator[tuple[str, list[tuple]]]:
+    found_rows = self._iter_query(self._select_sql + " ORDER BY page.loc ASC, record.id ASC")
+    if self.EXTENSION._key is None:
+      for row in found_rows:
+        yield row[0], [row[1:]]
+    else:
+      for loc, rows in itertools.groupby(found_rows, key=lambda row: row[0]):
+        yield loc, [row[1:] for row in rows]
+
+  def list_all (self) -> list[tuple[str, list[T]]]:
+
+    """登録された全てのページの URL と拡張の内容をリストにして返します。
+
+    Returns
+    -------
+    list[tuple[str, list[T]]]
+      ページの URL と、登録された順に並べた拡張の内容の組のリストです。
+      本リストは URL 順に整列済みの状態で返されます。
+    """
+
+    self._closeable.must_be_open()
+    if self._metrics is not None:
+      start = time.perf_counter()
+    from_row = self.EXTENSION.from_row
+    result = [(loc, [from_row(row) for row in rows]) for loc, rows in self._iter_entries()]
+    if self._metrics is not None:
+      report_phase(self._metrics, self._file, "list_all", start, len(result))
+    return result
+
+  def save_files (self, use_indent:bool=False) -> list[ISitemapFile]:
+    self._closeable.must_be_open()
+    extension = self.EXTENSION
+    with self._save_source() as source:
+      return write_files(self._file, source._iter_entries(), extension.render_url, "urlset", extension.attributes, lambda file, chunk, digest: ExtensionSitemapFile(extension, file, chunk, digest), use_indent=use_indent, max_count=self._max_count, max_bytes=self._max_bytes, metrics=self._metrics)
+
+  _LOAD_BATCH_SIZE:ClassVar[int] = 10000
+
+  def _iter_rows (self, stream:TextIOBase|BinaryIO) -> Iterator[tuple]:
+    extension = self.EXTENSION
+    tag = extension._prefix + ":" + extension._tag
+    for url in decode_children(extension.schema, stream, "url", self._lazy_load):
+      loc_source = url["loc"]
+      if loc_source:
+        loc = loc_source
+      else:
+        raise ValueError()
+      elements = url.get(tag)
+      if elements:
+        if isinstance(elements, dict):
+          elements = [elements]
+        for element in elements:
+          yield (loc, *extension.decode(element))
+      else:
+        raise ValueError()
+
+  def load (self, stream:TextIOBase|BinaryIO|Path|str):
+    self._closeable.must_be_open()
+    if self._metrics is not None:
+      start = time.perf_counter()
+    count = 0
+    with open_source(stream) as opened_stream:
+      for rows in batched(self._iter_rows(opened_stream), self._LOAD_BATCH_SIZE):
+        self._register_rows(rows)
+        count += len(rows)
+    if self._metrics is not None:
+      report_phase(self._metrics, self._file, "load", start, count)
+
+  def loads (self, source:str|bytes):
+    if isinstance(source, bytes):
+      stream = BytesIO(source)
+    else:
+      stream = StringIO(source)
+    with stream:
+      self.load(stream)
@@ -0,0 +1,173 @@
+import bisect
+from array import array
+from typing import Iterable, Iterator, Sequence
+
+DEFAULT_BLOCK_SIZE:int = 16
+
+def _common_prefix_length (a:bytes, b:bytes) -> int:
+  low = 0
+  high = min(len(a), len(b))
+  while low < high:
+    middle = (low + high +1) // 2
+    if a[:middle] == b[:middle]:
+      low = middle
+    else:
+      high = middle -1
+  return low
+
+def _write_length (data:bytearray, length:int):
+  if length < 0xFF:
+    data.append(length)
+  else:
+    data.append(0xFF)
+    data += length.to_bytes(4, "little")
+
+def _read_length (data:bytes, position:int) -> tuple[int, int]:
+  length = data[position]
+  if length < 0xFF:
+    return length, position +1
+  else:
+    return int.from_bytes(data[position +1:position +5], "little"), position +5
+
+class FrontCodedStrings (Sequence[str]):
+
+  """整列済みの文字列の集合を、前方符号化により圧縮して保持するクラスです。
+
+  Examples
+  --------
+  >>> locs = FrontCodedStrings(["http://www.example.com/", "http://www.example.com/page.html"])
+  >>> list(locs)
+  ['http://www.example.com/', 'http://www.example.com/page.html']
+  >>> "http://www.example.com/page.html" in locs
+  True
+
+  Notes
+  -----
+  文字列は `block_size` 個ごとのブロックに分けられ、各ブロックの先頭の文字列はそのまま、
+  以降の文字列は直前の文字列と共通する先頭部分の長さと、それ以降の部分のみが UTF-8 で記録されます。
+  共通の接頭辞が長い URL の集合では、`str` のリストとして保持した場合に比べ大幅にメモリの使用量を削減できます。
+
+  先頭から順に取り出す場合、各文字列は直前の文字列から逐次的に復元されます。
+  任意の位置の文字列の取得や検索は、ブロックの先頭の文字列に対する二分探索と、一つのブロック内の復元のみで行われます。
+
+  Parameters
+  ----------
+  strings : Iterable[str]
+    昇順に整列され、かつ重複の無い文字列の集合です。
+  block_size : int
+    一つのブロックに含まれる文字列の数です。
+    大きいほど圧縮率は向上しますが、任意の位置の文字列の取得は遅くなります。
+    未指定ならば `16` が設定されます。
+
+  Raises
+  ------
+  ValueError
+    `strings` が昇順に整列されていない場合に送出されます。
+  """
+
+  def __init__ (self, strings:Iterable[str], block_size:int=DEFAULT_BLOCK_SIZE):
+    if block_size < 1:
+      raise ValueError("block_size must be positive.")
+    self._block_size = block_size
+    data = bytearray()
+    offsets = array("Q")
+    previous = None
+    count = 0
+    for string in strings:
+      encoded = string.encode("utf-8")
+      if previous is not None and encoded <= previous:
+        raise ValueError("{:s} is not sorted.".format(string))
+      if count % block_size == 0:
+        offsets.append(len(data))
+        _write_length(data, len(encoded))
+        data += encoded
+      else:
+        shared = _common_prefix_length(previous, encoded)
+        _write_length(data, shared)
+        _write_length(data, len(encoded) - shared)
+        data += encoded[shared:]
+      previous = encoded
+      count += 1
+    self._data = bytes(data)
+    self._offsets = offsets
+    self._count = count
+
+  @property
+  def nbytes (self) -> int:
+
+    """圧縮された内容の、おおよそのバイト数を返します。"""
+
+    return len(self._data) + self._offsets.itemsize * len(self._offsets)
+
+  def __len__ (self) -> int:
+    return self._count
+
+  def _block_head (self, block:int) -> bytes:
+    length, position = _read_length(self._data, self._offsets[block])
+    return self._data[position:position + length]
+
+  def _iter_block (self, block:int) -> Iterator[bytes]:
+    data = self._data
+    length, position = _read_length(data, self._offsets[block])
+    current = data[position:position + length]
+    position += length
+    yield current
+    end = min(self._block_size, self._count - block * self._block_size)
+    for _ in range(end -1):
+      shared, position = _read_length(data, position)
+      length, position = _read_length(data, position)
+      current = current[:shared] + data[position:position + length]
+      position += length
+      yield current
+
+  def __iter__ (self) -> Iterator[str]:
+    for block in range(len(self._offsets)):
+      for encoded in self._iter_block(block):
+        yield encoded.decode("utf-8")
+
+  def __getitem__ (self, index:int) -> str:
+    if isinstance(index, slice):
+      return [self[i] for i in range(*index.indices(self._count))]
+    if index < 0:
+      index += self._count
+    if not 0 <= index < self._count:
+      raise IndexError(index)
+    block, position = divmod(index, self._block_size)
+    for offset, encoded in enumerate(self._iter_block(block)):
+      if offset == position:
+        return encoded.decode("utf-8")
+
+  def _find_block (self, encoded:bytes) -> int:
+    return bisect.bisect_right(range(len(self._offsets)), encoded, key=self._block_head) -1
+
+  def index (self, value:str, start:int=0, stop:int|None=None) -> int:
+
+    """文字列の位置を二分探索で求めます。
+
+    Raises
+    ------
+    ValueError
+      文字列が含まれない場合に送出されます。
+    """
+
+    encoded = value.encode("utf-8")
+    block = self._find_block(encoded)
+    if 0 <= block:
+      for offset, current in enumerate(self._iter_block(block)):
+        if current == encoded:
+          found = block * self._block_size + offset
+          if start <= found and (stop is None or found < stop):
+            return found
+          break
+        elif encoded < current:
+          break
+    raise ValueError("{:s} is not in FrontCodedStrings.".format(value))
+
+  def __contains__ (self, value:object) -> bool:
+    if not isinstance(value, str):
+      return False
+    try:
+      self.index(value)
+    except ValueError:
+      return False
+    return True
@@ -1,7 +1,9 @@
-
+import os
+import functools
 import urllib.parse
 import importlib
 from pathlib import Path
+from typing import Iterable, Iterator
 from dataclasses import dataclass
 
 @dataclass
@@ -23,14 +25,55 @@ class Host:
     作成される URL のドメイン部分の文字列です。
   root_dir : Path
     作成される URL のパス部分の絶対パスの基準となるディレクトリです。
+  use_filesystem : bool
+    パスがディレクトリであるかをファイルシステムに問い合わせるかを設定します。
+    偽であればファイルシステムには一切アクセスせず、引数 `is_dir` が真であるか、パスの末尾が区切り文字であるものをディレクトリとみなします。
+    未指定ならば `True` が設定されます。
+  dir_cache_size : int
+    ディレクトリから URL のパス部分への変換結果を保持する LRU キャッシュの大きさです。
+    未指定ならば `4096` が設定されます。
   """
 
   scheme:str
   netloc:str
   root_dir:Path
+  use_filesystem:bool = True
+  dir_cache_size:int = 4096
 
   def __post_init__ (self):
     self.root_dir = Path(self.root_dir)
+    self._base_url = urllib.parse.urlunparse((self.scheme, self.netloc, "", "", "", ""))
+    self._dir_to_url_path = functools.lru_cache(maxsize=self.dir_cache_size)(self._dir_to_url_path_uncached)
+
+  def _dir_to_url_path_uncached (self, dir_str:str) -> str|None:
+    dir_path = Path(dir_str)
+    if dir_path == self.root_dir:
+      return "/"
+    elif dir_path.is_relative_to(self.root_dir):
+      return Path("/").joinpath(dir_path.relative_to(self.root_dir)).as_posix() + "/"
+    else:
+      return None
+
+  def _to_url_path (self, path:Path|str, is_dir:bool=False) -> str:
+    path_str = os.fspath(path)
+    separators = os.sep + (os.altsep or "")
+    stripped_path_str = path_str.rstrip(separators)
+    head, tail = os.path.split(stripped_path_str)
+    dir_url_path = None
+    if tail not in ("", ".", ".."):
+      dir_url_path = self._dir_to_url_path(head)
+    if dir_url_path is not None:
+      url_path = dir_url_path + tail
+    elif Path(path) == self.root_dir:
+      return "/"
+    else:
+      url_path = Path("/").joinpath(Path(path).relative_to(self.root_dir)).as_posix()
+    if self.use_filesystem:
+      if is_dir or Path(path).is_dir():
+        url_path += "/"
+    elif is_dir or len(stripped_path_str) < len(path_str):
+      url_path += "/"
+    return url_path
 
   def path_to_url (self, path:Path|str, params:str="", query:str="", fragment:str="", is_dir:bool=False) -> str:
 
@@ -39,6 +82,7 @@ class Host:
     Notes
     -----
     引数 `path` がファイルであれば、引数 `is_dir` の値は無視されます。
+    ただし `use_filesystem` が偽であれば、本メソッドはファイルシステムにアクセスしません。
 
     Parameters
     ----------
@@ -64,17 +108,255 @@ class Host:
       作成された URL が返されます。
     """
 
-    if Path(path) == self.root_dir:
-      path_str = "/"
+    url_path = self._to_url_path(path, is_dir)
+    if params or query or fragment:
+      return urllib.parse.urlunparse((
+        self.scheme,
+        self.netloc,
+        url_path,
+        params,
+        query,
+        fragment,
+      ))
     else:
-      path_str = Path("/").joinpath(Path(path).relative_to(self.root_dir)).as_posix()
-      if is_dir or Path(path).is_dir():
-        path_str += "/"
-    return urllib.parse.urlunparse((
-      self.scheme,
-      self.netloc,
-      path_str,
-      params,
-      query,
-      fragment,
-    ))
+      return self._base_url + url_path
+
+  def paths_to_urls (self, paths:Iterable[Path|str], is_dir:bool=False) -> Iterator[str]:
+
+    """複数のローカルパスからまとめて URL を作成します。
+
+    Notes
+    -----
+    本メソッドは `path_to_url` メソッドをパラメータ・クエリ・フラグメントを指定せずに繰り返し呼び出した場合と同じ結果を返します。
+
+    Parameters
+    ----------
+    paths : Iterable[Path|str]
+      URL に変換するパスの集合です。
+    is_dir : bool
+      全てのパスをディレクトリとみなすかを設定します。
+      未指定ならば `False` が設定されます。
+
+    Returns
+    -------
+    Iterator[str]
+      作成された URL を順番に返すイテレータです。
+    """
+
+    base_url = self._base_url
+    to_url_path = self._to_url_path
+    for path in paths:
+      yield base_url + to_url_path(path, is_dir)
+
+  def url_to_path (self, url:str) -> Path:
+
+    """URL からローカルパスを作成します。
+
+    Notes
+    -----
+    本メソッドは `path_to_url` メソッドの逆の変換を行います。
+    URL のパラメータ・クエリ・フラグメント部分は無視されます。
+    パス部分の "." と ".." は `root_dir` を越えない範囲で解決され、`root_dir` の外を指す URL は拒否されます。
+    `use_filesystem` が真であれば、シンボリックリンクを解決したパスについても同様に確認されます。
+
+    Parameters
+    ----------
+    url : str
+      ローカルパスに変換する URL です。
+
+    Returns
+    -------
+    Path
+      `root_dir` を基準とした、作成されたパスが返されます。
+
+    Raises
+    ------
+    ValueError
+      URL のスキームまたはドメイン部分が一致しない場合、またはパスが `root_dir` の外を指す場合に送出されます。
+    """
+
+    parsed_url = urllib.parse.urlparse(url)
+    if parsed_url.scheme != self.scheme or parsed_url.netloc != self.netloc:
+      raise ValueError("{:s} is not a URL of {:s}.".format(url, self._base_url))
+    segments = []
+    for segment in parsed_url.path.split("/"):
+      if segment in ("", "."):
+        continue
+      elif segment == "..":
+        if not segments:
+          raise ValueError("{:s} is outside of {:s}.".format(url, str(self.root_dir)))
+        segments.pop()
+      else:
+        segments.append(segment)
+    path = self.root_dir.joinpath(*segments)
+    if self.use_filesystem and not path.resolve().is_relative_to(self.root_dir.resolve()):
+      raise ValueError("{:s} is outside of {:s}.".format(url, str(self.root_dir)))
+    return path
+
+class _PrefixTrie:
+
+  def __init__ (self):
+    self._root = {}
+
+  def insert (self, key:Iterable[str], value):
+    node = self._root
+    for segment in key:
+      node = node.setdefault(segment, {})
+    node[None] = value
+
+  def get (self, key:Iterable[str]):
+    node = self._root
+    for segment in key:
+      node = node.get(segment)
+      if node is None:
+        return None
+    return node.get(None)
+
+  def longest (self, key:Iterable[str]):
+    node = self._root
+    found = node.get(None)
+    for segment in key:
+      node = node.get(segment)
+      if node is None:
+        break
+      found = node.get(None, found)
+    return found
+
+class HostRegistry:
+
+  """複数の `Host` オブジェクトを保持し、パスや URL に対応する `Host` オブジェクトを選択するクラスです。
+
+  Examples
+  --------
+  >>> registry = HostRegistry([
+  ...   Host("https", "www.example.com", "./public"),
+  ...   Host("https", "blog.example.com", "./public/blog"),
+  ... ])
+  >>> registry.path_to_url("./public/blog/post.html")
+  'https://blog.example.com/post.html'
+  >>> registry.url_to_path("https://www.example.com/page.html")
+  PosixPath('public/page.html')
+
+  Notes
+  -----
+  パスに対しては `root_dir` がパスの先頭部分に最も長く一致する `Host` オブジェクトが選択されます。
+  `root_dir` と検索するパスはいずれも `os.path.abspath` により絶対パスに変換され、"." と ".." が解決された上で比較されます。
+  よって相対パスと絶対パスが混在していても正しく選択されます。
+  ただしファイルシステムにはアクセスしないため、シンボリックリンクは解決されません。
+
+  URL に対してはスキームとドメイン部分 (scheme, netloc) のみが一致する `Host` オブジェクトが選択され、URL のパス部分は考慮されません。
+  よって同一のドメインのパスごとに異なる `Host` オブジェクトを登録することはできません。
+  いずれの検索も接頭辞木により行われるため、検索に要する時間は登録された `Host` オブジェクトの数に依存しません。
+
+  Parameters
+  ----------
+  hosts : Iterable[Host]
+    登録する `Host` オブジェクトの集合です。
+    未指定ならば何も登録されません。
+  """
+
+  def __init__ (self, hosts:Iterable[Host]=()):
+    self._hosts = []
+    self._path_trie = _PrefixTrie()
+    self._url_trie = _PrefixTrie()
+    for host in hosts:
+      self.register(host)
+
+  def __len__ (self) -> int:
+    return len(self._hosts)
+
+  def __iter__ (self) -> Iterator[Host]:
+    return iter(self._hosts)
+
+  def register (self, host:Host):
+
+    """`Host` オブジェクトを登録します。
+
+    Arguments
+    ---------
+    host : Host
+      登録する `Host` オブジェクトです。
+
+    Raises
+    ------
+    ValueError
+      `root_dir` またはスキームとドメイン部分が等しい `Host` オブジェクトが登録済みの場合に送出されます。
+    """
+
+    root_parts = self._absolute(host.root_dir).parts
+    if self._path_trie.get(root_parts) is not None:
+      raise ValueError("{:s} is already registered.".format(str(host.root_dir)))
+    if self._url_trie.get((host.scheme, host.netloc)) is not None:
+      raise ValueError("{:s}://{:s} is already registered.".format(host.scheme, host.netloc))
+    self._path_trie.insert(root_parts, host)
+    self._url_trie.insert((host.scheme, host.netloc), host)
+    self._hosts.append(host)
+
+  def find_by_path (self, path:Path|str) -> Host|None:
+
+    """ローカルパスに対応する `Host` オブジェクトを返します。
+
+    Returns
+    -------
+    Host|None
+      `root_dir` がパスの先頭部分に最も長く一致する `Host` オブジェクトです。
+      該当するものが無ければ `None` が返されます。
+    """
+
+    return self._path_trie.longest(self._absolute(path).parts)
+
+  @staticmethod
+  def _absolute (path:Path|str) -> Path:
+    return Path(os.path.abspath(path))
+
+  def find_by_url (self, url:str) -> Host|None:
+
+    """URL に対応する `Host` オブジェクトを返します。
+
+    Returns
+    -------
+    Host|None
+      スキームとドメイン部分が一致する `Host` オブジェクトです。
+      該当するものが無ければ `None` が返されます。
+    """
+
+    parsed_url = urllib.parse.urlparse(url)
+    return self._url_trie.longest((parsed_url.scheme, parsed_url.netloc))
+
+  def path_to_url (self, path:Path|str, params:str="", query:str="", fragment:str="", is_dir:bool=False) -> str:
+
+    """ローカルパスに対応する `Host` オブジェクトを用いて URL を作成します。
+
+    Notes
+    -----
+    各引数の意味は `Host.path_to_url` メソッドと同一です。
+
+    Raises
+    ------
+    ValueError
+      パスに対応する `Host` オブジェクトが登録されていない場合に送出されます。
+    """
+
+    host = self.find_by_path(path)
+    if host is None:
+      raise ValueError("{:s} is not under any registered root_dir.".format(str(path)))
+    path_str = os.fspath(path)
+    host_path_str = os.fspath(host.root_dir.joinpath(self._absolute(path).relative_to(self._absolute(host.root_dir))))
+    if path_str.endswith(tuple(os.sep + (os.altsep or ""))):
+      host_path_str += os.sep
+    return host.path_to_url(host_path_str, params, query, fragment, is_dir)
+
+  def url_to_path (self, url:str) -> Path:
+
+    """URL に対応する `Host` オブジェクトを用いてローカルパスを作成します。
+
+    Raises
+    ------
+    ValueError
+      URL に対応する `Host` オブジェクトが登録されていない場合に送出されます。
+    """
+
+    host = self.find_by_url(url)
+    if host is None:
+      raise ValueError("{:s} is not a URL of any registered host.".format(url))
+    return host.url_to_path(url)
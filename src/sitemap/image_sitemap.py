@@ -1,15 +1,34 @@
 
+import os
+import time
 import sqlite3
+import datetime
+import functools
 import importlib.resources
 import itertools
-from io import TextIOBase, StringIO
-from xml.etree import ElementTree as ETree
-from typing import NamedTuple, ClassVar
+from io import TextIOBase, StringIO, BytesIO
+from enum import Enum
+from typing import NamedTuple, ClassVar, BinaryIO, Iterable, Iterator
 from pathlib import Path
-from closeable import ICloseable, Closeable
 from xmlschema import XMLSchema
 from collections import OrderedDict
 from .abc import ISitemap, ISitemapFile, ILoadable
+from .store import Store
+from .host import Host
+from .loader import GZIP_MAGIC, XSI_NAMESPACE, batched, decode_children, map_in_processes, open_source, parse_files, read_range, split_ranges
+from .metrics import IMetricsCollector, report_phase
+from .sitemap_index import SitemapIndex
+from .writer import MAX_ENTRIES_PER_FILE, MAX_BYTES_PER_FILE, SitemapWriter, render_element, render_text_element, write_files
+
+class ImageLimitPolicy (Enum):
+
+  """ページあたりの画像の数が上限を越えた場合の処理を表す列挙型です。"""
+
+  TRUNCATE = "truncate"
+  RAISE = "raise"
+
+DEFAULT_MAX_IMAGES_PER_PAGE:int = 1000
+DEFAULT_IMAGE_LIMIT_POLICY:ImageLimitPolicy = ImageLimitPolicy.TRUNCATE
 
 class Image (NamedTuple):
 
@@ -65,50 +84,57 @@ class ImageSitemapFile (ISitemapFile):
   よって手動での生成は推奨されません。
   """
 
-  def __init__ (self, file:Path|str, url_images:OrderedDict[str, list[Image]]):
+  def __init__ (self, file:Path|str, url_images:OrderedDict[str, list[Image]], digest:str|None=None):
     self._file = Path(file)
     self._url_images = url_images
+    self._digest = digest
 
   @property
   def file (self) -> Path:
     return self._file
 
-  def _as_element (self) -> ETree.Element:
-    urlset_node = ETree.Element("urlset", {
-      "xmlns": "http://www.sitemaps.org/schemas/sitemap/0.9",
-      "xmlns:image": "http://www.google.com/schemas/sitemap-image/1.1",
-    })
-    for loc, images in self._url_images.items():
-      url_node = ETree.SubElement(urlset_node, "url")
-      loc_node = ETree.SubElement(url_node, "loc")
-      loc_node.text = loc
-      for image_loc, image_caption, image_geo_location, image_title, image_license in images:
-        image_node = ETree.SubElement(url_node, "image:image")
-        image_loc_node = ETree.SubElement(image_node, "image:loc") 
-        image_loc_node.text = image_loc
-        if image_caption:
-          image_caption_node = ETree.SubElement(image_node, "image:caption") 
-          image_caption_node.text = image_caption
-        if image_geo_location:
-          image_geo_location_node = ETree.SubElement(image_node, "image:geo_location") 
-          image_geo_location_node.text = image_geo_location
-        if image_title:
-          image_title_node = ETree.SubElement(image_node, "image:title") 
-          image_title_node.text = image_title
-        if image_license:
-          image_license_node = ETree.SubElement(image_node, "image:license")
-          image_license_node.text = image_license
-    return urlset_node
+  @property
+  def last_mod (self) -> datetime.datetime|None:
+    return None
+
+  @property
+  def digest (self) -> str|None:
+    return self._digest
+
+  _TAG:ClassVar[str] = "urlset"
+  _ATTRIBUTES:ClassVar[dict[str, str]] = {
+    "xmlns": "http://www.sitemaps.org/schemas/sitemap/0.9",
+    "xmlns:image": "http://www.google.com/schemas/sitemap-image/1.1",
+  }
+
+  @staticmethod
+  def _render_image (image:Image, use_indent:bool=False) -> str:
+    image_loc, image_caption, image_geo_location, image_title, image_license = image
+    children = [render_text_element("image:loc", image_loc, use_indent, 3)]
+    if image_caption:
+      children.append(render_text_element("image:caption", image_caption, use_indent, 3))
+    if image_geo_location:
+      children.append(render_text_element("image:geo_location", image_geo_location, use_indent, 3))
+    if image_title:
+      children.append(render_text_element("image:title", image_title, use_indent, 3))
+    if image_license:
+      children.append(render_text_element("image:license", image_license, use_indent, 3))
+    return render_element("image:image", children, use_indent, 2)
+
+  @staticmethod
+  def _render (url:URL, use_indent:bool=False) -> bytes:
+    loc, images = url
+    children = [render_text_element("loc", loc, use_indent, 2)]
+    children.extend(ImageSitemapFile._render_image(image, use_indent) for image in images)
+    return render_element("url", children, use_indent, 1).encode("utf-8")
 
   def save (self, use_indent:bool=False):
-    element = self._as_element()
-    if use_indent:
-      ETree.indent(element)
-    with open(self._file, "wb") as file:
-      for part in ETree.tostringlist(element, encoding="utf-8", xml_declaration=True):
-        file.write(part)
+    with SitemapWriter(self._file, self._TAG, self._ATTRIBUTES, use_indent) as writer:
+      for url in self._url_images.items():
+        writer.write(self._render(url, use_indent))
+    self._digest = writer.digest
 
-class ImageSitemap (ISitemap, ILoadable, ICloseable):
+class ImageSitemap (Store, ISitemap, ILoadable):
 
   """画像サイトマップを表現するクラスです。
 
@@ -118,35 +144,82 @@ class ImageSitemap (ISitemap, ILoadable, ICloseable):
   >>> sitemap.register("http://www.example.com/", "http://www.example.com/img/top-image.jpg")
   >>> sitemap.save_files()
   [<sitemap.image_sitemap.ImageSitemapFile object at 0xXXXXXXXXXXXXXXXX>]
-  """
 
-  def _db_prepare (self) -> tuple[sqlite3.Connection, sqlite3.Cursor]:
-    connection = sqlite3.connect(":memory:")
-    cursor = connection.cursor()
-    cursor.execute("CREATE TABLE image(id INTEGER PRIMARY KEY AUTOINCREMENT, loc TEXT, image_loc TEXT, image_caption TEXT, image_geo_location TEXT, image_title TEXT, image_license TEXT)")
-    return connection, cursor
+  Notes
+  -----
+  ファイルの分割は常にページ (<url>) の境界で行われ、一つのページの画像が複数のファイルに分かれることはありません。
 
-  def __init__ (self, file:Path|str):
-    self._file = Path(file)
-    self._connection, self._cursor = self._db_prepare()
-    self._closeable = Closeable(self._close_handler)
-
-  def __enter__ (self):
-    return self
+  Parameters
+  ----------
+  file : Path|str
+    画像サイトマップの保存先となるファイルパスです。
+  max_count : int
+    一つのファイルに記録されるページの最大数です。
+    この数を越えた場合、画像サイトマップは複数のファイルに分割して保存されます。
+    未指定ならば `50000` が設定されます。
+  max_bytes : int
+    一つのファイルの最大バイト数です。
+    この大きさを越えた場合、画像サイトマップは複数のファイルに分割して保存されます。
+    未指定ならば `52428800` (50MiB) が設定されます。
+  max_images_per_page : int
+    保存時に一つのページに記録される画像の最大数です。
+    未指定ならば `1000` が設定されます。
+  image_limit_policy : ImageLimitPolicy
+    ページの画像の数が `max_images_per_page` を越えた場合の処理です。
+    `ImageLimitPolicy.TRUNCATE` ならば画像の URL 順で先頭から `max_images_per_page` 個の画像のみが保存され、
+    `ImageLimitPolicy.RAISE` ならば `ValueError` が送出され、保存先のファイルはいずれも変更されません。
+    未指定ならば `ImageLimitPolicy.TRUNCATE` が設定されます。
+  metrics : IMetricsCollector|None
+    各処理の計測結果の報告先です。
+    指定された場合、`list_all`, `load`, `save_files` の各処理に要した時間、保存されたファイルの情報、およびストアの大きさが報告されます。
+    未指定ならば計測は行われません。
+  isolated_save : bool
+    `save_files` メソッドを、呼び出し時点の登録内容を複製したストアから行うかを設定します。
+    真であれば保存中も別のスレッドから登録を続けることができ、保存される内容は呼び出し時点のものに固定されます。
+    偽であれば保存が終わるまで、別のスレッドからの登録や取得は待機させられます。
+    ただし保存中は登録内容と同じ大きさのストアが一時的に作成されます。
+    また文書の作成は GIL を保持したまま行われるため、登録の処理量は向上しません。
+    未指定ならば `False` が設定されます。
+  lazy_load : bool
+    `load` メソッドで XML スキーマによる検証を <url> 要素ごとに逐次的に行うかを設定します。
+    真であれば検証済みの画像情報は一定件数ごとにまとめて登録され、読み込みに要するメモリの使用量はファイルの大きさに依存しなくなります。
+    ただし読み込みに要する時間は増加します。
+    未指定ならば `False` が設定されます。
+  """
 
-  def __exit__ (self, exc_type, exc_value, traceback):
-    self._closeable.close()
+  def _db_prepare (self) -> sqlite3.Connection:
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    connection.execute("CREATE TABLE page(id INTEGER PRIMARY KEY AUTOINCREMENT, loc TEXT)")
+    connection.execute("CREATE UNIQUE INDEX page_loc ON page(loc)")
+    self._create_image_tables(connection)
+    return connection
 
-  @property
-  def closed (self) -> bool:
-    return self._closeable.closed
+  @staticmethod
+  def _create_image_tables (connection:sqlite3.Connection):
+    connection.execute("CREATE TABLE image_text(id INTEGER PRIMARY KEY AUTOINCREMENT, value TEXT)")
+    connection.execute("CREATE UNIQUE INDEX image_text_value ON image_text(value)")
+    connection.execute("CREATE TABLE image(id INTEGER PRIMARY KEY AUTOINCREMENT, page_id INTEGER REFERENCES page(id), image_loc TEXT, image_caption TEXT, image_geo_location_id INTEGER REFERENCES image_text(id), image_title TEXT, image_license_id INTEGER REFERENCES image_text(id))")
+    connection.execute("CREATE UNIQUE INDEX image_page_id_image_loc ON image(page_id, image_loc)")
 
-  def _close_handler (self):
-    self._cursor.close()
-    self._connection.close()
+  _SELECT_SQL:ClassVar[str] = "SELECT page.loc, image.image_loc, image.image_caption, geo_location.value, image.image_title, license.value FROM page CROSS JOIN image ON image.page_id = page.id INNER JOIN image_text AS geo_location ON geo_location.id = image.image_geo_location_id INNER JOIN image_text AS license ON license.id = image.image_license_id"
 
-  def close (self):
-    self._closeable.close()
+  def __init__ (self, file:Path|str, max_count:int=MAX_ENTRIES_PER_FILE, max_bytes:int=MAX_BYTES_PER_FILE, max_images_per_page:int=DEFAULT_MAX_IMAGES_PER_PAGE, image_limit_policy:ImageLimitPolicy=DEFAULT_IMAGE_LIMIT_POLICY, metrics:IMetricsCollector|None=None, isolated_save:bool=False, lazy_load:bool=False):
+    self._file = Path(file)
+    self._max_count = max_count
+    self._max_bytes = max_bytes
+    self._max_images_per_page = max_images_per_page
+    self._image_limit_policy = image_limit_policy
+    self._metrics = metrics
+    self._isolated_save = isolated_save
+    self._lazy_load = lazy_load
+    self._open_store()
+
+  _REGISTER_IMAGE_SQL:ClassVar[str] = "INSERT INTO image(page_id, image_loc, image_caption, image_geo_location_id, image_title, image_license_id) VALUES((SELECT id FROM page WHERE loc == ?), ?, ?, (SELECT id FROM image_text WHERE value == ?), ?, (SELECT id FROM image_text WHERE value == ?)) ON CONFLICT(page_id, image_loc) DO UPDATE SET image_caption = excluded.image_caption, image_geo_location_id = excluded.image_geo_location_id, image_title = excluded.image_title, image_license_id = excluded.image_license_id"
+
+  @classmethod
+  def _register_images (cls, connection:sqlite3.Connection, rows:list[tuple[str, str, str, str, str, str]]):
+    connection.executemany("INSERT INTO image_text(value) VALUES(?) ON CONFLICT(value) DO NOTHING", ((value,) for _, _, _, image_geo_location, _, image_license in rows for value in (image_geo_location, image_license)))
+    connection.executemany(cls._REGISTER_IMAGE_SQL, rows)
 
   def register (self, loc:str, image_loc:str, image_caption:str="", image_geo_location:str="", image_title:str="", image_license:str=""):
 
@@ -173,11 +246,9 @@ class ImageSitemap (ISitemap, ILoadable, ICloseable):
     """
 
     self._closeable.must_be_open()
-    self._cursor.execute("SELECT id FROM image WHERE loc == ? AND image_loc == ?", (loc, image_loc))
-    if self._cursor.fetchone():
-      self._cursor.execute("UPDATE image SET image_caption = ?, image_geo_location = ?, image_title = ?, image_license = ? WHERE loc == ? AND image_loc == ?", (image_caption, image_geo_location, image_title, image_license, loc, image_loc))
-    else:
-      self._cursor.execute("INSERT INTO image(loc, image_loc, image_caption, image_geo_location, image_title, image_license) VALUES(?, ?, ?, ?, ?, ?)", (loc, image_loc, image_caption, image_geo_location, image_title, image_license))
+    with self._lock:
+      self._connection.execute("INSERT INTO page(loc) VALUES(?) ON CONFLICT(loc) DO NOTHING", (loc,))
+      self._register_images(self._connection, [(loc, image_loc, image_caption, image_geo_location, image_title, image_license)])
 
   def unregister (self, loc:str, image_loc:str):
 
@@ -200,14 +271,19 @@ class ImageSitemap (ISitemap, ILoadable, ICloseable):
     """
 
     self._closeable.must_be_open()
-    self._cursor.execute("DELETE FROM image WHERE loc == ? AND image_loc == ?", (loc, image_loc))
+    with self._lock:
+      self._connection.execute("DELETE FROM image WHERE page_id == (SELECT id FROM page WHERE loc == ?) AND image_loc == ?", (loc, image_loc))
+      self._connection.execute("DELETE FROM page WHERE loc == ? AND NOT EXISTS (SELECT 1 FROM image WHERE image.page_id == page.id)", (loc,))
 
   def clear (self):
 
     """画像サイトマップに登録された全ての画像情報を削除します。"""
 
     self._closeable.must_be_open()
-    self._cursor.execute("DELETE FROM image")
+    with self._lock:
+      self._connection.execute("DELETE FROM image")
+      self._connection.execute("DELETE FROM page")
+      self._connection.execute("DELETE FROM image_text")
 
   def get (self, loc:str) -> URL|None:
 
@@ -226,10 +302,9 @@ class ImageSitemap (ISitemap, ILoadable, ICloseable):
     """
 
     self._closeable.must_be_open()
-    self._cursor.execute("SELECT image_loc, image_caption, image_geo_location, image_title, image_license FROM image WHERE loc == ? ORDER BY image_loc ASC", (loc,))
-    found_columns = self._cursor.fetchall()
+    found_columns = self._fetch_all(self._SELECT_SQL + " WHERE page.loc == ? ORDER BY image.image_loc ASC", (loc,))
     if found_columns:
-      images = [Image(image_loc, image_caption, image_geo_location, image_title, image_license) for image_loc, image_caption, image_geo_location, image_title, image_license in found_columns]
+      images = [Image(image_loc, image_caption, image_geo_location, image_title, image_license) for _, image_loc, image_caption, image_geo_location, image_title, image_license in found_columns]
       return URL(loc, images)
     else:
       return None
@@ -246,41 +321,42 @@ class ImageSitemap (ISitemap, ILoadable, ICloseable):
     """
 
     self._closeable.must_be_open()
-    self._cursor.execute("SELECT loc, image_loc, image_caption, image_geo_location, image_title, image_license FROM image ORDER BY loc ASC, image_loc ASC")
-    url_images = OrderedDict()
-    result = []
-    for loc, image_loc, image_caption, image_geo_location, image_title, image_license in self._cursor.fetchall():
-      url_images.setdefault(loc, [])
-      url_images[loc].append(Image(image_loc, image_caption, image_geo_location, image_title, image_license))
-    for loc, images in url_images.items():
-      result.append(URL(loc, images))
+    if self._metrics is None:
+      return list(self._iter_urls())
+    start = time.perf_counter()
+    result = list(self._iter_urls())
+    report_phase(self._metrics, self._file, "list_all", start, len(result))
     return result
 
+  def _iter_urls (self, max_images_per_page:int|None=None) -> Iterator[URL]:
+    for loc, rows in itertools.groupby(self._iter_query(self._SELECT_SQL + " ORDER BY page.loc ASC, image.image_loc ASC"), key=lambda row: row[0]):
+      if max_images_per_page is not None:
+        rows = itertools.islice(rows, max_images_per_page +1)
+      images = [Image(image_loc, image_caption, image_geo_location, image_title, image_license) for _, image_loc, image_caption, image_geo_location, image_title, image_license in rows]
+      self._limit_images(loc, images, max_images_per_page, self._image_limit_policy)
+      yield URL(loc, images)
+
+  @staticmethod
+  def _limit_images (loc:str, images:list[Image], max_images_per_page:int|None, image_limit_policy:ImageLimitPolicy):
+    if max_images_per_page is not None and max_images_per_page < len(images):
+      if image_limit_policy == ImageLimitPolicy.RAISE:
+        raise ValueError("{:s} has more than {:d} images.".format(loc, max_images_per_page))
+      del images[max_images_per_page:]
+
   def save_files (self, use_indent:bool=False) -> list[ISitemapFile]:
-    self._cursor.execute("SELECT loc, image_loc, image_caption, image_geo_location, image_title, image_license FROM image ORDER BY loc ASC, image_loc ASC")
-    url_images = OrderedDict()
-    for loc, image_loc, image_caption, image_geo_location, image_title, image_license in self._cursor.fetchall():
-      url_images.setdefault(loc, [])
-      url_images[loc].append(Image(image_loc, image_caption, image_geo_location, image_title, image_license))
-    result = []
-    for index, batched_url_images in enumerate(itertools.batched(url_images.items(), 50000)):
-      if 0 < index:
-        save_file = self._file.with_stem("{:s}{:d}".format(self._file.stem, index +1))
-      else:
-        save_file = self._file
-      image_sitemap_file = ImageSitemapFile(save_file, OrderedDict(batched_url_images))
-      image_sitemap_file.save(use_indent=use_indent)
-      result.append(image_sitemap_file)
-    return result
+    self._closeable.must_be_open()
+    with self._save_source() as source:
+      return write_files(self._file, source._iter_urls(self._max_images_per_page), ImageSitemapFile._render, ImageSitemapFile._TAG, ImageSitemapFile._ATTRIBUTES, lambda file, chunk, digest: ImageSitemapFile(file, OrderedDict(chunk), digest), use_indent=use_indent, max_count=self._max_count, max_bytes=self._max_bytes, metrics=self._metrics)
 
   _XML_SCHEMA_TO_PARSE:ClassVar[XMLSchema] = XMLSchema(importlib.resources.files("sitemap").joinpath("static/xsd/sitemap.xsd"), build=False)
   _XML_SCHEMA_TO_PARSE.add_schema(importlib.resources.files("sitemap").joinpath("static/xsd/sitemap-image.xsd"))
   _XML_SCHEMA_TO_PARSE.build()
 
-  def load (self, stream:TextIOBase):
-    self._closeable.must_be_open()
-    root = self._XML_SCHEMA_TO_PARSE.to_dict(stream)
-    for url in root["url"]:
+  _LOAD_BATCH_SIZE:ClassVar[int] = 10000
+
+  @classmethod
+  def _iter_rows (cls, stream:TextIOBase|BinaryIO, lazy:bool=False) -> Iterator[tuple[str, str, str, str, str, str]]:
+    for url in decode_children(cls._XML_SCHEMA_TO_PARSE, stream, "url", lazy):
       loc_source = url["loc"]
       if loc_source:
         loc = loc_source
@@ -288,36 +364,149 @@ class ImageSitemap (ISitemap, ILoadable, ICloseable):
         raise ValueError()
       images = url["image:image"]
       if images:
-        for image in images:
-          image_loc_source = image["image:loc"]
-          if image_loc_source:
-            image_loc = image_loc_source
-          else:
-            raise ValueError()
-          image_caption_source = image.get("image:caption")
-          if image_caption_source:
-            image_caption = image_caption_source
-          else:
-            image_caption = ""
-          image_geo_location_source = image.get("image:geo_location")
-          if image_geo_location_source:
-            image_geo_location = image_geo_location_source
-          else:
-            image_geo_location = ""
-          image_title_source = image.get("image:title")
-          if image_title_source:
-            image_title = image_title_source
-          else:
-            image_title = ""
-          image_license_source = image.get("image:license")
-          if image_license_source:
-            image_license = image_license_source
-          else:
-            image_license = ""
-          self.register(loc, image_loc, image_caption, image_geo_location, image_title, image_license)
+        yield from cls._iter_image_rows(loc, images)
+      else:
+        raise ValueError()
+
+  @staticmethod
+  def _iter_image_rows (loc:str, images:Iterable[dict]) -> Iterator[tuple[str, str, str, str, str, str]]:
+    for image in images:
+      image_loc_source = image["image:loc"]
+      if image_loc_source:
+        image_loc = image_loc_source
       else:
         raise ValueError()
+      yield loc, image_loc, image.get("image:caption") or "", image.get("image:geo_location") or "", image.get("image:title") or "", image.get("image:license") or ""
+
+  @classmethod
+  def _parse_file (cls, file:Path, lazy:bool=False) -> list[tuple[str, str, str, str, str, str]]:
+    with open_source(file) as stream:
+      return list(cls._iter_rows(stream, lazy))
+
+  @classmethod
+  def _parse_range (cls, file:Path, header:bytes, footer:bytes, span:tuple[int, int], lazy:bool=False) -> list[tuple[str, str, str, str, str, str]]:
+    with read_range(file, header, footer, span) as stream:
+      return list(cls._iter_rows(stream, lazy))
+
+  def _register_rows (self, rows:list[tuple[str, str, str, str, str, str]]):
+    with self._lock:
+      self._connection.executemany("INSERT INTO page(loc) VALUES(?) ON CONFLICT(loc) DO NOTHING", ((loc,) for loc, *_ in rows))
+      self._register_images(self._connection, rows)
+
+  def load (self, stream:TextIOBase|BinaryIO|Path|str):
+    self._closeable.must_be_open()
+    if self._metrics is not None:
+      start = time.perf_counter()
+    count = 0
+    with open_source(stream) as opened_stream:
+      for rows in batched(self._iter_rows(opened_stream, self._lazy_load), self._LOAD_BATCH_SIZE):
+        self._register_rows(rows)
+        count += len(rows)
+    if self._metrics is not None:
+      report_phase(self._metrics, self._file, "load", start, count)
+
+  def load_files (self, files:Iterable[Path|str], workers:int|None=None):
+
+    """複数の画像サイトマップのファイルを並行して解析し、その内容をまとめて登録します。
 
-  def loads (self, source:str):
-    with StringIO(source) as stream:
+    Notes
+    -----
+    各ファイルは `load` メソッドと同様に XML スキーマによる検証を伴って解析されます。
+    解析は `workers` 個のプロセスで並行して行われ、その結果はファイルごとにまとめて登録されます。
+    複数のファイルに同一の画像が含まれる場合、`files` の順番で後のファイルの内容が優先されます。
+
+    Arguments
+    ---------
+    files : Iterable[Path|str]
+      読み込む画像サイトマップのファイルパスの集合です。
+    workers : int|None
+      解析を行うプロセスの数です。
+      `1` ならば解析は現在のプロセスで逐次的に行われます。
+      未指定ならば `concurrent.futures.ProcessPoolExecutor` の既定値が用いられます。
+    """
+
+    self._closeable.must_be_open()
+    if self._metrics is not None:
+      start = time.perf_counter()
+    count = 0
+    for rows in parse_files(functools.partial(self._parse_file, lazy=self._lazy_load), files, workers):
+      self._register_rows(rows)
+      count += len(rows)
+    if self._metrics is not None:
+      report_phase(self._metrics, self._file, "load_files", start, count)
+
+  def load_parallel (self, file:Path|str, workers:int|None=None):
+
+    """一つの画像サイトマップのファイルを複数の範囲に分割し、並行して解析した内容を登録します。
+
+    Notes
+    -----
+    ファイルは `mmap` によりメモリに割り当てられ、<url> 要素の境界で `workers` の 4 倍の数の範囲に分割されます。
+    各範囲は XML 宣言とルート要素で囲まれた単独の文書として、`load` メソッドと同様に XML スキーマによる検証を伴って別々のプロセスで解析されます。
+    解析の結果はファイル内の順番通りに登録されるため、`load` メソッドで読み込んだ場合と同じ結果になります。
+
+    gzip で圧縮されたファイルや、<url> 要素の境界を特定できないファイルは分割されず、`load` メソッドで読み込まれます。
+
+    Arguments
+    ---------
+    file : Path|str
+      読み込む画像サイトマップのファイルパスです。
+    workers : int|None
+      解析を行うプロセスの数です。
+      `1` ならば解析は現在のプロセスで逐次的に行われます。
+      未指定ならば CPU の数が用いられます。
+    """
+
+    self._closeable.must_be_open()
+    with open(file, "rb") as stream:
+      is_gzip = stream.read(len(GZIP_MAGIC)) == GZIP_MAGIC
+    if is_gzip:
+      self.load(file)
+      return
+    header, footer, spans = split_ranges(file, "urlset", "url", (workers or os.cpu_count() or 1) * 4)
+    if not spans:
+      self.load(file)
+      return
+    if self._metrics is not None:
+      start = time.perf_counter()
+    count = 0
+    for rows in map_in_processes(functools.partial(self._parse_range, Path(file), header, footer, lazy=self._lazy_load), spans, workers):
+      self._register_rows(rows)
+      count += len(rows)
+    if self._metrics is not None:
+      report_phase(self._metrics, self._file, "load_parallel", start, count)
+
+  def load_from_index (self, sitemap_index:SitemapIndex, host:Host, workers:int|None=None):
+
+    """サイトマップインデックスに登録された各画像サイトマップを、ローカルのファイルから読み込みます。
+
+    Notes
+    -----
+    各画像サイトマップの URL は `host.url_to_path` によりローカルのファイルパスに変換され、`load_files` メソッドで読み込まれます。
+    ファイルの種類は `SitemapIndex.resolve_files` メソッドによりルート要素から判定されます。
+    入れ子になったサイトマップインデックスは再帰的に展開され、他の種類のサイトマップは読み込まれずに無視されます。
+
+    Arguments
+    ---------
+    sitemap_index : SitemapIndex
+      読み込む画像サイトマップが登録された `SitemapIndex` オブジェクトです。
+    host : Host
+      URL をファイルパスに変換するための `Host` オブジェクトです。
+    workers : int|None
+      解析を行うプロセスの数です。
+      未指定ならば `concurrent.futures.ProcessPoolExecutor` の既定値が用いられます。
+    """
+
+    self.load_files(sitemap_index.resolve_files(host, self._accepts_namespaces), workers)
+
+  @staticmethod
+  def _accepts_namespaces (namespaces:frozenset[str]) -> bool:
+    return ImageSitemapFile._ATTRIBUTES["xmlns:image"] in namespaces and namespaces <= frozenset(ImageSitemapFile._ATTRIBUTES.values()) | {XSI_NAMESPACE}
+
+  def loads (self, source:str|bytes):
+    if isinstance(source, bytes):
+      stream = BytesIO(source)
+    else:
+      stream = StringIO(source)
+    with stream:
       self.load(stream)
@@ -0,0 +1,287 @@
+import re
+import gzip
+import mmap
+import itertools
+from io import TextIOBase, BytesIO
+from pathlib import Path
+from contextlib import contextmanager
+from typing import BinaryIO, Callable, Iterable, Iterator, TypeVar
+from xml.etree import ElementTree
+from concurrent.futures import ProcessPoolExecutor
+from xmlschema import XMLSchema, XMLResource
+
+S = TypeVar("S")
+T = TypeVar("T")
+
+GZIP_MAGIC:bytes = b"\x1f\x8b"
+XSI_NAMESPACE:str = "http://www.w3.org/2001/XMLSchema-instance"
+
+def _is_gzip (stream:BinaryIO) -> bool:
+  if hasattr(stream, "peek"):
+    return stream.peek(len(GZIP_MAGIC))[:len(GZIP_MAGIC)] == GZIP_MAGIC
+  elif stream.seekable():
+    position = stream.tell()
+    magic = stream.read(len(GZIP_MAGIC))
+    stream.seek(position)
+    return magic == GZIP_MAGIC
+  else:
+    return False
+
+@contextmanager
+def open_source (source:TextIOBase|BinaryIO|Path|str) -> Iterator[TextIOBase|BinaryIO]:
+
+  """読み込み元を、XML の解析に用いる file-like オブジェクトとして開きます。
+
+  Notes
+  -----
+  バイナリの file-like オブジェクトまたはファイルの内容が gzip で圧縮されている場合、
+  `gzip.GzipFile` により解析の進行に合わせて逐次的に展開される file-like オブジェクトが返されます。
+  圧縮の有無はファイル名ではなく先頭の 2 バイトにより判定されます。
+  引数に渡された file-like オブジェクトは閉じられません。
+
+  Parameters
+  ----------
+  source : TextIOBase|BinaryIO|Path|str
+    読み込み元となる file-like オブジェクト、またはファイルパスです。
+
+  Returns
+  -------
+  Iterator[TextIOBase|BinaryIO]
+    解析に用いる file-like オブジェクトを返すコンテキストマネージャです。
+  """
+
+  if isinstance(source, (Path, str)):
+    with open(source, "rb") as stream:
+      with open_source(stream) as opened_stream:
+        yield opened_stream
+  elif isinstance(source, TextIOBase):
+    yield source
+  elif _is_gzip(source):
+    with gzip.GzipFile(fileobj=source, mode="rb") as decompressed_stream:
+      yield decompressed_stream
+  else:
+    yield source
+
+def decode_children (schema:XMLSchema, stream:TextIOBase|BinaryIO, tag:str, lazy:bool=False) -> Iterator[dict]:
+
+  """XML スキーマによる検証を行いながら、ルート要素の各子要素を `dict` に変換して返します。
+
+  Notes
+  -----
+  `lazy` が偽であれば、文書全体が `XMLSchema.to_dict` により一度に変換されます。
+  真であれば `xmlschema.XMLResource` の遅延リソースと `XMLSchema.iter_decode` により子要素が一つずつ検証・変換され、
+  変換済みの子要素は破棄されるため、メモリの使用量は文書の大きさに依存しません。
+  ただし変換に要する時間は増加します。
+
+  Parameters
+  ----------
+  schema : XMLSchema
+    検証に用いる XML スキーマです。
+  stream : TextIOBase|BinaryIO
+    解析する file-like オブジェクトです。
+  tag : str
+    変換する子要素の名前です。
+  lazy : bool
+    子要素を一つずつ検証・変換するかを設定します。
+    未指定ならば `False` が設定されます。
+
+  Returns
+  -------
+  Iterator[dict]
+    文書に記録された順に子要素を返すイテレータです。
+
+  Raises
+  ------
+  ValueError
+    `lazy` が真であり、文書に子要素が一つも含まれない場合に送出されます。
+  """
+
+  if lazy:
+    resource = XMLResource(stream, lazy=True)
+    count = 0
+    for child in schema.iter_decode(resource, path="*", validation="strict"):
+      count += 1
+      yield child
+    if count == 0:
+      raise ValueError("{:s} has no <{:s}> elements.".format(str(resource.root.tag), tag))
+  else:
+    yield from schema.to_dict(stream)[tag]
+
+def batched (iterable:Iterable[T], size:int) -> Iterator[list[T]]:
+
+  """`iterable` の要素を `size` 個ずつのリストにまとめて返します。"""
+
+  iterator = iter(iterable)
+  while True:
+    batch = list(itertools.islice(iterator, size))
+    if not batch:
+      return
+    yield batch
+
+def map_in_processes (function:Callable[[S], T], items:Iterable[S], workers:int|None=None) -> Iterator[T]:
+
+  """各要素に関数を適用し、その結果を要素の順番通りに返します。
+
+  Notes
+  -----
+  `workers` が `1` でなければ、関数は `concurrent.futures.ProcessPoolExecutor` により別々のプロセスで適用されます。
+  そのため `function` とその引数および戻り値は `pickle` で直列化可能である必要があります。
+
+  Parameters
+  ----------
+  function : Callable[[S], T]
+    各要素に適用する関数です。
+  items : Iterable[S]
+    関数を適用する要素の集合です。
+  workers : int|None
+    関数を適用するプロセスの数です。
+    `1` ならば関数は現在のプロセスで逐次的に適用されます。
+    未指定ならば `concurrent.futures.ProcessPoolExecutor` の既定値が用いられます。
+
+  Returns
+  -------
+  Iterator[T]
+    各要素に関数を適用した結果を `items` の順番通りに返すイテレータです。
+  """
+
+  items = list(items)
+  if workers == 1 or len(items) <= 1:
+    for item in items:
+      yield function(item)
+  else:
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+      yield from executor.map(function, items)
+
+def parse_files (parse_file:Callable[[Path], T], files:Iterable[Path|str], workers:int|None=None) -> Iterator[T]:
+
+  """複数のファイルを解析し、その結果をファイルの順番通りに返します。
+
+  Notes
+  -----
+  各ファイルは `map_in_processes` 関数により解析されます。
+
+  Parameters
+  ----------
+  parse_file : Callable[[Path], T]
+    一つのファイルを解析する関数です。
+  files : Iterable[Path|str]
+    解析するファイルパスの集合です。
+  workers : int|None
+    解析を行うプロセスの数です。
+    `1` ならば解析は現在のプロセスで逐次的に行われます。
+    未指定ならば `concurrent.futures.ProcessPoolExecutor` の既定値が用いられます。
+
+  Returns
+  -------
+  Iterator[T]
+    各ファイルの解析結果を `files` の順番通りに返すイテレータです。
+  """
+
+  return map_in_processes(parse_file, [Path(file) for file in files], workers)
+
+def split_ranges (file:Path|str, root_tag:str, child_tag:str, count:int) -> tuple[bytes, bytes, list[tuple[int, int]]]:
+
+  """XML のファイルを、ルート要素の子要素の境界で複数の範囲に分割します。
+
+  Notes
+  -----
+  ファイルは `mmap` によりメモリに割り当てられ、各範囲の境界は子要素の開始タグを正規表現で検索することで求められます。
+  よって子要素の開始タグと同一の文字列がコメントや CDATA セクションに含まれるファイルは正しく分割できません。
+  各範囲の内容の前後に `header`, `footer` を連結したものは、元のファイルと同一のルート要素を持つ文書になります。
+
+  Parameters
+  ----------
+  file : Path|str
+    分割するファイルのパスです。
+  root_tag : str
+    ルート要素の名前です。
+  child_tag : str
+    子要素の名前です。
+  count : int
+    分割する範囲の数の目安です。
+    子要素の数が少ない場合、実際の範囲の数はこれより少なくなります。
+
+  Returns
+  -------
+  tuple[bytes, bytes, list[tuple[int, int]]]
+    XML 宣言とルート要素の開始タグまでの内容、ルート要素の終了タグ以降の内容、各範囲の開始位置と終了位置の組のリストです。
+    ルート要素や子要素が見つからない場合、範囲のリストは空になります。
+  """
+
+  with open(file, "rb") as stream, mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as data:
+    root_match = re.compile(rb"<(?:([\w.-]+):)?" + re.escape(root_tag.encode("utf-8")) + rb"[\s>]").search(data)
+    if root_match is None:
+      return b"", b"", []
+    prefix = root_match.group(1) + b":" if root_match.group(1) else b""
+    header_end = data.find(b">", root_match.end() -1) +1
+    footer_start = data.rfind(b"</" + prefix + root_tag.encode("utf-8"))
+    if header_end <= 0 or footer_start < header_end:
+      return b"", b"", []
+    child_pattern = re.compile(rb"<" + re.escape(prefix + child_tag.encode("utf-8")) + rb"[\s>]")
+    starts = []
+    for index in range(count):
+      child_match = child_pattern.search(data, header_end + (footer_start - header_end) * index // count, footer_start)
+      if child_match is None:
+        break
+      if not starts or starts[-1] != child_match.start():
+        starts.append(child_match.start())
+    return data[:header_end], data[footer_start:], list(zip(starts, starts[1:] + [footer_start]))
+
+def read_range (file:Path|str, header:bytes, footer:bytes, span:tuple[int, int]) -> BytesIO:
+
+  """`split_ranges` 関数で求めた範囲を、単独の文書として読み込みます。
+
+  Parameters
+  ----------
+  file : Path|str
+    読み込むファイルのパスです。
+  header : bytes
+    範囲の内容の前に連結する内容です。
+  footer : bytes
+    範囲の内容の後に連結する内容です。
+  span : tuple[int, int]
+    範囲の開始位置と終了位置の組です。
+
+  Returns
+  -------
+  BytesIO
+    範囲の内容を含む文書です。
+  """
+
+  start, end = span
+  with open(file, "rb") as stream, mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as data:
+    return BytesIO(header + data[start:end] + footer)
+
+def read_root (source:TextIOBase|BinaryIO|Path|str) -> tuple[str, frozenset[str]]:
+
+  """文書のルート要素の名前と、ルート要素で宣言された名前空間を返します。
+
+  Notes
+  -----
+  文書はルート要素の開始タグまでのみ解析されるため、処理量は文書の大きさに依存しません。
+  gzip で圧縮されたファイルは `open_source` 関数により展開されながら解析されます。
+
+  Parameters
+  ----------
+  source : TextIOBase|BinaryIO|Path|str
+    読み込み元となる file-like オブジェクト、またはファイルパスです。
+
+  Returns
+  -------
+  tuple[str, frozenset[str]]
+    "{名前空間}タグ名" の形式のルート要素の名前と、宣言された名前空間の URI の集合の組です。
+
+  Raises
+  ------
+  ValueError
+    ルート要素が存在しない場合に送出されます。
+  """
+
+  namespaces = set()
+  with open_source(source) as stream:
+    for event, item in ElementTree.iterparse(stream, events=("start-ns", "start")):
+      if event == "start-ns":
+        namespaces.add(item[1])
+      else:
+        return item.tag, frozenset(namespaces)
+  raise ValueError()
@@ -0,0 +1,244 @@
+import time
+import sqlite3
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import NamedTuple, Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+class PhaseMetric (NamedTuple):
+
+  """処理の一段階に要した時間を表現します。
+
+  Attributes
+  ----------
+  source : Path
+    計測された処理を行ったサイトマップの保存先となるファイルパスです。
+  phase : str
+    処理の段階の名前です。
+    "register", "register_many", "list_all", "load", "fetch", "render", "write", "save_files", "snapshot", "load_files", "load_parallel" などが報告されます。
+  seconds : float
+    処理に要した秒数です。
+  rows : int
+    処理されたレコードの数です。
+  """
+
+  source:Path
+  phase:str
+  seconds:float
+  rows:int
+
+  @property
+  def rows_per_second (self) -> float:
+
+    """1 秒あたりに処理されたレコードの数を返します。"""
+
+    if 0 < self.seconds:
+      return self.rows / self.seconds
+    else:
+      return 0.0
+
+class FileMetric (NamedTuple):
+
+  """保存されたファイルの情報を表現します。
+
+  Attributes
+  ----------
+  source : Path
+    ファイルを保存したサイトマップの保存先となるファイルパスです。
+  file : Path
+    保存されたファイルのパスです。
+  bytes : int
+    保存されたファイルのバイト数です。
+  entries : int
+    保存されたファイルに記録された子要素 (<url>, <sitemap>) の数です。
+  changed : bool
+    ファイルの内容が変更されたかを表します。
+  """
+
+  source:Path
+  file:Path
+  bytes:int
+  entries:int
+  changed:bool
+
+class StoreMetric (NamedTuple):
+
+  """サイトマップの情報を保持するストアの大きさを表現します。
+
+  Attributes
+  ----------
+  source : Path
+    ストアを持つサイトマップの保存先となるファイルパスです。
+  bytes : int
+    ストアのバイト数です。
+  """
+
+  source:Path
+  bytes:int
+
+class IMetricsCollector (ABC):
+
+  """サイトマップの各処理の計測結果を受け取るための規格を提供します。
+
+  Notes
+  -----
+  各クラスは `metrics` 引数に本クラスのインスタンスが指定された場合にのみ計測を行います。
+  未指定の場合は計測のための処理は一切行われません。
+  """
+
+  @abstractmethod
+  def on_phase (self, metric:PhaseMetric):
+
+    """処理の一段階が完了した際に呼び出されます。"""
+
+    pass
+
+  @abstractmethod
+  def on_file (self, metric:FileMetric):
+
+    """ファイルが保存された際に呼び出されます。"""
+
+    pass
+
+  @abstractmethod
+  def on_store (self, metric:StoreMetric):
+
+    """ストアの大きさが計測された際に呼び出されます。"""
+
+    pass
+
+class MetricsRecorder (IMetricsCollector):
+
+  """計測結果をリストに記録する `IMetricsCollector` の実装です。
+
+  Attributes
+  ----------
+  phases : list[PhaseMetric]
+    記録された `PhaseMetric` のリストです。
+  files : list[FileMetric]
+    記録された `FileMetric` のリストです。
+  stores : list[StoreMetric]
+    記録された `StoreMetric` のリストです。
+  """
+
+  def __init__ (self):
+    self.phases = []
+    self.files = []
+    self.stores = []
+
+  def on_phase (self, metric:PhaseMetric):
+    self.phases.append(metric)
+
+  def on_file (self, metric:FileMetric):
+    self.files.append(metric)
+
+  def on_store (self, metric:StoreMetric):
+    self.stores.append(metric)
+
+  def total_seconds (self, phase:str) -> float:
+
+    """任意の段階に要した時間の合計を返します。"""
+
+    return sum(metric.seconds for metric in self.phases if metric.phase == phase)
+
+class CallbackMetricsCollector (IMetricsCollector):
+
+  """全ての計測結果を単一の関数に渡す `IMetricsCollector` の実装です。
+
+  Examples
+  --------
+  >>> sitemap = Sitemap("./sample.xml", metrics=CallbackMetricsCollector(print))
+
+  Parameters
+  ----------
+  callback : Callable[[PhaseMetric|FileMetric|StoreMetric], None]
+    計測結果を受け取る関数です。
+  """
+
+  def __init__ (self, callback:Callable[[PhaseMetric|FileMetric|StoreMetric], None]):
+    self._callback = callback
+
+  def on_phase (self, metric:PhaseMetric):
+    self._callback(metric)
+
+  def on_file (self, metric:FileMetric):
+    self._callback(metric)
+
+  def on_store (self, metric:StoreMetric):
+    self._callback(metric)
+
+class PhaseTimer:
+
+  """反復処理や関数呼び出しに要した時間を累積するクラスです。"""
+
+  def __init__ (self):
+    self.seconds = 0.0
+    self.count = 0
+
+  def iterate (self, iterable:Iterable[T]) -> Iterator[T]:
+
+    """要素の取得に要した時間を累積しながら `iterable` の要素を返します。"""
+
+    iterator = iter(iterable)
+    while True:
+      start = time.perf_counter()
+      try:
+        item = next(iterator)
+      except StopIteration:
+        self.seconds += time.perf_counter() - start
+        return
+      self.seconds += time.perf_counter() - start
+      self.count += 1
+      yield item
+
+  def wrap (self, function:Callable[..., T]) -> Callable[..., T]:
+
+    """呼び出しに要した時間を累積する関数を返します。"""
+
+    def wrapped (*args, **kwargs):
+      start = time.perf_counter()
+      try:
+        return function(*args, **kwargs)
+      finally:
+        self.seconds += time.perf_counter() - start
+        self.count += 1
+    return wrapped
+
+def report_phase (metrics:IMetricsCollector, source:Path, phase:str, start:float, rows:int):
+
+  """`start` から現在までの経過時間を処理の一段階として `metrics` に報告します。
+
+  Parameters
+  ----------
+  metrics : IMetricsCollector
+    計測結果の報告先です。
+  source : Path
+    処理を行ったサイトマップの保存先となるファイルパスです。
+  phase : str
+    処理の段階の名前です。
+  start : float
+    処理の開始時に `time.perf_counter` で取得した値です。
+  rows : int
+    処理されたレコードの数です。
+  """
+
+  metrics.on_phase(PhaseMetric(source, phase, time.perf_counter() - start, rows))
+
+def report_store (metrics:IMetricsCollector, source:Path, connection:sqlite3.Connection):
+
+  """SQLite のデータベースの大きさを `metrics` に報告します。
+
+  Parameters
+  ----------
+  metrics : IMetricsCollector
+    計測結果の報告先です。
+  source : Path
+    ストアを持つサイトマップの保存先となるファイルパスです。
+  connection : sqlite3.Connection
+    計測するデータベースへの接続です。
+  """
+
+  page_count, = connection.execute("PRAGMA page_count").fetchone()
+  page_size, = connection.execute("PRAGMA page_size").fetchone()
+  metrics.on_store(StoreMetric(source, page_count * page_size))
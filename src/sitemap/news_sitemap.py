@@ -0,0 +1,58 @@
+import datetime
+from typing import NamedTuple, ClassVar
+from .extension import Extension, ExtensionSitemap
+
+class News (NamedTuple):
+
+  """ニュースサイトマップの <news:news> の内容を表現します。
+
+  Attributes
+  ----------
+  publication_name : str
+    <news:publication> 直下にある <news:name> の値です。
+  publication_language : str
+    <news:publication> 直下にある <news:language> の値です。
+  publication_date : datetime.datetime
+    <news:publication_date> の値です。
+  title : str
+    <news:title> の値です。
+  """
+
+  publication_name:str
+  publication_language:str
+  publication_date:datetime.datetime
+  title:str
+
+MAX_NEWS_PER_FILE:int = 1000
+
+class NewsSitemap (ExtensionSitemap[News]):
+
+  """ニュースサイトマップを表現するクラスです。
+
+  Examples
+  --------
+  >>> import datetime
+  >>>
+  >>> sitemap = NewsSitemap("./sample.xml")
+  >>> sitemap.register("http://www.example.com/article.html", News("The Example Times", "en", datetime.datetime(2025, 1, 23), "title"))
+  >>> sitemap.save_files()
+  [<sitemap.extension.ExtensionSitemapFile object at 0xXXXXXXXXXXXXXXXX>]
+
+  Notes
+  -----
+  一つのページには一つの <news:news> のみが記録されます。
+  一つのファイルに記録されるページの数は、既定では Google の制限に従い `1000` 件までとなります。
+  その他の引数は `ExtensionSitemap` と同様です。
+  """
+
+  EXTENSION:ClassVar[Extension[News]] = Extension(
+    News,
+    "news",
+    "http://www.google.com/schemas/sitemap-news/0.9",
+    paths={
+      "publication_name": "publication/name",
+      "publication_language": "publication/language",
+    },
+    schema="static/xsd/sitemap-news.xsd",
+    max_count=MAX_NEWS_PER_FILE,
+  )
@@ -0,0 +1,405 @@
+import time
+import sqlite3
+import datetime
+import itertools
+from io import TextIOBase, StringIO, BytesIO
+from typing import NamedTuple, ClassVar, BinaryIO, Iterable, Iterator, Sequence
+from pathlib import Path
+from xmlschema import XMLSchema
+from .abc import ISitemap, ISitemapFile, ILoadable
+from .store import Store
+from .sitemap import DEFAULT_PRIORITY, DEFAULT_CHANGE_FREQ, ChangeFreq, Sitemap
+from .image_sitemap import DEFAULT_MAX_IMAGES_PER_PAGE, DEFAULT_IMAGE_LIMIT_POLICY, Image, ImageLimitPolicy, ImageSitemap, ImageSitemapFile
+from .loader import batched, decode_children, open_source
+from .metrics import IMetricsCollector, report_phase
+from .writer import MAX_ENTRIES_PER_FILE, MAX_BYTES_PER_FILE, SitemapWriter, render_element, render_text_element, write_files
+
+class Page (NamedTuple):
+
+  """ページ情報と画像情報を併せ持つサイトマップの <url> の内容を表現します。
+
+  Attributes
+  ----------
+  loc : str
+    サイトマップの <loc> の値です。
+  last_mod : datetime.datetime
+    サイトマップの <lastmod> の値です。
+  priority : float
+    サイトマップの <priority> の値です。
+    未指定ならば `0.5` が設定されます。
+  change_freq : ChangeFreq
+    サイトマップの <changefreq> の値です。
+    未指定ならば `ChangeFreq.NONE` が設定されます。
+  images : Sequence[Image]
+    <url> 直下にある <image:image> の集合です。
+    未指定ならば空のタプルが設定されます。
+  """
+
+  loc:str
+  last_mod:datetime.datetime
+  priority:float = DEFAULT_PRIORITY
+  change_freq:ChangeFreq = DEFAULT_CHANGE_FREQ
+  images:Sequence[Image] = ()
+
+class PageSitemapFile (ISitemapFile):
+
+  """ページ情報と画像情報を併せ持つ単体のサイトマップのファイルを表現するクラスです。
+
+  Warnings
+  --------
+  本クラスは `PageSitemap.save_files` メソッドにより生成されることを想定しています。
+  よって手動での生成は推奨されません。
+  """
+
+  def __init__ (self, file:Path|str, pages:Sequence[Page], digest:str|None=None):
+    self._file = Path(file)
+    self._pages = pages
+    self._digest = digest
+
+  @property
+  def file (self) -> Path:
+    return self._file
+
+  @property
+  def last_mod (self) -> datetime.datetime|None:
+    return max((page.last_mod for page in self._pages), default=None)
+
+  @property
+  def digest (self) -> str|None:
+    return self._digest
+
+  _TAG:ClassVar[str] = ImageSitemapFile._TAG
+  _ATTRIBUTES:ClassVar[dict[str, str]] = ImageSitemapFile._ATTRIBUTES
+
+  @staticmethod
+  def _render (page:Page, use_indent:bool=False) -> bytes:
+    loc, last_mod, priority, change_freq, images = page
+    children = [
+      render_text_element("loc", loc, use_indent, 2),
+      render_text_element("lastmod", last_mod.date().isoformat(), use_indent, 2),
+    ]
+    if change_freq.value:
+      children.append(render_text_element("changefreq", change_freq.value, use_indent, 2))
+    if priority != 0.5:
+      children.append(render_text_element("priority", "{:.3f}".format(priority), use_indent, 2))
+    children.extend(ImageSitemapFile._render_image(image, use_indent) for image in images)
+    return render_element("url", children, use_indent, 1).encode("utf-8")
+
+  def save (self, use_indent:bool=False):
+    with SitemapWriter(self._file, self._TAG, self._ATTRIBUTES, use_indent) as writer:
+      for page in self._pages:
+        writer.write(self._render(page, use_indent))
+    self._digest = writer.digest
+
+class PageSitemap (Store, ISitemap, ILoadable):
+
+  """ページ情報と画像情報を一つの <url> にまとめて記録するサイトマップを表現するクラスです。
+
+  Examples
+  --------
+  >>> import datetime
+  >>>
+  >>> sitemap = PageSitemap("./sample.xml")
+  >>> sitemap.register("http://www.example.com/", datetime.datetime(2025, 1, 23))
+  >>> sitemap.register_image("http://www.example.com/", "http://www.example.com/img/top-image.jpg")
+  >>> sitemap.save_files()
+  [<sitemap.page_sitemap.PageSitemapFile object at 0xXXXXXXXXXXXXXXXX>]
+
+  Notes
+  -----
+  `Sitemap` と `ImageSitemap` に同じページを登録した場合とは異なり、ページ情報と画像情報は同じ <url> に書き込まれるため、<loc> が重複して保存されることはありません。
+  保存時にはページと画像を結合した単一の問い合わせを URL 順に走査し、各ページは一度だけ変換されます。
+  ファイルの分割は常にページ (<url>) の境界で行われ、一つのページの画像が複数のファイルに分かれることはありません。
+
+  Parameters
+  ----------
+  file : Path|str
+    サイトマップの保存先となるファイルパスです。
+  max_count : int
+    一つのファイルに記録されるページの最大数です。
+    この数を越えた場合、サイトマップは複数のファイルに分割して保存されます。
+    未指定ならば `50000` が設定されます。
+  max_bytes : int
+    一つのファイルの最大バイト数です。
+    この大きさを越えた場合、サイトマップは複数のファイルに分割して保存されます。
+    未指定ならば `52428800` (50MiB) が設定されます。
+  max_images_per_page : int
+    保存時に一つのページに記録される画像の最大数です。
+    未指定ならば `1000` が設定されます。
+  image_limit_policy : ImageLimitPolicy
+    ページの画像の数が `max_images_per_page` を越えた場合の処理です。
+    `ImageLimitPolicy.TRUNCATE` ならば画像の URL 順で先頭から `max_images_per_page` 個の画像のみが保存され、
+    `ImageLimitPolicy.RAISE` ならば `ValueError` が送出され、保存先のファイルはいずれも変更されません。
+    未指定ならば `ImageLimitPolicy.TRUNCATE` が設定されます。
+  metrics : IMetricsCollector|None
+    各処理の計測結果の報告先です。
+    指定された場合、`register_many`, `list_all`, `load`, `save_files` の各処理に要した時間、保存されたファイルの情報、およびストアの大きさが報告されます。
+    未指定ならば計測は行われません。
+  isolated_save : bool
+    `save_files` メソッドを、呼び出し時点の登録内容を複製したストアから行うかを設定します。
+    真であれば保存中も別のスレッドから登録を続けることができ、保存される内容は呼び出し時点のものに固定されます。
+    偽であれば保存が終わるまで、別のスレッドからの登録や取得は待機させられます。
+    ただし保存中は登録内容と同じ大きさのストアが一時的に作成されます。
+    また文書の作成は GIL を保持したまま行われるため、登録の処理量は向上しません。
+    未指定ならば `False` が設定されます。
+  lazy_load : bool
+    `load` メソッドで XML スキーマによる検証を <url> 要素ごとに逐次的に行うかを設定します。
+    真であれば検証済みのページ情報は一定件数ごとにまとめて登録され、読み込みに要するメモリの使用量はファイルの大きさに依存しなくなります。
+    ただし読み込みに要する時間は増加します。
+    未指定ならば `False` が設定されます。
+  """
+
+  def _db_prepare (self) -> sqlite3.Connection:
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    Sitemap._create_change_freq_table(connection)
+    connection.execute("CREATE TABLE page(id INTEGER PRIMARY KEY AUTOINCREMENT, loc TEXT, last_mod_seconds INTEGER, priority REAL, change_freq_id INT REFERENCES change_freq(id))")
+    connection.execute("CREATE UNIQUE INDEX page_loc ON page(loc)")
+    ImageSitemap._create_image_tables(connection)
+    return connection
+
+  def __init__ (self, file:Path|str, max_count:int=MAX_ENTRIES_PER_FILE, max_bytes:int=MAX_BYTES_PER_FILE, max_images_per_page:int=DEFAULT_MAX_IMAGES_PER_PAGE, image_limit_policy:ImageLimitPolicy=DEFAULT_IMAGE_LIMIT_POLICY, metrics:IMetricsCollector|None=None, isolated_save:bool=False, lazy_load:bool=False):
+    self._file = Path(file)
+    self._max_count = max_count
+    self._max_bytes = max_bytes
+    self._max_images_per_page = max_images_per_page
+    self._image_limit_policy = image_limit_policy
+    self._metrics = metrics
+    self._isolated_save = isolated_save
+    self._lazy_load = lazy_load
+    self._open_store()
+
+  _REGISTER_PAGE_SQL:ClassVar[str] = "INSERT INTO page(loc, last_mod_seconds, priority, change_freq_id) VALUES(?, ?, ?, (SELECT change_freq.id FROM change_freq WHERE change_freq.name = ?)) ON CONFLICT(loc) DO UPDATE SET last_mod_seconds = excluded.last_mod_seconds, priority = excluded.priority, change_freq_id = excluded.change_freq_id"
+
+  def register (self, loc:str, last_mod:datetime.datetime, priority:float=DEFAULT_PRIORITY, change_freq:ChangeFreq=DEFAULT_CHANGE_FREQ):
+
+    """サイトマップにページの URL を登録します。
+
+    Notes
+    -----
+    登録済みの URL が指定されたとき、本メソッドは既存のページ情報を更新します。
+    そのページに登録済みの画像情報は維持されます。
+
+    Arguments
+    ---------
+    loc : str
+      登録するページの URL です。
+    last_mod : datetime.datetime
+      登録するページの更新日時です。
+    priority : float
+      登録するページの優先度です。
+      未指定ならば `0.5` が設定されます。
+    change_freq : ChangeFreq
+      登録するページの更新頻度です。
+      未指定ならば `ChangeFreq.NONE` が設定されます。
+    """
+
+    self._closeable.must_be_open()
+    with self._lock:
+      self._connection.execute(self._REGISTER_PAGE_SQL, (loc, last_mod.timestamp(), priority, change_freq.value))
+
+  def register_image (self, loc:str, image_loc:str, image_caption:str="", image_geo_location:str="", image_title:str="", image_license:str=""):
+
+    """登録済みのページに画像の URL を登録します。
+
+    Notes
+    -----
+    登録済みの画像が指定されたとき、本メソッドは既存の画像情報を更新します。
+
+    Arguments
+    ---------
+    loc : str
+      登録する画像を参照するページの URL です。
+    image_loc : str
+      登録する画像の URL です。
+    image_caption : str
+      画像の説明文です。
+      未指定ならば空文字列が設定されます。
+    image_geo_location : str
+      画像の位置情報です。
+      未指定ならば空文字列が設定されます。
+    image_title : str
+      画像のタイトルです。
+      未指定ならば空文字列が設定されます。
+    image_license : str
+      画像のライセンス情報です。
+      未指定ならば空文字列が設定されます。
+
+    Raises
+    ------
+    ValueError
+      `loc` のページが登録されていない場合に送出されます。
+    """
+
+    self._closeable.must_be_open()
+    with self._lock:
+      if self._fetch_one("SELECT 1 FROM page WHERE loc == ?", (loc,)) is None:
+        raise ValueError("{:s} is not registered.".format(loc))
+      ImageSitemap._register_images(self._connection, [(loc, image_loc, image_caption, image_geo_location, image_title, image_license)])
+
+  _REGISTER_BATCH_SIZE:ClassVar[int] = 10000
+
+  def _register_rows (self, page_rows:list[tuple[str, float, float, str]], image_rows:list[tuple[str, str, str, str, str, str]]):
+    with self._lock:
+      self._connection.executemany(self._REGISTER_PAGE_SQL, page_rows)
+      ImageSitemap._register_images(self._connection, image_rows)
+
+  def register_many (self, pages:Iterable[Page]):
+
+    """サイトマップに複数のページ情報と、その画像情報をまとめて登録します。
+
+    Notes
+    -----
+    本メソッドは各ページについて `register` メソッドと `register_image` メソッドを繰り返し呼び出した場合と同じ結果になりますが、一定件数ごとに単一の SQL 文でまとめて処理するためより高速です。
+    引数 `pages` は逐次的に消費されるため、ジェネレータを指定することもできます。
+
+    Arguments
+    ---------
+    pages : Iterable[Page]
+      登録するページ情報の集合です。
+    """
+
+    self._closeable.must_be_open()
+    if self._metrics is not None:
+      start = time.perf_counter()
+    count = 0
+    for batch in batched(pages, self._REGISTER_BATCH_SIZE):
+      page_rows = [(loc, last_mod.timestamp(), priority, change_freq.value) for loc, last_mod, priority, change_freq, images in batch]
+      image_rows = [(loc, *image) for loc, last_mod, priority, change_freq, images in batch for image in images]
+      self._register_rows(page_rows, image_rows)
+      count += len(batch)
+    if self._metrics is not None:
+      report_phase(self._metrics, self._file, "register_many", start, count)
+
+  def unregister (self, loc:str):
+
+    """サイトマップに登録されたページ情報と、その全ての画像情報を削除します。
+
+    Notes
+    -----
+    削除するページが存在しない場合であっても、このメソッドは必ず成功します。
+
+    Arguments
+    ---------
+    loc : str
+      削除するページの URL です。
+    """
+
+    self._closeable.must_be_open()
+    with self._lock:
+      self._connection.execute("DELETE FROM image WHERE page_id == (SELECT id FROM page WHERE loc == ?)", (loc,))
+      self._connection.execute("DELETE FROM page WHERE loc == ?", (loc,))
+
+  def unregister_image (self, loc:str, image_loc:str):
+
+    """登録済みのページから画像情報を削除します。
+
+    Notes
+    -----
+    ページ情報は画像が一つも無くなった場合でも削除されません。
+    削除する画像が存在しない場合であっても、このメソッドは必ず成功します。
+
+    Arguments
+    ---------
+    loc : str
+      削除する画像を参照するページの URL です。
+    image_loc : str
+      削除する画像の URL です。
+    """
+
+    self._closeable.must_be_open()
+    with self._lock:
+      self._connection.execute("DELETE FROM image WHERE page_id == (SELECT id FROM page WHERE loc == ?) AND image_loc == ?", (loc, image_loc))
+
+  def clear (self):
+
+    """サイトマップに登録された全てのページ情報と画像情報を削除します。"""
+
+    self._closeable.must_be_open()
+    with self._lock:
+      self._connection.execute("DELETE FROM image")
+      self._connection.execute("DELETE FROM page")
+      self._connection.execute("DELETE FROM image_text")
+
+  _SELECT_SQL:ClassVar[str] = "SELECT page.loc, page.last_mod_seconds, page.priority, change_freq.name, image.image_loc, image.image_caption, geo_location.value, image.image_title, license.value FROM page INNER JOIN change_freq ON change_freq.id = page.change_freq_id LEFT JOIN image ON image.page_id = page.id LEFT JOIN image_text AS geo_location ON geo_location.id = image.image_geo_location_id LEFT JOIN image_text AS license ON license.id = image.image_license_id"
+
+  def _iter_pages (self, rows:Iterable[tuple], max_images_per_page:int|None=None) -> Iterator[Page]:
+    for loc, rows in itertools.groupby(rows, key=lambda row: row[0]):
+      if max_images_per_page is not None:
+        rows = itertools.islice(rows, max_images_per_page +1)
+      first_row = next(rows)
+      _, last_mod_seconds, priority, change_freq_name = first_row[:4]
+      images = [Image(image_loc, image_caption, image_geo_location, image_title, image_license) for _, _, _, _, image_loc, image_caption, image_geo_location, image_title, image_license in itertools.chain((first_row,), rows) if image_loc is not None]
+      ImageSitemap._limit_images(loc, images, max_images_per_page, self._image_limit_policy)
+      yield Page(loc, datetime.datetime.fromtimestamp(last_mod_seconds), priority, ChangeFreq(change_freq_name), images)
+
+  def get (self, loc:str) -> Page|None:
+
+    """サイトマップに登録された任意のページ情報を、その画像情報と共に取得します。
+
+    Arguments
+    ---------
+    loc : str
+      取得するページの URL です。
+
+    Returns
+    -------
+    Page|None
+      ページ情報の取得に成功したならば、その情報が設定された `Page` オブジェクトを返します。
+      逆にページ情報の取得に失敗したならば `None` が返されます。
+    """
+
+    self._closeable.must_be_open()
+    return next(self._iter_pages(self._fetch_all(self._SELECT_SQL + " WHERE page.loc == ? ORDER BY image.image_loc ASC", (loc,))), None)
+
+  def list_all (self) -> list[Page]:
+
+    """サイトマップに登録された全てのページ情報を、その画像情報と共にリストにして返します。
+
+    Returns
+    -------
+    list[Page]
+      サイトマップに登録された全てのページ情報のリストです。
+      本リストは整列済みの状態で返されます。
+    """
+
+    self._closeable.must_be_open()
+    if self._metrics is not None:
+      start = time.perf_counter()
+    result = list(self._iter_pages(self._fetch_all(self._SELECT_SQL + " ORDER BY page.loc ASC, image.image_loc ASC")))
+    if self._metrics is not None:
+      report_phase(self._metrics, self._file, "list_all", start, len(result))
+    return result
+
+  def save_files (self, use_indent:bool=False) -> list[ISitemapFile]:
+    self._closeable.must_be_open()
+    with self._save_source() as source:
+      pages = self._iter_pages(source._iter_query(self._SELECT_SQL + " ORDER BY page.loc ASC, image.image_loc ASC"), self._max_images_per_page)
+      return write_files(self._file, pages, PageSitemapFile._render, PageSitemapFile._TAG, PageSitemapFile._ATTRIBUTES, PageSitemapFile, use_indent=use_indent, max_count=self._max_count, max_bytes=self._max_bytes, metrics=self._metrics)
+
+  _XML_SCHEMA_TO_PARSE:ClassVar[XMLSchema] = ImageSitemap._XML_SCHEMA_TO_PARSE
+
+  @classmethod
+  def _iter_rows (cls, stream:TextIOBase|BinaryIO, lazy:bool=False) -> Iterator[tuple[tuple[str, float, float, str], list[tuple[str, str, str, str, str, str]]]]:
+    for url in decode_children(cls._XML_SCHEMA_TO_PARSE, stream, "url", lazy):
+      page_row = Sitemap._page_row(url)
+      yield page_row, list(ImageSitemap._iter_image_rows(page_row[0], url.get("image:image", [])))
+
+  def load (self, stream:TextIOBase|BinaryIO|Path|str):
+    self._closeable.must_be_open()
+    if self._metrics is not None:
+      start = time.perf_counter()
+    count = 0
+    with open_source(stream) as opened_stream:
+      for batch in batched(self._iter_rows(opened_stream, self._lazy_load), self._REGISTER_BATCH_SIZE):
+        self._register_rows([page_row for page_row, _ in batch], [image_row for _, image_rows in batch for image_row in image_rows])
+        count += len(batch)
+    if self._metrics is not None:
+      report_phase(self._metrics, self._file, "load", start, count)
+
+  def loads (self, source:str|bytes):
+    if isinstance(source, bytes):
+      stream = BytesIO(source)
+    else:
+      stream = StringIO(source)
+    with stream:
+      self.load(stream)
@@ -0,0 +1,129 @@
+import os
+import datetime
+import dataclasses
+from fnmatch import fnmatchcase
+from typing import Iterator
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .host import Host
+from .sitemap import URL, Sitemap
+
+@dataclass
+class DirectoryScanner:
+
+  """ディレクトリを走査し、含まれるファイルの URL と更新日時を列挙する機能を提供します。
+
+  Examples
+  --------
+  >>> host = Host("http", "www.example.com", "./public")
+  >>> scanner = DirectoryScanner(host, includes=["*.html"], excludes=["drafts"])
+  >>> sitemap = Sitemap("./public/sitemap.xml")
+  >>> scanner.register_to(sitemap)
+
+  Notes
+  -----
+  各パターンは `host.root_dir` からの相対パス ("/" 区切り) に対して `fnmatch.fnmatchcase` で照合されます。
+  なお "*" は "/" にも一致します。
+
+  Attributes
+  ----------
+  host : Host
+    URL の作成に用いる `Host` オブジェクトです。
+    走査は `host.root_dir` を起点に行われます。
+  includes : list[str]
+    列挙するファイルのパターンです。
+    未指定ならば全てのファイルが列挙されます。
+  excludes : list[str]
+    除外するファイルおよびディレクトリのパターンです。
+    ディレクトリが一致した場合、その配下は走査されません。
+    未指定ならば何も除外されません。
+  workers : int
+    ディレクトリを並行して走査する際のスレッド数です。
+    ネットワークファイルシステムのように応答の遅いファイルシステムでの使用を想定しています。
+    `1` ならば走査は単一のスレッドで行われます。
+    未指定ならば `1` が設定されます。
+  """
+
+  host:Host
+  includes:list[str] = field(default_factory=lambda: ["*"])
+  excludes:list[str] = field(default_factory=list)
+  workers:int = 1
+
+  def __post_init__ (self):
+    self._url_host = dataclasses.replace(self.host, use_filesystem=False)
+
+  def _is_excluded (self, relative_path:str) -> bool:
+    return any(fnmatchcase(relative_path, pattern) for pattern in self.excludes)
+
+  def _is_included (self, relative_path:str) -> bool:
+    return any(fnmatchcase(relative_path, pattern) for pattern in self.includes) and not self._is_excluded(relative_path)
+
+  def _scan_dir (self, dir_path:str, relative_dir:str) -> tuple[list[URL], list[tuple[str, str]]]:
+    urls = []
+    sub_dirs = []
+    with os.scandir(dir_path) as entries:
+      for entry in entries:
+        relative_path = relative_dir + entry.name
+        if entry.is_dir(follow_symlinks=False):
+          if not self._is_excluded(relative_path):
+            sub_dirs.append((entry.path, relative_path + "/"))
+        elif entry.is_file():
+          if self._is_included(relative_path):
+            last_mod = datetime.datetime.fromtimestamp(entry.stat().st_mtime)
+            urls.append(URL(self._url_host.path_to_url(entry.path), last_mod))
+    return urls, sub_dirs
+
+  def _scan_serial (self) -> Iterator[URL]:
+    pending = [(os.fspath(self.host.root_dir), "")]
+    while pending:
+      dir_path, relative_dir = pending.pop()
+      urls, sub_dirs = self._scan_dir(dir_path, relative_dir)
+      yield from urls
+      pending.extend(reversed(sub_dirs))
+
+  def _scan_parallel (self) -> Iterator[URL]:
+    with ThreadPoolExecutor(max_workers=self.workers) as executor:
+      futures = {executor.submit(self._scan_dir, os.fspath(self.host.root_dir), "")}
+      while futures:
+        done, futures = wait(futures, return_when=FIRST_COMPLETED)
+        for future in done:
+          urls, sub_dirs = future.result()
+          for dir_path, relative_dir in sub_dirs:
+            futures.add(executor.submit(self._scan_dir, dir_path, relative_dir))
+          yield from urls
+
+  def scan (self) -> Iterator[URL]:
+
+    """`host.root_dir` 配下のファイルを走査し、それらのページ情報を列挙します。
+
+    Notes
+    -----
+    ファイルの更新日時は `os.scandir` が返す `os.DirEntry` から取得されます。
+    シンボリックリンクされたディレクトリは走査されません。
+
+    Returns
+    -------
+    Iterator[URL]
+      URL と更新日時が設定された `URL` オブジェクトを逐次返すイテレータです。
+    """
+
+    if self.workers == 1:
+      return self._scan_serial()
+    else:
+      return self._scan_parallel()
+
+  def register_to (self, sitemap:Sitemap):
+
+    """走査したページ情報を `Sitemap` オブジェクトに登録します。
+
+    Notes
+    -----
+    ページ情報は `Sitemap.register_many` メソッドにより逐次的に登録されるため、全ての情報がメモリ上に保持されることはありません。
+
+    Parameters
+    ----------
+    sitemap : Sitemap
+      ページ情報の登録先です。
+    """
+
+    sitemap.register_many(self.scan())
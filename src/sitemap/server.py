@@ -0,0 +1,262 @@
+import gzip
+import hashlib
+import asyncio
+import datetime
+import functools
+import threading
+import urllib.parse
+import email.utils
+from typing import ClassVar
+from pathlib import Path
+from dataclasses import dataclass
+from .host import Host
+from .sitemap import Sitemap
+from .sitemap_index import Sitemap as IndexedSitemap, SitemapIndexFile
+from .writer import RenderedChunk, numbered_file, render_document
+
+_CONTENT_TYPE:str = "application/xml; charset=utf-8"
+
+@dataclass
+class SitemapServer:
+
+  """`Sitemap` オブジェクトの内容をファイルに保存することなく、要求に応じて配信する WSGI/ASGI アプリケーションです。
+
+  Examples
+  --------
+  >>> host = Host("https", "www.example.com", "./public")
+  >>> sitemap = Sitemap("./public/sitemap.xml")
+  >>> server = SitemapServer(host, sitemap, "./public/sitemap-index.xml")
+  >>>
+  >>> from wsgiref.simple_server import make_server
+  >>> make_server("", 8000, server.wsgi).serve_forever()
+
+  Notes
+  -----
+  各 URL は `save_files` メソッドで保存した場合のファイルパスを `host` で変換したものになります。
+  例えば "sitemap.xml" を保存先とするサイトマップの場合、"/sitemap.xml", "/sitemap2.xml" ... が配信され、
+  `index_file` の URL にはそれらを登録したサイトマップインデックスが配信されます。
+
+  各文書は `Sitemap.render_chunk` メソッドにより要求の都度作成され、直近に作成された文書は LRU キャッシュに保持されます。
+  文書の作成は要求ごとに並行して行われ、同じ文書を同時に要求された場合にのみ、先の要求による作成の完了を待って結果を共有します。
+  キャッシュは `Sitemap.version` の値ごとに区別されるため、サイトマップの内容が変更された後に古い文書が配信されることはありません。
+  サイトマップインデックスに記録する各文書の更新日時も同様に `Sitemap.version` の値ごとに一度のみ求められます。
+
+  要求の `Accept-Encoding` が gzip を許可する場合、文書は gzip で圧縮して配信されます。
+  "gzip;q=0" のように品質値が `0` の場合は許可されないものとして扱われ、"*" は gzip が明示されていない場合にのみ考慮されます。
+  また `ETag` には文書の SHA-256 ハッシュ値が、`Last-Modified` には文書に含まれる最も新しい更新日時が用いられ、
+  `If-None-Match`, `If-Modified-Since` による条件付きの要求には `304 Not Modified` が返されます。
+
+  Attributes
+  ----------
+  host : Host
+    ファイルパスから URL を作成するための `Host` オブジェクトです。
+  sitemap : Sitemap
+    配信する内容を保持する `Sitemap` オブジェクトです。
+  index_file : Path
+    サイトマップインデックスを保存する場合のファイルパスです。
+    このパスに対応する URL にサイトマップインデックスが配信されます。
+  use_indent : bool
+    インデントを用いるかを設定します。
+    未指定ならば `False` が設定されます。
+  cache_size : int
+    作成された文書を保持する LRU キャッシュの大きさです。
+    未指定ならば `64` が設定されます。
+  """
+
+  host:Host
+  sitemap:Sitemap
+  index_file:Path
+  use_indent:bool = False
+  cache_size:int = 64
+
+  def __post_init__ (self):
+    self.index_file = Path(self.index_file)
+    self._lock = threading.Lock()
+    self._pending = {}
+    self._render_chunk = functools.lru_cache(maxsize=self.cache_size)(self._render_chunk_uncached)
+    self._render_index = functools.lru_cache(maxsize=1)(self._render_index_uncached)
+    self._compress = functools.lru_cache(maxsize=self.cache_size)(self._compress_uncached)
+    self._routes = functools.lru_cache(maxsize=1)(self._routes_uncached)
+    self._chunk_last_mods = functools.lru_cache(maxsize=1)(self._chunk_last_mods_uncached)
+
+  def _chunk_url (self, index:int) -> str:
+    return self.host.path_to_url(numbered_file(self.sitemap.file, index))
+
+  def _chunk_last_mods_uncached (self, version:int) -> list[datetime.datetime]:
+    return self.sitemap.chunk_last_mods()
+
+  def _routes_uncached (self, chunk_count:int) -> dict[str, int|None]:
+    routes = {urllib.parse.urlparse(self.host.path_to_url(self.index_file)).path: None}
+    for index in range(chunk_count):
+      routes[urllib.parse.urlparse(self._chunk_url(index)).path] = index
+    return routes
+
+  def _render_chunk_uncached (self, index:int, version:int) -> RenderedChunk:
+    return self.sitemap.render_chunk(index, self.use_indent)
+
+  def _render_index_uncached (self, version:int) -> RenderedChunk:
+    sitemaps = [IndexedSitemap(self._chunk_url(index), last_mod) for index, last_mod in enumerate(self._chunk_last_mods(version))]
+    content = render_document((SitemapIndexFile._render(sitemap, self.use_indent) for sitemap in sitemaps), SitemapIndexFile._TAG, SitemapIndexFile._ATTRIBUTES, self.use_indent)
+    return RenderedChunk(content, hashlib.sha256(content).hexdigest(), max((sitemap.last_mod for sitemap in sitemaps), default=None), len(sitemaps))
+
+  @staticmethod
+  def _compress_uncached (content:bytes) -> bytes:
+    return gzip.compress(content, mtime=0)
+
+  def _cached (self, function, *key):
+    with self._lock:
+      pending = self._pending.setdefault((function, *key), [threading.Lock(), 0])
+      pending[1] += 1
+    try:
+      with pending[0]:
+        return function(*key)
+    finally:
+      with self._lock:
+        pending[1] -= 1
+        if pending[1] == 0:
+          del self._pending[(function, *key)]
+
+  def _find (self, path:str) -> RenderedChunk|None:
+    version = self.sitemap.version
+    routes = self._cached(self._routes, self.sitemap.chunk_count())
+    if path not in routes:
+      return None
+    index = routes[path]
+    if index is None:
+      return self._cached(self._render_index, version)
+    try:
+      return self._cached(self._render_chunk, index, version)
+    except IndexError:
+      return None
+
+  @staticmethod
+  def _accepts_gzip (accept_encoding:str) -> bool:
+    qualities = {}
+    for coding in accept_encoding.split(","):
+      name, _, parameters = coding.partition(";")
+      name = name.strip().lower()
+      if not name:
+        continue
+      quality = 1.0
+      for parameter in parameters.split(";"):
+        key, _, value = parameter.partition("=")
+        if key.strip().lower() == "q":
+          try:
+            quality = float(value.strip())
+          except ValueError:
+            quality = 0.0
+      qualities[name] = quality
+    if "gzip" in qualities:
+      return 0 < qualities["gzip"]
+    if "x-gzip" in qualities:
+      return 0 < qualities["x-gzip"]
+    return 0 < qualities.get("*", 0.0)
+
+  @staticmethod
+  def _not_modified (chunk:RenderedChunk, etag:str, headers:dict[str, str]) -> bool:
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+      tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+      return "*" in tags or etag in tags
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since is not None and chunk.last_mod is not None:
+      try:
+        since = email.utils.parsedate_to_datetime(if_modified_since)
+      except (TypeError, ValueError):
+        return False
+      if since.tzinfo is None:
+        since = since.replace(tzinfo=datetime.timezone.utc)
+      return chunk.last_mod.astimezone(datetime.timezone.utc).replace(microsecond=0) <= since
+    return False
+
+  def respond (self, method:str, path:str, headers:dict[str, str]) -> tuple[int, list[tuple[str, str]], bytes]:
+
+    """要求に対する応答を作成します。
+
+    Notes
+    -----
+    本メソッドは `wsgi`, `asgi` メソッドから呼び出されます。
+    それ以外のフレームワークに組み込む際に直接用いることもできます。
+
+    Arguments
+    ---------
+    method : str
+      要求のメソッドです。
+    path : str
+      要求された URL のパス部分です。
+    headers : dict[str, str]
+      要求のヘッダーです。キーは小文字である必要があります。
+
+    Returns
+    -------
+    tuple[int, list[tuple[str, str]], bytes]
+      応答のステータスコード、ヘッダー、本文の組です。
+    """
+
+    if method not in ("GET", "HEAD"):
+      return 405, [("Allow", "GET, HEAD"), ("Content-Length", "0")], b""
+    chunk = self._find(path)
+    if chunk is None:
+      return 404, [("Content-Length", "0")], b""
+    use_gzip = self._accepts_gzip(headers.get("accept-encoding", ""))
+    if use_gzip:
+      etag = "\"{:s}-gzip\"".format(chunk.digest)
+    else:
+      etag = "\"{:s}\"".format(chunk.digest)
+    response_headers = [("ETag", etag), ("Vary", "Accept-Encoding")]
+    if chunk.last_mod is not None:
+      response_headers.append(("Last-Modified", email.utils.format_datetime(chunk.last_mod.astimezone(datetime.timezone.utc), usegmt=True)))
+    if self._not_modified(chunk, etag, headers):
+      return 304, response_headers, b""
+    if use_gzip:
+      body = self._compress(chunk.content)
+      response_headers.append(("Content-Encoding", "gzip"))
+    else:
+      body = chunk.content
+    response_headers.append(("Content-Type", _CONTENT_TYPE))
+    response_headers.append(("Content-Length", str(len(body))))
+    if method == "HEAD":
+      body = b""
+    return 200, response_headers, body
+
+  _REASONS:ClassVar[dict[int, str]] = {
+    200: "OK",
+    304: "Not Modified",
+    404: "Not Found",
+    405: "Method Not Allowed",
+  }
+
+  def wsgi (self, environ:dict, start_response) -> list[bytes]:
+
+    """WSGI アプリケーションとして要求を処理します。"""
+
+    headers = {key[5:].replace("_", "-").lower(): value for key, value in environ.items() if key.startswith("HTTP_")}
+    status, response_headers, body = self.respond(environ.get("REQUEST_METHOD", "GET"), environ.get("PATH_INFO", "/"), headers)
+    start_response("{:d} {:s}".format(status, self._REASONS[status]), response_headers)
+    return [body]
+
+  async def asgi (self, scope:dict, receive, send):
+
+    """ASGI アプリケーションとして要求を処理します。
+
+    Notes
+    -----
+    文書の作成は `asyncio.to_thread` により別のスレッドで行われるため、イベントループを停止させることはありません。
+    """
+
+    if scope["type"] == "lifespan":
+      while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+          await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+          await send({"type": "lifespan.shutdown.complete"})
+          return
+    headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope.get("headers", [])}
+    status, response_headers, body = await asyncio.to_thread(self.respond, scope.get("method", "GET"), scope.get("path", "/"), headers)
+    await send({
+      "type": "http.response.start",
+      "status": status,
+      "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in response_headers],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -1,16 +1,28 @@
 
+import os
+import time
+import hashlib
 import sqlite3
 import datetime
+import functools
 import importlib.resources
-import itertools
-from io import TextIOBase, StringIO
-from xml.etree import ElementTree as ETree
+from io import TextIOBase, StringIO, BytesIO
 from enum import Enum
-from typing import NamedTuple, ClassVar
+from array import array
+from typing import NamedTuple, ClassVar, BinaryIO, Iterable, Iterator, Sequence
 from pathlib import Path
-from closeable import ICloseable, Closeable
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
 from xmlschema import XMLSchema
 from .abc import ISitemap, ISitemapFile, ILoadable
+from .store import Store
+from .diff import Change, FeedEntry, merge_diff
+from .front_coding import FrontCodedStrings
+from .host import Host
+from .loader import GZIP_MAGIC, XSI_NAMESPACE, batched, decode_children, map_in_processes, open_source, parse_files, read_range, split_ranges
+from .metrics import IMetricsCollector, report_phase
+from .sitemap_index import SitemapIndex
+from .writer import MAX_ENTRIES_PER_FILE, MAX_BYTES_PER_FILE, RenderedChunk, SitemapWriter, numbered_file, render_document, render_element, render_text_element, write_files
 
 class ChangeFreq (Enum):
 
@@ -51,6 +63,117 @@ class URL (NamedTuple):
   priority:float = DEFAULT_PRIORITY
   change_freq:ChangeFreq = DEFAULT_CHANGE_FREQ
 
+class Alternate (NamedTuple):
+
+  """サイトマップの <xhtml:link rel="alternate"> の内容を表現します。
+
+  Attributes
+  ----------
+  hreflang : str
+    <xhtml:link> の hreflang 属性の値です。
+  href : str
+    <xhtml:link> の href 属性の値です。
+  """
+
+  hreflang:str
+  href:str
+
+_NAMESPACE:str = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+
+def iterparse_urls (file:Path|str) -> Iterator[URL]:
+
+  """サイトマップファイルを逐次的に解析し、記録されたページ情報を列挙します。
+
+  Notes
+  -----
+  本関数は `xml.etree.ElementTree.iterparse` を用いて <url> 要素を一つずつ処理し、処理済みの要素は破棄されます。
+  よってファイルの大きさに関わらず、メモリの使用量は一定に保たれます。
+  ただし `Sitemap.load` メソッドとは異なり、XML スキーマによる検証は行われません。
+  gzip で圧縮されたファイルは逐次的に展開されながら解析されます。
+
+  Parameters
+  ----------
+  file : Path|str
+    解析するサイトマップファイルのパスです。
+
+  Returns
+  -------
+  Iterator[URL]
+    ファイルに記録された順にページ情報を返すイテレータです。
+  """
+
+  with open_source(file) as stream:
+    context = ElementTree.iterparse(stream, events=("start", "end"))
+    _, root = next(context)
+    for event, element in context:
+      if event == "end" and element.tag == _NAMESPACE + "url":
+        loc = element.findtext(_NAMESPACE + "loc")
+        if not loc:
+          raise ValueError()
+        last_mod_source = element.findtext(_NAMESPACE + "lastmod")
+        if last_mod_source:
+          last_mod = datetime.datetime.fromisoformat(last_mod_source)
+        else:
+          raise ValueError()
+        priority_source = element.findtext(_NAMESPACE + "priority")
+        if priority_source:
+          priority = float(priority_source)
+        else:
+          priority = DEFAULT_PRIORITY
+        change_freq_source = element.findtext(_NAMESPACE + "changefreq")
+        if change_freq_source:
+          change_freq = ChangeFreq(change_freq_source)
+        else:
+          change_freq = DEFAULT_CHANGE_FREQ
+        root.clear()
+        yield URL(loc, last_mod, priority, change_freq)
+
+_CHANGE_FREQS:tuple[ChangeFreq, ...] = tuple(ChangeFreq)
+
+class CompactURLs (Sequence[URL]):
+
+  """URL 順に整列済みのページ情報を、メモリ上に圧縮して保持するクラスです。
+
+  Notes
+  -----
+  URL は `FrontCodedStrings` により前方符号化され、更新日時・優先度・更新頻度はそれぞれ `array.array` に格納されます。
+  各要素は取り出される際に `URL` オブジェクトとして復元されます。
+
+  Parameters
+  ----------
+  urls : Iterable[URL]
+    URL 順に整列済みのページ情報の集合です。
+  """
+
+  def __init__ (self, urls:Iterable[URL]):
+    self._last_mod_seconds = array("d")
+    self._priorities = array("d")
+    self._change_freqs = array("B")
+    def locs ():
+      for loc, last_mod, priority, change_freq in urls:
+        self._last_mod_seconds.append(last_mod.timestamp())
+        self._priorities.append(priority)
+        self._change_freqs.append(_CHANGE_FREQS.index(change_freq))
+        yield loc
+    self._locs = FrontCodedStrings(locs())
+
+  def __len__ (self) -> int:
+    return len(self._locs)
+
+  def _make (self, index:int, loc:str) -> URL:
+    return URL(loc, datetime.datetime.fromtimestamp(self._last_mod_seconds[index]), self._priorities[index], _CHANGE_FREQS[self._change_freqs[index]])
+
+  def __iter__ (self) -> Iterator[URL]:
+    for index, loc in enumerate(self._locs):
+      yield self._make(index, loc)
+
+  def __getitem__ (self, index:int) -> URL:
+    if isinstance(index, slice):
+      return [self[i] for i in range(*index.indices(len(self)))]
+    if index < 0:
+      index += len(self)
+    return self._make(index, self._locs[index])
+
 class SitemapFile (ISitemapFile):
 
   """単体のサイトマップファイルを表現するクラスです。
@@ -61,41 +184,72 @@ class SitemapFile (ISitemapFile):
   よって手動での生成は推奨されません。
   """
 
-  def __init__ (self, file:Path|str, urls:list[URL]):
+  def __init__ (self, file:Path|str, urls:Sequence[URL], digest:str|None=None, alternates:Sequence[tuple[Alternate, ...]]|None=None):
     self._file = Path(file)
     self._urls = urls
+    self._digest = digest
+    self._alternates = alternates
 
   @property
   def file (self) -> Path:
     return self._file
 
-  def _as_element (self) -> ETree.Element:
-    urlset_node = ETree.Element("urlset", {
-      "xmlns": "http://www.sitemaps.org/schemas/sitemap/0.9",
-    })
-    for loc, last_mod, priority, change_freq in self._urls:
-      url_node = ETree.SubElement(urlset_node, "url")
-      loc_node = ETree.SubElement(url_node, "loc")
-      loc_node.text = loc
-      last_mod_node = ETree.SubElement(url_node, "lastmod")
-      last_mod_node.text = last_mod.date().isoformat()
-      if priority != 0.5:
-        priority_node = ETree.SubElement(url_node, "priority")
-        priority_node.text = "{:.3f}".format(priority)
-      if change_freq.value:
-        change_freq_node = ETree.SubElement(url_node, "changefreq")
-        change_freq_node.text = change_freq.value
-    return urlset_node
+  @property
+  def last_mod (self) -> datetime.datetime|None:
+    return max((last_mod for loc, last_mod, priority, change_freq in self._urls), default=None)
 
-  def save (self, use_indent:bool=False):
-    element = self._as_element()
+  @property
+  def digest (self) -> str|None:
+    return self._digest
+
+  _TAG:ClassVar[str] = "urlset"
+  _ATTRIBUTES:ClassVar[dict[str, str]] = {
+    "xmlns": "http://www.sitemaps.org/schemas/sitemap/0.9",
+  }
+  _ALTERNATE_ATTRIBUTES:ClassVar[dict[str, str]] = {
+    "xmlns": "http://www.sitemaps.org/schemas/sitemap/0.9",
+    "xmlns:xhtml": "http://www.w3.org/1999/xhtml",
+  }
+
+  @staticmethod
+  def _render_alternates (alternates:Iterable[Alternate], use_indent:bool=False) -> str:
     if use_indent:
-      ETree.indent(element)
-    with open(self._file, "wb") as file:
-      for part in ETree.tostringlist(element, encoding="utf-8", xml_declaration=True):
-        file.write(part)
+      indent = "\n" + "  " * 2
+    else:
+      indent = ""
+    return "".join("{:s}<xhtml:link rel=\"alternate\" hreflang=\"{:s}\" href=\"{:s}\" />".format(indent, escape(hreflang, {"\"": "&quot;"}), escape(href, {"\"": "&quot;"})) for hreflang, href in alternates)
+
+  @staticmethod
+  def _render (url:URL, use_indent:bool=False, alternates:str="") -> bytes:
+    loc, last_mod, priority, change_freq = url
+    children = [
+      render_text_element("loc", loc, use_indent, 2),
+      render_text_element("lastmod", last_mod.date().isoformat(), use_indent, 2),
+    ]
+    if priority != 0.5:
+      children.append(render_text_element("priority", "{:.3f}".format(priority), use_indent, 2))
+    if change_freq.value:
+      children.append(render_text_element("changefreq", change_freq.value, use_indent, 2))
+    if alternates:
+      children.append(alternates)
+    return render_element("url", children, use_indent, 1).encode("utf-8")
+
+  def save (self, use_indent:bool=False):
+    if self._alternates is None:
+      with SitemapWriter(self._file, self._TAG, self._ATTRIBUTES, use_indent) as writer:
+        for url in self._urls:
+          writer.write(self._render(url, use_indent))
+    else:
+      blocks = {}
+      with SitemapWriter(self._file, self._TAG, self._ALTERNATE_ATTRIBUTES, use_indent) as writer:
+        for url, alternates in zip(self._urls, self._alternates):
+          block = blocks.get(id(alternates))
+          if block is None:
+            block = blocks[id(alternates)] = self._render_alternates(alternates, use_indent)
+          writer.write(self._render(url, use_indent, block))
+    self._digest = writer.digest
 
-class Sitemap (ISitemap, ILoadable, ICloseable):
+class Sitemap (Store, ISitemap, ILoadable):
 
   """サイトマップを表現するクラスです。
 
@@ -107,38 +261,105 @@ class Sitemap (ISitemap, ILoadable, ICloseable):
   >>> sitemap.register("http://www.example.com/", datetime.datetime(2025, 1, 23))
   >>> sitemap.save_files()
   [<sitemap.sitemap.SitemapFile object at 0xXXXXXXXXXXXXXXXX>]
+
+  Parameters
+  ----------
+  file : Path|str
+    サイトマップの保存先となるファイルパスです。
+  max_count : int
+    一つのファイルに記録される URL の最大数です。
+    この数を越えた場合、サイトマップは複数のファイルに分割して保存されます。
+    未指定ならば `50000` が設定されます。
+  max_bytes : int
+    一つのファイルの最大バイト数です。
+    この大きさを越えた場合、サイトマップは複数のファイルに分割して保存されます。
+    未指定ならば `52428800` (50MiB) が設定されます。
+  metrics : IMetricsCollector|None
+    各処理の計測結果の報告先です。
+    指定された場合、`register_many`, `list_all`, `load`, `save_files` の各処理に要した時間、保存されたファイルの情報、およびストアの大きさが報告されます。
+    未指定ならば計測は行われません。
+  compact_files : bool
+    `save_files` メソッドが返す `SitemapFile` オブジェクトに、ページ情報を圧縮して保持させるかを設定します。
+    真であれば各ページ情報は `CompactURLs` により保持され、多数のファイルを保存する際のメモリの使用量が削減されます。
+    未指定ならば `False` が設定されます。
+  isolated_save : bool
+    `save_files` メソッドを、呼び出し時点の登録内容を複製したストアから行うかを設定します。
+    真であれば保存中も別のスレッドから登録を続けることができ、保存される内容は呼び出し時点のものに固定されます。
+    偽であれば保存が終わるまで、別のスレッドからの登録や取得は待機させられます。
+    ただし保存中は登録内容と同じ大きさのストアが一時的に作成されます。
+    また文書の作成は GIL を保持したまま行われるため、登録の処理量は向上しません。
+    未指定ならば `False` が設定されます。
+  lazy_load : bool
+    `load` メソッドで XML スキーマによる検証を <url> 要素ごとに逐次的に行うかを設定します。
+    真であれば検証済みのページ情報は一定件数ごとにまとめて登録され、読み込みに要するメモリの使用量はファイルの大きさに依存しなくなります。
+    ただし読み込みに要する時間は増加します。
+    未指定ならば `False` が設定されます。
+  track_changes : bool
+    登録内容の変更を記録し、`checkpoint` プロパティと `changes_since` メソッドを使用可能にするかを設定します。
+    真であれば変更の度に SQLite のトリガーにより記録が追加されるため、登録に要する時間とストアの大きさが増加します。
+    削除されたページの記録も残り続けるため、不要になった記録は `prune_changes` メソッドで削除してください。
+    未指定ならば `False` が設定されます。
   """
 
-  def _db_prepare (self) -> tuple[sqlite3.Connection, sqlite3.Cursor]:
-    connection = sqlite3.connect(":memory:")
-    cursor = connection.cursor()
-    cursor.execute("CREATE TABLE change_freq(id INTEGER PRIMARY KEY AUTOINCREMENT, name STRING)")    
+  def _db_prepare (self) -> sqlite3.Connection:
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    self._create_change_freq_table(connection)
+    connection.execute("CREATE TABLE url(id INTEGER PRIMARY KEY AUTOINCREMENT, loc TEXT, last_mod_seconds INTEGER, priority REAL, change_freq_id INT REFERENCES change_freq(id), generation INTEGER)")
+    connection.execute("CREATE UNIQUE INDEX url_loc ON url(loc)")
+    connection.execute("CREATE INDEX url_generation ON url(generation)")
+    connection.execute("CREATE TABLE url_bucket(first_loc TEXT PRIMARY KEY, count INTEGER)")
+    connection.execute("INSERT INTO url_bucket(first_loc, count) VALUES('', 0)")
+    connection.execute("CREATE TRIGGER url_bucket_inserted AFTER INSERT ON url BEGIN UPDATE url_bucket SET count = count + 1 WHERE first_loc == (SELECT MAX(first_loc) FROM url_bucket WHERE first_loc <= NEW.loc); END")
+    connection.execute("CREATE TRIGGER url_bucket_deleted AFTER DELETE ON url BEGIN UPDATE url_bucket SET count = count - 1 WHERE first_loc == (SELECT MAX(first_loc) FROM url_bucket WHERE first_loc <= OLD.loc); END")
+    connection.execute("CREATE TABLE alternate(id INTEGER PRIMARY KEY AUTOINCREMENT, cluster_id INTEGER, hreflang TEXT, href TEXT)")
+    connection.execute("CREATE UNIQUE INDEX alternate_cluster_id_hreflang ON alternate(cluster_id, hreflang)")
+    connection.execute("CREATE INDEX alternate_href ON alternate(href)")
+    if self._track_changes:
+      connection.execute("CREATE TABLE url_change(sequence INTEGER PRIMARY KEY AUTOINCREMENT, loc TEXT)")
+      connection.execute("CREATE UNIQUE INDEX url_change_loc ON url_change(loc)")
+      connection.execute("CREATE TRIGGER url_inserted AFTER INSERT ON url BEGIN DELETE FROM url_change WHERE loc == NEW.loc; INSERT INTO url_change(loc) VALUES(NEW.loc); END")
+      connection.execute("CREATE TRIGGER url_updated AFTER UPDATE ON url WHEN OLD.last_mod_seconds IS NOT NEW.last_mod_seconds OR OLD.priority IS NOT NEW.priority OR OLD.change_freq_id IS NOT NEW.change_freq_id BEGIN DELETE FROM url_change WHERE loc == NEW.loc; INSERT INTO url_change(loc) VALUES(NEW.loc); END")
+      connection.execute("CREATE TRIGGER url_deleted AFTER DELETE ON url BEGIN DELETE FROM url_change WHERE loc == OLD.loc; INSERT INTO url_change(loc) VALUES(OLD.loc); END")
+      connection.execute("CREATE TRIGGER alternate_inserted AFTER INSERT ON alternate WHEN EXISTS (SELECT 1 FROM url WHERE loc == NEW.href) BEGIN DELETE FROM url_change WHERE loc == NEW.href; INSERT INTO url_change(loc) VALUES(NEW.href); END")
+      connection.execute("CREATE TRIGGER alternate_deleted AFTER DELETE ON alternate WHEN EXISTS (SELECT 1 FROM url WHERE loc == OLD.href) BEGIN DELETE FROM url_change WHERE loc == OLD.href; INSERT INTO url_change(loc) VALUES(OLD.href); END")
+    return connection
+
+  @staticmethod
+  def _create_change_freq_table (connection:sqlite3.Connection):
+    connection.execute("CREATE TABLE change_freq(id INTEGER PRIMARY KEY AUTOINCREMENT, name STRING)")
     for change_freq in ChangeFreq:
-      cursor.execute("INSERT INTO change_freq(name) VALUES(?)", (change_freq.value,))
-    cursor.execute("CREATE TABLE url(id INTEGER PRIMARY KEY AUTOINCREMENT, loc TEXT, last_mod_seconds INTEGER, priority REAL, change_freq_id INT REFERENCES change_freq(id))")
-    return connection, cursor
+      connection.execute("INSERT INTO change_freq(name) VALUES(?)", (change_freq.value,))
 
-  def __init__ (self, file:Path|str):
+  def __init__ (self, file:Path|str, max_count:int=MAX_ENTRIES_PER_FILE, max_bytes:int=MAX_BYTES_PER_FILE, metrics:IMetricsCollector|None=None, compact_files:bool=False, isolated_save:bool=False, lazy_load:bool=False, track_changes:bool=False):
     self._file = Path(file)
-    self._connection, self._cursor = self._db_prepare()
-    self._closeable = Closeable(self._close_handler)
+    self._max_count = max_count
+    self._max_bytes = max_bytes
+    self._metrics = metrics
+    self._compact_files = compact_files
+    self._isolated_save = isolated_save
+    self._lazy_load = lazy_load
+    self._track_changes = track_changes
+    self._generation = 0
+    self._restore_count = 0
+    self._open_store()
 
-  def __enter__ (self):
-    return self
+  @property
+  def file (self) -> Path:
 
-  def __exit__ (self, exc_type, exc_value, traceback):
-    self._closeable.close()
+    """サイトマップの保存先となるファイルパスを返します。"""
 
-  @property
-  def closed (self) -> bool:
-    return self._closeable.closed
+    return self._file
+
+  def _restored (self):
+    self._restore_count += 1
+    self._split_buckets()
+    self._generation, = self._fetch_one("SELECT IFNULL(MAX(generation), 0) FROM url")
+
+  _REGISTER_SQL:ClassVar[str] = "INSERT INTO url(loc, last_mod_seconds, priority, change_freq_id, generation) VALUES(?, ?, ?, (SELECT change_freq.id FROM change_freq WHERE change_freq.name = ?), ?) ON CONFLICT(loc) DO UPDATE SET last_mod_seconds = excluded.last_mod_seconds, priority = excluded.priority, change_freq_id = excluded.change_freq_id, generation = excluded.generation"
 
-  def _close_handler (self):
-    self._cursor.close()
-    self._connection.close()
+  _SELECT_SQL:ClassVar[str] = "SELECT url.loc, url.last_mod_seconds, url.priority, change_freq.name FROM url INNER JOIN change_freq ON url.change_freq_id = change_freq.id"
 
-  def close (self):
-    self._closeable.close()
+  _SELECT_ALTERNATE_SQL:ClassVar[str] = "SELECT url.loc, url.last_mod_seconds, url.priority, change_freq.name, (SELECT alternate.cluster_id FROM alternate WHERE alternate.href == url.loc LIMIT 1) FROM url INNER JOIN change_freq ON url.change_freq_id = change_freq.id"
 
   def register (self, loc:str, last_mod:datetime.datetime, priority:float=DEFAULT_PRIORITY, change_freq:ChangeFreq=DEFAULT_CHANGE_FREQ):
 
@@ -163,11 +384,33 @@ class Sitemap (ISitemap, ILoadable, ICloseable):
     """
 
     self._closeable.must_be_open()
-    self._cursor.execute("SELECT id FROM url WHERE loc == ?", (loc,))
-    if self._cursor.fetchone():
-      self._cursor.execute("UPDATE url SET url.last_mod_seconds = ?, priority = ?, change_freq_id = (SELECT change_freq.id FROM change_freq WHERE change_freq.name = ?)", (last_mod.timestamp(), priority, change_freq.value))
-    else:
-      self._cursor.execute("INSERT INTO url(loc, last_mod_seconds, priority, change_freq_id) VALUES(?, ?, ?, (SELECT change_freq.id FROM change_freq WHERE change_freq.name = ?))", (loc, last_mod.timestamp(), priority, change_freq.value))
+    with self._lock:
+      self._connection.execute(self._REGISTER_SQL, (loc, last_mod.timestamp(), priority, change_freq.value, self._generation))
+      self._split_buckets()
+
+  def register_many (self, urls:Iterable[URL]):
+
+    """サイトマップに複数のページの URL をまとめて登録します。
+
+    Notes
+    -----
+    本メソッドは `register` メソッドを繰り返し呼び出した場合と同じ結果になりますが、単一の SQL 文でまとめて処理するためより高速です。
+    引数 `urls` は逐次的に消費されるため、ジェネレータを指定することもできます。
+
+    Arguments
+    ---------
+    urls : Iterable[URL]
+      登録するページ情報の集合です。
+    """
+
+    self._closeable.must_be_open()
+    if self._metrics is not None:
+      start = time.perf_counter()
+    with self._lock:
+      rows = self._connection.executemany(self._REGISTER_SQL, ((loc, last_mod.timestamp(), priority, change_freq.value, self._generation) for loc, last_mod, priority, change_freq in urls)).rowcount
+      self._split_buckets()
+    if self._metrics is not None:
+      report_phase(self._metrics, self._file, "register_many", start, rows)
 
   def unregister (self, loc:str):
 
@@ -184,14 +427,192 @@ class Sitemap (ISitemap, ILoadable, ICloseable):
     """
 
     self._closeable.must_be_open()
-    self._cursor.execute("DELETE FROM url WHERE loc == ?", (loc,))
+    with self._lock:
+      self._connection.execute("DELETE FROM url WHERE loc == ?", (loc,))
+      self._split_buckets()
 
   def clear (self):
 
     """サイトマップに登録された全てのページ情報を削除します。"""
 
     self._closeable.must_be_open()
-    self._cursor.execute("DELETE FROM url")
+    with self._lock:
+      self._connection.execute("DELETE FROM url")
+      self._connection.execute("DELETE FROM alternate")
+      self._split_buckets()
+
+  def _register_alternates (self, alternates:tuple[tuple[str, str], ...]):
+    if tuple(self._fetch_all("SELECT hreflang, href FROM alternate WHERE cluster_id == (SELECT cluster_id FROM alternate WHERE href == ? LIMIT 1) ORDER BY id ASC", (alternates[0][1],))) == alternates:
+      return
+    self._connection.executemany("DELETE FROM alternate WHERE cluster_id IN (SELECT cluster_id FROM alternate WHERE href == ?)", ((href,) for _, href in alternates))
+    cluster_id, = self._fetch_one("SELECT IFNULL(MAX(cluster_id), 0) +1 FROM alternate")
+    self._connection.executemany("INSERT INTO alternate(cluster_id, hreflang, href) VALUES(?, ?, ?)", ((cluster_id, hreflang, href) for hreflang, href in alternates))
+
+  def register_alternates (self, alternates:Iterable[Alternate]):
+
+    """互いに言語・地域の異なる版であるページの集合を登録します。
+
+    Examples
+    --------
+    >>> sitemap.register_alternates([
+    ...   Alternate("en", "http://www.example.com/en/"),
+    ...   Alternate("ja", "http://www.example.com/ja/"),
+    ...   Alternate("x-default", "http://www.example.com/en/"),
+    ... ])
+
+    Notes
+    -----
+    登録された集合は一度だけ記録され、その `href` に一致する URL のページは集合の番号を介してこれを参照します。
+    よって記録に要する容量は、集合の大きさとページの数の積ではなくページの数に比例します。
+    保存時には集合の全ての <xhtml:link rel="alternate"> が、集合ごとに一度だけ変換された上で各ページの <url> に書き込まれます。
+
+    一つのページは一つの集合にのみ属します。
+    既に登録された集合に含まれる `href` が指定された場合、その集合は削除され新たな集合に置き換えられます。
+    集合はページ情報とは独立して記録されるため、ページの登録の前後いずれに登録しても構いません。
+
+    Arguments
+    ---------
+    alternates : Iterable[Alternate]
+      登録する集合です。
+      各ページの `Alternate` に加えて、`x-default` など同一の `href` を異なる `hreflang` で指定することもできます。
+
+    Raises
+    ------
+    ValueError
+      同一の `hreflang` が複数指定された場合に送出されます。
+    """
+
+    self._closeable.must_be_open()
+    alternates = tuple((hreflang, href) for hreflang, href in alternates)
+    if len({hreflang for hreflang, _ in alternates}) != len(alternates):
+      raise ValueError("hreflang must be unique in alternates.")
+    if alternates:
+      with self._lock:
+        self._register_alternates(alternates)
+
+  def unregister_alternates (self, loc:str):
+
+    """ページが属する、言語・地域の異なる版の集合を削除します。
+
+    Notes
+    -----
+    集合に属する全てのページから <xhtml:link rel="alternate"> が取り除かれます。
+    ページが集合に属していない場合であっても、このメソッドは必ず成功します。
+
+    Arguments
+    ---------
+    loc : str
+      削除する集合に属するページの URL です。
+    """
+
+    self._closeable.must_be_open()
+    with self._lock:
+      self._connection.execute("DELETE FROM alternate WHERE cluster_id IN (SELECT cluster_id FROM alternate WHERE href == ?)", (loc,))
+
+  def get_alternates (self, loc:str) -> list[Alternate]:
+
+    """ページが属する、言語・地域の異なる版の集合を取得します。
+
+    Arguments
+    ---------
+    loc : str
+      取得する集合に属するページの URL です。
+
+    Returns
+    -------
+    list[Alternate]
+      登録された順に並べた集合の要素です。
+      ページが集合に属していなければ空のリストが返されます。
+    """
+
+    self._closeable.must_be_open()
+    return [Alternate(hreflang, href) for hreflang, href in self._fetch_all("SELECT hreflang, href FROM alternate WHERE cluster_id == (SELECT cluster_id FROM alternate WHERE href == ? LIMIT 1) ORDER BY id ASC", (loc,))]
+
+  @property
+  def generation (self) -> int:
+
+    """現在の世代の番号を返します。"""
+
+    return self._generation
+
+  def begin_generation (self) -> int:
+
+    """新たな世代を開始します。
+
+    Examples
+    --------
+    >>> sitemap.begin_generation()
+    >>> sitemap.register_many(scanner.scan())
+    >>> sitemap.touch_many(unchanged_locs)
+    >>> sitemap.sweep()
+
+    Notes
+    -----
+    以降に `register`, `register_many`, `touch`, `touch_many` メソッドで登録されたページ情報は、新たな世代で確認されたものとして記録されます。
+    その後 `sweep` メソッドを呼び出すことで、新たな世代で確認されなかったページ情報のみを削除することができます。
+    `clear` メソッドで全ての情報を破棄して再登録する場合と異なり、登録済みの情報はそのまま維持されます。
+
+    Returns
+    -------
+    int
+      開始された世代の番号です。
+    """
+
+    self._closeable.must_be_open()
+    self._generation += 1
+    return self._generation
+
+  def touch (self, loc:str):
+
+    """登録済みのページ情報を、内容を変更せずに現在の世代で確認されたものとして記録します。
+
+    Notes
+    -----
+    指定されたページが存在しない場合であっても、このメソッドは必ず成功します。
+
+    Arguments
+    ---------
+    loc : str
+      記録するページの URL です。
+    """
+
+    self._closeable.must_be_open()
+    with self._lock:
+      self._connection.execute("UPDATE url SET generation = ? WHERE loc == ?", (self._generation, loc))
+
+  def touch_many (self, locs:Iterable[str]):
+
+    """複数の登録済みのページ情報を、内容を変更せずに現在の世代で確認されたものとして記録します。
+
+    Arguments
+    ---------
+    locs : Iterable[str]
+      記録するページの URL の集合です。
+    """
+
+    self._closeable.must_be_open()
+    with self._lock:
+      self._connection.executemany("UPDATE url SET generation = ? WHERE loc == ?", ((self._generation, loc) for loc in locs))
+
+  def sweep (self) -> int:
+
+    """現在の世代で確認されなかった全てのページ情報を削除します。
+
+    Notes
+    -----
+    削除は世代の索引を用いた単一の SQL 文で行われます。
+
+    Returns
+    -------
+    int
+      削除されたページ情報の数です。
+    """
+
+    self._closeable.must_be_open()
+    with self._lock:
+      count = self._connection.execute("DELETE FROM url WHERE generation < ?", (self._generation,)).rowcount
+      self._split_buckets()
+      return count
 
   def get (self, loc:str) -> URL|None:
 
@@ -210,8 +631,7 @@ class Sitemap (ISitemap, ILoadable, ICloseable):
     """
 
     self._closeable.must_be_open()
-    self._cursor.execute("SELECT url.loc, url.last_mod_seconds, url.priority, change_freq.name FROM url INNER JOIN change_freq ON change_freq.id = url.change_freq_id WHERE url.loc == ?", (loc,))
-    found_column = self._cursor.fetchone()
+    found_column = self._fetch_one("SELECT url.loc, url.last_mod_seconds, url.priority, change_freq.name FROM url INNER JOIN change_freq ON change_freq.id = url.change_freq_id WHERE url.loc == ?", (loc,))
     if found_column:
       loc, last_mod_seconds, priority, change_freq_name = found_column
       last_mod = datetime.datetime.fromtimestamp(last_mod_seconds)
@@ -232,57 +652,587 @@ class Sitemap (ISitemap, ILoadable, ICloseable):
     """
 
     self._closeable.must_be_open()
-    self._cursor.execute("SELECT url.loc, url.last_mod_seconds, url.priority, change_freq.name FROM url INNER JOIN change_freq ON url.change_freq_id = change_freq.id ORDER BY url.loc ASC")
+    if self._metrics is not None:
+      start = time.perf_counter()
     result = []
-    for loc, last_mod_seconds, priority, change_freq_name in self._cursor.fetchall():
+    for loc, last_mod_seconds, priority, change_freq_name in self._fetch_all(self._SELECT_SQL + " ORDER BY url.loc ASC"):
       last_mod = datetime.datetime.fromtimestamp(last_mod_seconds)
       change_freq = ChangeFreq(change_freq_name)
       result.append(URL(loc, last_mod, priority, change_freq))
+    if self._metrics is not None:
+      report_phase(self._metrics, self._file, "list_all", start, len(result))
     return result
 
+  def _has_alternates (self) -> bool:
+    has_alternates, = self._fetch_one("SELECT EXISTS (SELECT 1 FROM alternate)")
+    return bool(has_alternates)
+
+  def _iter_alternate_entries (self, rows:Iterable[tuple[str, float, float, str, int|None]], use_indent:bool=False) -> Iterator[tuple[URL, tuple[Alternate, ...], str]]:
+    clusters = {None: ((), "")}
+    for loc, last_mod_seconds, priority, change_freq_name, cluster_id in rows:
+      cluster = clusters.get(cluster_id)
+      if cluster is None:
+        alternates = tuple(Alternate(hreflang, href) for hreflang, href in self._fetch_all("SELECT hreflang, href FROM alternate WHERE cluster_id == ? ORDER BY id ASC", (cluster_id,)))
+        cluster = clusters[cluster_id] = (alternates, SitemapFile._render_alternates(alternates, use_indent))
+      yield URL(loc, datetime.datetime.fromtimestamp(last_mod_seconds), priority, ChangeFreq(change_freq_name)), *cluster
+
   def save_files (self, use_indent:bool=False) -> list[ISitemapFile]:
-    self._cursor.execute("SELECT url.loc, url.last_mod_seconds, url.priority, change_freq.name FROM url INNER JOIN change_freq ON url.change_freq_id = change_freq.id ORDER BY url.loc ASC")
-    urls = ((loc, datetime.datetime.fromtimestamp(last_mod_seconds), priority, ChangeFreq(change_freq_name)) for loc, last_mod_seconds, priority, change_freq_name in self._cursor.fetchall())
-    result = []
-    for index, batched_urls in enumerate(itertools.batched(urls, 50000)):
-      if 0 < index:
-        save_file = self._file.with_stem("{:s}{:d}".format(self._file.stem, index +1))
+    self._closeable.must_be_open()
+    with self._save_source() as source:
+      if source._has_alternates():
+        entries = source._iter_alternate_entries(source._iter_query(self._SELECT_ALTERNATE_SQL + " ORDER BY url.loc ASC"), use_indent)
+        if self._compact_files:
+          new_file = lambda file, chunk, digest: SitemapFile(file, CompactURLs(url for url, _, _ in chunk), digest, [alternates for _, alternates, _ in chunk])
+        else:
+          new_file = lambda file, chunk, digest: SitemapFile(file, [url for url, _, _ in chunk], digest, [alternates for _, alternates, _ in chunk])
+        return write_files(self._file, entries, lambda entry, use_indent: SitemapFile._render(entry[0], use_indent, entry[2]), SitemapFile._TAG, SitemapFile._ALTERNATE_ATTRIBUTES, new_file, use_indent=use_indent, max_count=self._max_count, max_bytes=self._max_bytes, metrics=self._metrics)
+      urls = (URL(loc, datetime.datetime.fromtimestamp(last_mod_seconds), priority, ChangeFreq(change_freq_name)) for loc, last_mod_seconds, priority, change_freq_name in source._iter_query(self._SELECT_SQL + " ORDER BY url.loc ASC"))
+      if self._compact_files:
+        new_file = lambda file, chunk, digest: SitemapFile(file, CompactURLs(chunk), digest)
       else:
-        save_file = self._file
-      sitemap_file = SitemapFile(save_file, batched_urls)
-      sitemap_file.save(use_indent=use_indent)
-      result.append(sitemap_file)
-    return result
+        new_file = SitemapFile
+      return write_files(self._file, urls, SitemapFile._render, SitemapFile._TAG, SitemapFile._ATTRIBUTES, new_file, use_indent=use_indent, max_count=self._max_count, max_bytes=self._max_bytes, metrics=self._metrics)
 
-  _XML_SCHEMA_TO_PARSE:ClassVar[XMLSchema] = XMLSchema(importlib.resources.files("sitemap").joinpath("static/xsd/sitemap.xsd"), build=False)
-  _XML_SCHEMA_TO_PARSE.build()
+  _BUCKET_SIZE:ClassVar[int] = 4096
 
-  def load (self, stream:TextIOBase):
-    self._closeable.must_be_open()
-    root = self._XML_SCHEMA_TO_PARSE.to_dict(stream)
-    for url in root["url"]:
-      loc_source = url["loc"]
-      if loc_source:
-        loc = loc_source
+  def _split_buckets (self):
+    self._connection.execute("DELETE FROM url_bucket WHERE count == 0 AND first_loc != ''")
+    for first_loc, next_first_loc in self._fetch_all("SELECT first_loc, (SELECT MIN(next.first_loc) FROM url_bucket AS next WHERE next.first_loc > url_bucket.first_loc) FROM url_bucket WHERE count > ?", (self._BUCKET_SIZE * 2,)):
+      if next_first_loc is None:
+        locs = self._fetch_all("SELECT loc FROM url WHERE loc >= ? ORDER BY loc ASC", (first_loc,))
       else:
-        raise ValueError()
-      last_mod_source = url["lastmod"]
-      if last_mod_source:
-        last_mod = datetime.datetime.fromisoformat(last_mod_source)
+        locs = self._fetch_all("SELECT loc FROM url WHERE loc >= ? AND loc < ? ORDER BY loc ASC", (first_loc, next_first_loc))
+      buckets = []
+      for index, (loc,) in enumerate(locs):
+        if index % self._BUCKET_SIZE == 0:
+          buckets.append([loc, 0])
+        buckets[-1][1] += 1
+      buckets[0][0] = first_loc
+      self._connection.execute("DELETE FROM url_bucket WHERE first_loc == ?", (first_loc,))
+      self._connection.executemany("INSERT INTO url_bucket(first_loc, count) VALUES(?, ?)", buckets)
+
+  def _chunk_start (self, index:int) -> str|None:
+    rank = index * self._max_count
+    found_column = self._fetch_one("SELECT first_loc, ? - (total - count) FROM (SELECT first_loc, count, SUM(count) OVER (ORDER BY first_loc ASC) AS total FROM url_bucket) WHERE total > ? ORDER BY first_loc ASC LIMIT 1", (rank, rank))
+    if found_column is None:
+      return None
+    first_loc, offset = found_column
+    loc, = self._fetch_one("SELECT loc FROM url WHERE loc >= ? ORDER BY loc ASC LIMIT 1 OFFSET ?", (first_loc, offset))
+    return loc
+
+  def chunk_count (self) -> int:
+
+    """`render_chunk` メソッドで取得できる文書の数を返します。
+
+    Returns
+    -------
+    int
+      登録された URL を `max_count` 件ずつに区切った際の文書の数です。
+      何も登録されていなければ `0` が返されます。
+    """
+
+    self._closeable.must_be_open()
+    count, = self._fetch_one("SELECT SUM(count) FROM url_bucket")
+    return (count + self._max_count -1) // self._max_count
+
+  def chunk_last_mods (self) -> list[datetime.datetime]:
+
+    """`render_chunk` メソッドで取得できる各文書の、最も新しい更新日時のリストを返します。
+
+    Notes
+    -----
+    本メソッドは文書を作成することなく、単一の SQL 文で全ての文書の更新日時を求めます。
+
+    Returns
+    -------
+    list[datetime.datetime]
+      各文書の更新日時を文書の順に並べたリストです。
+    """
+
+    self._closeable.must_be_open()
+    return [datetime.datetime.fromtimestamp(last_mod_seconds) for last_mod_seconds, in self._fetch_all("SELECT MAX(last_mod_seconds) FROM (SELECT last_mod_seconds, (ROW_NUMBER() OVER (ORDER BY loc ASC) -1) / ? AS chunk FROM url) GROUP BY chunk ORDER BY chunk ASC", (self._max_count,))]
+
+  def render_chunk (self, index:int, use_indent:bool=False) -> RenderedChunk:
+
+    """登録された URL を `max_count` 件ずつに区切った際の、任意の文書をメモリ上に作成します。
+
+    Notes
+    -----
+    作成される文書は、`save_files` メソッドが件数の制限のみにより分割した場合に保存する `index` 番目のファイルと同一の内容になります。
+    ただしバイト数の制限は考慮されません。
+
+    各文書の先頭の URL は、登録内容の追加・削除に応じて逐次更新される区間ごとの件数の索引から求められます。
+    よって先行する URL を走査することなく、単一の範囲検索で任意の文書を作成することができます。
+    索引は登録・削除の際に更新されるため、本メソッドが登録内容や `version` の値を変更することはありません。
+
+    Arguments
+    ---------
+    index : int
+      0 から始まる文書の番号です。
+    use_indent : bool
+      インデントを用いるかを設定します。
+      未指定ならば `False` が設定されます。
+
+    Returns
+    -------
+    RenderedChunk
+      作成された文書です。
+
+    Raises
+    ------
+    IndexError
+      指定された番号の文書が存在しない場合に送出されます。
+    """
+
+    self._closeable.must_be_open()
+    entries = self._chunk_entries(index, use_indent)
+    if self._has_alternates():
+      attributes = SitemapFile._ALTERNATE_ATTRIBUTES
+    else:
+      attributes = SitemapFile._ATTRIBUTES
+    content = render_document((SitemapFile._render(url, use_indent, block) for url, _, block in entries), SitemapFile._TAG, attributes, use_indent)
+    return RenderedChunk(content, hashlib.sha256(content).hexdigest(), max(url.last_mod for url, _, _ in entries), len(entries))
+
+  def _chunk_entries (self, index:int, use_indent:bool=False) -> list[tuple[URL, tuple[Alternate, ...], str]]:
+    if index < 0:
+      raise IndexError(index)
+    with self._lock:
+      start_loc = self._chunk_start(index)
+      if start_loc is None:
+        raise IndexError(index)
+      return list(self._iter_alternate_entries(self._fetch_all(self._SELECT_ALTERNATE_SQL + " WHERE url.loc >= ? ORDER BY url.loc ASC LIMIT ?", (start_loc, self._max_count)), use_indent))
+
+  def save_chunk (self, index:int, use_indent:bool=False) -> ISitemapFile:
+
+    """登録された URL を `max_count` 件ずつに区切った際の、任意の文書のみをファイルに保存します。
+
+    Notes
+    -----
+    保存先は `save_files` メソッドが件数の制限のみにより分割した場合の `index` 番目のファイルと同じになります。
+    内容に変化のない場合、ファイルは再度書き込まれません。
+    一部の URL のみが変更された際に、該当する文書のみを再作成する用途を想定しています。
+
+    Arguments
+    ---------
+    index : int
+      0 から始まる文書の番号です。
+    use_indent : bool
+      インデントを用いるかを設定します。
+      未指定ならば `False` が設定されます。
+
+    Returns
+    -------
+    ISitemapFile
+      保存されたファイルです。
+
+    Raises
+    ------
+    IndexError
+      指定された番号の文書が存在しない場合に送出されます。
+    """
+
+    self._closeable.must_be_open()
+    entries = self._chunk_entries(index, use_indent)
+    if self._has_alternates():
+      alternates = [alternates for _, alternates, _ in entries]
+    else:
+      alternates = None
+    sitemap_file = SitemapFile(numbered_file(self._file, index), [url for url, _, _ in entries], alternates=alternates)
+    sitemap_file.save(use_indent)
+    return sitemap_file
+
+  @property
+  def checkpoint (self) -> int:
+
+    """最後に記録された変更の番号を返します。
+
+    Notes
+    -----
+    本プロパティの値を保持しておき、後に `changes_since` メソッドへ渡すことで、それ以降に変更されたページ情報のみを取得することができます。
+    まだ何も変更されていなければ `0` が返されます。
+    `prune_changes` メソッドで記録を削除しても、本プロパティの値は減少しません。
+
+    Raises
+    ------
+    ValueError
+      `track_changes` を指定せずに作成された場合に送出されます。
+    """
+
+    self._closeable.must_be_open()
+    self._must_track_changes()
+    checkpoint, = self._fetch_one("SELECT IFNULL((SELECT seq FROM sqlite_sequence WHERE name == 'url_change'), 0)")
+    return checkpoint
+
+  def _must_track_changes (self):
+    if not self._track_changes:
+      raise ValueError("track_changes is not enabled.")
+
+  @property
+  def version (self) -> int:
+
+    """登録内容が変更される度に増加する値を返します。
+
+    Notes
+    -----
+    本プロパティは `track_changes` の指定に関わらず使用できます。
+    値は変更の内容を表すものではなく、同じ値であれば登録内容が変更されていないことのみを示します。
+    作成された文書をキャッシュする際の識別子として用いることを想定しています。
+    """
+
+    self._closeable.must_be_open()
+    with self._lock:
+      return self._connection.total_changes + self._restore_count
+
+  def changes_since (self, checkpoint:int=0) -> Iterator[FeedEntry[URL]]:
+
+    """任意の時点以降に変更されたページ情報を、変更された順に逐次返します。
+
+    Examples
+    --------
+    >>> checkpoint = sitemap.checkpoint
+    >>> sitemap.register_many(scanner.scan())
+    >>> for entry in sitemap.changes_since(checkpoint):
+    ...   notify(entry.loc)
+    ...   checkpoint = entry.sequence
+
+    Notes
+    -----
+    変更は `register`, `register_many`, `unregister`, `clear`, `sweep`, `load` などにより登録内容が実際に変化した際に記録されます。
+    内容の変わらない再登録や `touch` メソッドによる記録は変更とは見なされません。
+    同じページが複数回変更された場合は最後の変更のみが返されます。
+
+    変更の記録は番号の索引を用いて走査されるため、処理量は変更されたページ情報の数にのみ比例します。
+    走査中にサイトマップの内容を変更した場合の結果は未定義です。
+
+    Arguments
+    ---------
+    checkpoint : int
+      起点となる変更の番号です。
+      この番号より後に記録された変更のみが返されます。
+      未指定ならば `0` が設定され、記録された全ての変更が返されます。
+
+    Returns
+    -------
+    Iterator[FeedEntry[URL]]
+      変更の番号の昇順に変更を返すイテレータです。
+      削除されたページの `url` は `None` になります。
+
+    Raises
+    ------
+    ValueError
+      `track_changes` を指定せずに作成された場合に送出されます。
+    """
+
+    self._closeable.must_be_open()
+    self._must_track_changes()
+    return self._iter_changes(checkpoint)
+
+  def prune_changes (self, checkpoint:int) -> int:
+
+    """任意の時点以前に記録された変更を削除します。
+
+    Notes
+    -----
+    全ての通知先が `checkpoint` までの変更を受け取った後に呼び出すことで、削除されたページの記録が蓄積し続けることを防ぎます。
+    削除された変更は、以降の `changes_since` メソッドでは返されません。
+
+    Arguments
+    ---------
+    checkpoint : int
+      削除する変更の番号の上限です。
+      この番号以前に記録された変更が削除されます。
+
+    Returns
+    -------
+    int
+      削除された変更の数です。
+
+    Raises
+    ------
+    ValueError
+      `track_changes` を指定せずに作成された場合に送出されます。
+    """
+
+    self._closeable.must_be_open()
+    self._must_track_changes()
+    with self._lock:
+      return self._connection.execute("DELETE FROM url_change WHERE sequence <= ?", (checkpoint,)).rowcount
+
+  def _iter_changes (self, checkpoint:int) -> Iterator[FeedEntry[URL]]:
+    for sequence, loc, last_mod_seconds, priority, change_freq_name in self._iter_query("SELECT url_change.sequence, url_change.loc, url.last_mod_seconds, url.priority, change_freq.name FROM url_change LEFT JOIN url ON url.loc = url_change.loc LEFT JOIN change_freq ON change_freq.id = url.change_freq_id WHERE url_change.sequence > ? ORDER BY url_change.sequence ASC", (checkpoint,)):
+      if last_mod_seconds is None:
+        yield FeedEntry(sequence, loc, None)
       else:
+        yield FeedEntry(sequence, loc, URL(loc, datetime.datetime.fromtimestamp(last_mod_seconds), priority, ChangeFreq(change_freq_name)))
+
+  def _iter_sorted (self) -> Iterator[URL]:
+    for loc, last_mod_seconds, priority, change_freq_name in self._iter_query(self._SELECT_SQL + " ORDER BY url.loc ASC"):
+      yield URL(loc, datetime.datetime.fromtimestamp(last_mod_seconds), priority, ChangeFreq(change_freq_name))
+
+  @staticmethod
+  def _same_url (old:URL, new:URL) -> bool:
+    return old.last_mod.date() == new.last_mod.date() and "{:.3f}".format(old.priority) == "{:.3f}".format(new.priority) and old.change_freq == new.change_freq
+
+  @staticmethod
+  def _iter_source (source:"Sitemap|Iterable[Path|str]") -> Iterator[URL]:
+    if isinstance(source, Sitemap):
+      source._closeable.must_be_open()
+      return source._iter_sorted()
+    return (url for file in source for url in iterparse_urls(file))
+
+  def diff (self, other:"Sitemap|Iterable[Path|str]") -> Iterator[Change[URL]]:
+
+    """自身を比較元として、他のサイトマップとの差分を URL 順に逐次返します。
+
+    Examples
+    --------
+    >>> for change in yesterday_sitemap.diff(today_sitemap):
+    ...   print(change.change_type, change.loc)
+
+    Notes
+    -----
+    差分は双方を URL 順に一度だけ走査するマージ結合により求められるため、いずれの内容も全てがメモリ上に展開されることはありません。
+    更新日時はファイルに記録される精度と同じく日付単位で、優先度は小数点以下 3 桁に丸めた値で比較されます。
+    保存済みのファイルを比較元とする場合は `diff_sources` メソッドを用いてください。
+
+    `other` にファイルのリストを指定した場合、それらは `iterparse_urls` 関数により逐次的に解析されます。
+    このとき各ファイルは `save_files` メソッドの戻り値と同じ順序で指定される必要があり、
+    全体が URL 順に整列されていなければ走査中に `ValueError` が送出されます。
+
+    Arguments
+    ---------
+    other : Sitemap|Iterable[Path|str]
+      比較先となる `Sitemap` オブジェクト、または保存済みのサイトマップファイルのパスの集合です。
+
+    Returns
+    -------
+    Iterator[Change[URL]]
+      URL 順に差分を返すイテレータです。
+      比較先にのみ存在する URL は `ChangeType.ADDED`、比較元にのみ存在する URL は `ChangeType.REMOVED`、
+      双方に存在し内容の異なる URL は `ChangeType.MODIFIED` として返されます。
+    """
+
+    self._closeable.must_be_open()
+    return self.diff_sources(self, other)
+
+  @classmethod
+  def diff_sources (cls, old:"Sitemap|Iterable[Path|str]", new:"Sitemap|Iterable[Path|str]") -> Iterator[Change[URL]]:
+
+    """二つのサイトマップの差分を URL 順に逐次返します。
+
+    Examples
+    --------
+    >>> for change in Sitemap.diff_sources(["./yesterday/sitemap.xml", "./yesterday/sitemap2.xml"], today_sitemap):
+    ...   print(change.change_type, change.loc)
+
+    Notes
+    -----
+    `diff` メソッドとは異なり、比較元と比較先のいずれにも保存済みのサイトマップファイルを指定することができます。
+    比較の方法とファイルに求められる条件は `diff` メソッドと同じです。
+
+    Arguments
+    ---------
+    old : Sitemap|Iterable[Path|str]
+      比較元となる `Sitemap` オブジェクト、または保存済みのサイトマップファイルのパスの集合です。
+    new : Sitemap|Iterable[Path|str]
+      比較先となる `Sitemap` オブジェクト、または保存済みのサイトマップファイルのパスの集合です。
+
+    Returns
+    -------
+    Iterator[Change[URL]]
+      URL 順に差分を返すイテレータです。
+    """
+
+    return merge_diff(cls._iter_source(old), cls._iter_source(new), key=lambda url: url.loc, equals=cls._same_url)
+
+  _XHTML_LINK_SCHEMA:ClassVar[str] = """<?xml version="1.0" encoding="UTF-8"?>
+<xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema" targetNamespace="http://www.w3.org/1999/xhtml" elementFormDefault="qualified">
+  <xsd:element name="link">
+    <xsd:complexType>
+      <xsd:attribute name="rel" type="xsd:string" use="required"/>
+      <xsd:attribute name="hreflang" type="xsd:string"/>
+      <xsd:attribute name="href" type="xsd:anyURI" use="required"/>
+    </xsd:complexType>
+  </xsd:element>
+</xsd:schema>"""
+
+  _XML_SCHEMA_TO_PARSE:ClassVar[XMLSchema] = XMLSchema(importlib.resources.files("sitemap").joinpath("static/xsd/sitemap.xsd"), build=False)
+  _XML_SCHEMA_TO_PARSE.add_schema(_XHTML_LINK_SCHEMA)
+  _XML_SCHEMA_TO_PARSE.build()
+
+  _LOAD_BATCH_SIZE:ClassVar[int] = 10000
+
+  @classmethod
+  def _iter_rows (cls, stream:TextIOBase|BinaryIO, lazy:bool=False) -> Iterator[tuple[str, float, float, str, tuple[tuple[str, str], ...]]]:
+    for url in decode_children(cls._XML_SCHEMA_TO_PARSE, stream, "url", lazy):
+      loc, last_mod_seconds, priority, change_freq_name = cls._page_row(url)
+      alternates = []
+      for link in url.get("xhtml:link", []):
+        if link["@rel"] == "alternate":
+          hreflang_source = link.get("@hreflang")
+          if hreflang_source:
+            alternates.append((hreflang_source, link["@href"]))
+          else:
+            raise ValueError()
+      if len({hreflang for hreflang, _ in alternates}) != len(alternates):
         raise ValueError()
-      priority_source = url.get("priority")
-      if priority_source:
-        priority = float(priority_source)
-      else:
-        priority = DEFAULT_PRIORITY
-      change_freq_source = url.get("changefreq")
-      if change_freq_source:
-        change_freq = ChangeFreq(change_freq_source)
-      else:
-        change_freq = DEFAULT_CHANGE_FREQ
-      self.register(loc, last_mod, priority, change_freq)
+      yield loc, last_mod_seconds, priority, change_freq_name, tuple(alternates)
 
-  def loads (self, source:str):
-    with StringIO(source) as stream:
+  @staticmethod
+  def _page_row (url:dict) -> tuple[str, float, float, str]:
+    loc_source = url["loc"]
+    if loc_source:
+      loc = loc_source
+    else:
+      raise ValueError()
+    last_mod_source = url.get("lastmod")
+    if last_mod_source:
+      last_mod = datetime.datetime.fromisoformat(last_mod_source)
+    else:
+      raise ValueError()
+    priority_source = url.get("priority")
+    if priority_source:
+      priority = float(priority_source)
+    else:
+      priority = DEFAULT_PRIORITY
+    change_freq_source = url.get("changefreq")
+    if change_freq_source:
+      change_freq = ChangeFreq(change_freq_source)
+    else:
+      change_freq = DEFAULT_CHANGE_FREQ
+    return loc, last_mod.timestamp(), priority, change_freq.value
+
+  @classmethod
+  def _parse_file (cls, file:Path, lazy:bool=False) -> list[tuple[str, float, float, str, tuple[tuple[str, str], ...]]]:
+    with open_source(file) as stream:
+      return list(cls._iter_rows(stream, lazy))
+
+  @classmethod
+  def _parse_range (cls, file:Path, header:bytes, footer:bytes, span:tuple[int, int], lazy:bool=False) -> list[tuple[str, float, float, str, tuple[tuple[str, str], ...]]]:
+    with read_range(file, header, footer, span) as stream:
+      return list(cls._iter_rows(stream, lazy))
+
+  def _register_rows (self, rows:list[tuple[str, float, float, str, tuple[tuple[str, str], ...]]]):
+    with self._lock:
+      self._connection.executemany(self._REGISTER_SQL, ((loc, last_mod_seconds, priority, change_freq_name, self._generation) for loc, last_mod_seconds, priority, change_freq_name, _ in rows))
+      for alternates in dict.fromkeys(alternates for *_, alternates in rows if alternates):
+        self._register_alternates(alternates)
+      self._split_buckets()
+
+  def load (self, stream:TextIOBase|BinaryIO|Path|str):
+    self._closeable.must_be_open()
+    if self._metrics is not None:
+      start = time.perf_counter()
+    count = 0
+    with open_source(stream) as opened_stream:
+      for rows in batched(self._iter_rows(opened_stream, self._lazy_load), self._LOAD_BATCH_SIZE):
+        self._register_rows(rows)
+        count += len(rows)
+    if self._metrics is not None:
+      report_phase(self._metrics, self._file, "load", start, count)
+
+  def load_files (self, files:Iterable[Path|str], workers:int|None=None):
+
+    """複数のサイトマップのファイルを並行して解析し、その内容をまとめて登録します。
+
+    Notes
+    -----
+    各ファイルは `load` メソッドと同様に XML スキーマによる検証を伴って解析されます。
+    解析は `workers` 個のプロセスで並行して行われ、その結果はファイルごとに単一の SQL 文でまとめて登録されます。
+    複数のファイルに同一の URL が含まれる場合、`files` の順番で後のファイルの内容が優先されます。
+
+    Arguments
+    ---------
+    files : Iterable[Path|str]
+      読み込むサイトマップのファイルパスの集合です。
+    workers : int|None
+      解析を行うプロセスの数です。
+      `1` ならば解析は現在のプロセスで逐次的に行われます。
+      未指定ならば `concurrent.futures.ProcessPoolExecutor` の既定値が用いられます。
+    """
+
+    self._closeable.must_be_open()
+    if self._metrics is not None:
+      start = time.perf_counter()
+    count = 0
+    for rows in parse_files(functools.partial(self._parse_file, lazy=self._lazy_load), files, workers):
+      self._register_rows(rows)
+      count += len(rows)
+    if self._metrics is not None:
+      report_phase(self._metrics, self._file, "load_files", start, count)
+
+  def load_parallel (self, file:Path|str, workers:int|None=None):
+
+    """一つのサイトマップのファイルを複数の範囲に分割し、並行して解析した内容を登録します。
+
+    Notes
+    -----
+    ファイルは `mmap` によりメモリに割り当てられ、<url> 要素の境界で `workers` の 4 倍の数の範囲に分割されます。
+    各範囲は XML 宣言とルート要素で囲まれた単独の文書として、`load` メソッドと同様に XML スキーマによる検証を伴って別々のプロセスで解析されます。
+    解析の結果はファイル内の順番通りに登録されるため、`load` メソッドで読み込んだ場合と同じ結果になります。
+
+    gzip で圧縮されたファイルや、<url> 要素の境界を特定できないファイルは分割されず、`load` メソッドで読み込まれます。
+
+    Arguments
+    ---------
+    file : Path|str
+      読み込むサイトマップのファイルパスです。
+    workers : int|None
+      解析を行うプロセスの数です。
+      `1` ならば解析は現在のプロセスで逐次的に行われます。
+      未指定ならば CPU の数が用いられます。
+    """
+
+    self._closeable.must_be_open()
+    with open(file, "rb") as stream:
+      is_gzip = stream.read(len(GZIP_MAGIC)) == GZIP_MAGIC
+    if is_gzip:
+      self.load(file)
+      return
+    header, footer, spans = split_ranges(file, "urlset", "url", (workers or os.cpu_count() or 1) * 4)
+    if not spans:
+      self.load(file)
+      return
+    if self._metrics is not None:
+      start = time.perf_counter()
+    count = 0
+    for rows in map_in_processes(functools.partial(self._parse_range, Path(file), header, footer, lazy=self._lazy_load), spans, workers):
+      self._register_rows(rows)
+      count += len(rows)
+    if self._metrics is not None:
+      report_phase(self._metrics, self._file, "load_parallel", start, count)
+
+  def load_from_index (self, sitemap_index:SitemapIndex, host:Host, workers:int|None=None):
+
+    """サイトマップインデックスに登録された各サイトマップを、ローカルのファイルから読み込みます。
+
+    Notes
+    -----
+    各サイトマップの URL は `host.url_to_path` によりローカルのファイルパスに変換され、`load_files` メソッドで読み込まれます。
+    ファイルの種類は `SitemapIndex.resolve_files` メソッドによりルート要素から判定されます。
+    入れ子になったサイトマップインデックスは再帰的に展開され、他の種類のサイトマップは読み込まれずに無視されます。
+
+    Arguments
+    ---------
+    sitemap_index : SitemapIndex
+      読み込むサイトマップが登録された `SitemapIndex` オブジェクトです。
+    host : Host
+      URL をファイルパスに変換するための `Host` オブジェクトです。
+    workers : int|None
+      解析を行うプロセスの数です。
+      未指定ならば `concurrent.futures.ProcessPoolExecutor` の既定値が用いられます。
+    """
+
+    self.load_files(sitemap_index.resolve_files(host, self._accepts_namespaces), workers)
+
+  @staticmethod
+  def _accepts_namespaces (namespaces:frozenset[str]) -> bool:
+    return namespaces <= frozenset(SitemapFile._ALTERNATE_ATTRIBUTES.values()) | {XSI_NAMESPACE}
+
+  def loads (self, source:str|bytes):
+    if isinstance(source, bytes):
+      stream = BytesIO(source)
+    else:
+      stream = StringIO(source)
+    with stream:
       self.load(stream)
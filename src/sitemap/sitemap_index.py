@@ -1,15 +1,18 @@
 
+import time
 import sqlite3
 import datetime
 import importlib.resources
-from io import TextIOBase, StringIO
-from xml.etree import ElementTree as ETree
-from enum import Enum
-from typing import NamedTuple, ClassVar
+from io import TextIOBase, StringIO, BytesIO
+from typing import NamedTuple, ClassVar, BinaryIO, Callable, Iterable, Iterator
 from pathlib import Path
-from closeable import ICloseable, Closeable
 from xmlschema import XMLSchema
 from .abc import ISitemap, ISitemapFile, ILoadable
+from .store import Store
+from .host import Host
+from .loader import batched, decode_children, open_source, read_root
+from .metrics import IMetricsCollector, report_phase
+from .writer import MAX_ENTRIES_PER_FILE, MAX_BYTES_PER_FILE, SitemapWriter, render_element, render_text_element, write_files
 
 class Sitemap (NamedTuple):
 
@@ -36,35 +39,43 @@ class SitemapIndexFile (ISitemapFile):
   よって手動での生成は推奨されません。
   """
 
-  def __init__ (self, file:Path|str, sitemaps:list[Sitemap]):
+  def __init__ (self, file:Path|str, sitemaps:list[Sitemap], digest:str|None=None):
     self._file = Path(file)
     self._sitemaps = sitemaps
+    self._digest = digest
 
   @property
   def file (self) -> Path:
     return self._file
 
-  def _as_element (self) -> ETree.Element:
-    sitemap_index_node = ETree.Element("sitemapindex", {
-      "xmlns": "http://www.sitemaps.org/schemas/sitemap/0.9",
-    })
-    for loc, last_mod in self._sitemaps:
-      sitemap_node = ETree.SubElement(sitemap_index_node, "sitemap")
-      sitemap_loc_node = ETree.SubElement(sitemap_node, "loc")
-      sitemap_loc_node.text = loc
-      sitemap_last_mod_node = ETree.SubElement(sitemap_node, "lastmod")
-      sitemap_last_mod_node.text = last_mod.date().isoformat()
-    return sitemap_index_node
+  @property
+  def last_mod (self) -> datetime.datetime|None:
+    return max((last_mod for loc, last_mod in self._sitemaps), default=None)
+
+  @property
+  def digest (self) -> str|None:
+    return self._digest
+
+  _TAG:ClassVar[str] = "sitemapindex"
+  _ATTRIBUTES:ClassVar[dict[str, str]] = {
+    "xmlns": "http://www.sitemaps.org/schemas/sitemap/0.9",
+  }
+
+  @staticmethod
+  def _render (sitemap:Sitemap, use_indent:bool=False) -> bytes:
+    loc, last_mod = sitemap
+    return render_element("sitemap", (
+      render_text_element("loc", loc, use_indent, 2),
+      render_text_element("lastmod", last_mod.date().isoformat(), use_indent, 2),
+    ), use_indent, 1).encode("utf-8")
 
   def save (self, use_indent:bool=False):
-    element = self._as_element()
-    if use_indent:
-      ETree.indent(element)
-    with open(self._file, "wb") as file:
-      for part in ETree.tostringlist(element, encoding="utf-8", xml_declaration=True):
-        file.write(part)
+    with SitemapWriter(self._file, self._TAG, self._ATTRIBUTES, use_indent) as writer:
+      for sitemap in self._sitemaps:
+        writer.write(self._render(sitemap, use_indent))
+    self._digest = writer.digest
 
-class SitemapIndex (ISitemap, ILoadable, ICloseable):
+class SitemapIndex (Store, ISitemap, ILoadable):
 
   """サイトマップインデックスを表現するクラスです。
 
@@ -76,35 +87,51 @@ class SitemapIndex (ISitemap, ILoadable, ICloseable):
   >>> sitemap.register("http://www.example.com/sitemap.xml", datetime.datetime(2025, 1, 23))
   >>> sitemap.save_files()
   [<sitemap.sitemap_index.SitemapIndexFile object at 0xXXXXXXXXXXXXXXXX>]
+
+  Parameters
+  ----------
+  file : Path|str
+    サイトマップインデックスの保存先となるファイルパスです。
+  max_count : int
+    一つのファイルに記録されるサイトマップの最大数です。
+    この数を越えた場合、サイトマップインデックスは複数のファイルに分割して保存されます。
+    未指定ならば `50000` が設定されます。
+  max_bytes : int
+    一つのファイルの最大バイト数です。
+    この大きさを越えた場合、サイトマップインデックスは複数のファイルに分割して保存されます。
+    未指定ならば `52428800` (50MiB) が設定されます。
+  metrics : IMetricsCollector|None
+    各処理の計測結果の報告先です。
+    指定された場合、`register_many`, `list_all`, `load`, `save_files` の各処理に要した時間、保存されたファイルの情報、およびストアの大きさが報告されます。
+    未指定ならば計測は行われません。
+  isolated_save : bool
+    `save_files` メソッドを、呼び出し時点の登録内容を複製したストアから行うかを設定します。
+    真であれば保存中も別のスレッドから登録を続けることができ、保存される内容は呼び出し時点のものに固定されます。
+    偽であれば保存が終わるまで、別のスレッドからの登録や取得は待機させられます。
+    ただし保存中は登録内容と同じ大きさのストアが一時的に作成されます。
+    また文書の作成は GIL を保持したまま行われるため、登録の処理量は向上しません。
+    未指定ならば `False` が設定されます。
+  lazy_load : bool
+    `load` メソッドで XML スキーマによる検証を <sitemap> 要素ごとに逐次的に行うかを設定します。
+    真であれば検証済みのサイトマップ情報は一定件数ごとにまとめて登録され、読み込みに要するメモリの使用量はファイルの大きさに依存しなくなります。
+    ただし読み込みに要する時間は増加します。
+    未指定ならば `False` が設定されます。
   """
 
-  def _db_prepare (self) -> tuple[sqlite3.Connection, sqlite3.Cursor]:
-    connection = sqlite3.connect(":memory:")
-    cursor = connection.cursor()
-    cursor.execute("CREATE TABLE sitemap(id INTEGER PRIMARY KEY AUTOINCREMENT, loc TEXT, last_mod_seconds INTEGER)")
-    return connection, cursor
+  def _db_prepare (self) -> sqlite3.Connection:
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    connection.execute("CREATE TABLE sitemap(id INTEGER PRIMARY KEY AUTOINCREMENT, loc TEXT, last_mod_seconds INTEGER)")
+    connection.execute("CREATE UNIQUE INDEX sitemap_loc ON sitemap(loc)")
+    return connection
 
-  def __init__ (self, file:Path|str):
+  def __init__ (self, file:Path|str, max_count:int=MAX_ENTRIES_PER_FILE, max_bytes:int=MAX_BYTES_PER_FILE, metrics:IMetricsCollector|None=None, isolated_save:bool=False, lazy_load:bool=False):
     self._file = Path(file)
-    self._connection, self._cursor = self._db_prepare()
-    self._closeable = Closeable(self._close_handler)
-
-  def __enter__ (self):
-    return self
-
-  def __exit__ (self, exc_type, exc_value, traceback):
-    self._closeable.close()
-
-  @property
-  def closed (self) -> bool:
-    return self._closeable.closed
-
-  def _close_handler (self):
-    self._cursor.close()
-    self._connection.close()
-
-  def close (self):
-    self._closeable.close()
+    self._max_count = max_count
+    self._max_bytes = max_bytes
+    self._metrics = metrics
+    self._isolated_save = isolated_save
+    self._lazy_load = lazy_load
+    self._open_store()
 
   def register (self, loc:str, last_mod:datetime.datetime):
 
@@ -123,11 +150,35 @@ class SitemapIndex (ISitemap, ILoadable, ICloseable):
     """
 
     self._closeable.must_be_open()
-    self._cursor.execute("SELECT id FROM sitemap WHERE loc == ?", (loc,))
-    if self._cursor.fetchone():
-      self._cursor.execute("UPDATE sitemap SET last_mod_seconds = ? WHERE loc == ?", (last_mod.timestamp(), loc))
-    else:
-      self._cursor.execute("INSERT INTO sitemap(loc, last_mod_seconds) VALUES(?, ?)", (loc, last_mod.timestamp()))
+    with self._lock:
+      if self._fetch_one("SELECT id FROM sitemap WHERE loc == ?", (loc,)):
+        self._connection.execute("UPDATE sitemap SET last_mod_seconds = ? WHERE loc == ?", (last_mod.timestamp(), loc))
+      else:
+        self._connection.execute("INSERT INTO sitemap(loc, last_mod_seconds) VALUES(?, ?)", (loc, last_mod.timestamp()))
+
+  _REGISTER_SQL:ClassVar[str] = "INSERT INTO sitemap(loc, last_mod_seconds) VALUES(?, ?) ON CONFLICT(loc) DO UPDATE SET last_mod_seconds = excluded.last_mod_seconds"
+
+  def register_many (self, sitemaps:Iterable[tuple[str, datetime.datetime]]):
+
+    """サイトマップインデックスに複数のサイトマップの URL をまとめて登録します。
+
+    Notes
+    -----
+    本メソッドは `register` メソッドを繰り返し呼び出した場合と同じ結果になりますが、単一の SQL 文でまとめて処理するためより高速です。
+
+    Arguments
+    ---------
+    sitemaps : Iterable[tuple[str, datetime.datetime]]
+      登録するサイトマップの URL と更新日時の組の集合です。
+    """
+
+    self._closeable.must_be_open()
+    if self._metrics is not None:
+      start = time.perf_counter()
+    with self._lock:
+      rows = self._connection.executemany(self._REGISTER_SQL, ((loc, last_mod.timestamp()) for loc, last_mod in sitemaps)).rowcount
+    if self._metrics is not None:
+      report_phase(self._metrics, self._file, "register_many", start, rows)
 
   def unregister (self, loc:str):
 
@@ -144,14 +195,16 @@ class SitemapIndex (ISitemap, ILoadable, ICloseable):
     """
 
     self._closeable.must_be_open()
-    self._cursor.execute("DELETE FROM sitemap WHERE loc == ?", (loc,))
+    with self._lock:
+      self._connection.execute("DELETE FROM sitemap WHERE loc == ?", (loc,))
 
   def clear (self):
 
     """サイトマップに登録された全てのサイトマップ情報を削除します。"""
 
     self._closeable.must_be_open()
-    self._cursor.execute("DELETE FROM sitemap")
+    with self._lock:
+      self._connection.execute("DELETE FROM sitemap")
 
   def get (self, loc:str) -> Sitemap|None:
 
@@ -170,8 +223,7 @@ class SitemapIndex (ISitemap, ILoadable, ICloseable):
     """
 
     self._closeable.must_be_open()
-    self._cursor.execute("SELECT loc, last_mod_seconds FROM sitemap WHERE loc == ?", (loc,))
-    found_column = self._cursor.fetchone()
+    found_column = self._fetch_one("SELECT loc, last_mod_seconds FROM sitemap WHERE loc == ?", (loc,))
     if found_column:
       loc, last_mod_seconds = found_column
       last_mod = datetime.datetime.fromtimestamp(last_mod_seconds)
@@ -179,6 +231,48 @@ class SitemapIndex (ISitemap, ILoadable, ICloseable):
     else:
       return None
 
+  _NAMESPACE:ClassVar[str] = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+
+  def resolve_files (self, host:Host, accepts:Callable[[frozenset[str]], bool]) -> Iterator[Path]:
+
+    """登録された各サイトマップの URL をローカルのファイルパスに変換し、読み込むべきファイルを返します。
+
+    Notes
+    -----
+    各ファイルはルート要素の開始タグまでのみ解析され、その種類が判定されます。
+    サイトマップインデックスであれば、それに登録されたサイトマップが再帰的に展開されます。
+    同じファイルは一度のみ返され、循環して登録されたサイトマップインデックスも一度のみ展開されます。
+    <urlset> のファイルはルート要素で宣言された名前空間の集合を `accepts` に渡し、真が返されたもののみが返されます。
+
+    Arguments
+    ---------
+    host : Host
+      URL をファイルパスに変換するための `Host` オブジェクトです。
+    accepts : Callable[[frozenset[str]], bool]
+      ルート要素で宣言された名前空間の URI の集合を受け取り、読み込むべきファイルかを返す関数です。
+
+    Returns
+    -------
+    Iterator[Path]
+      読み込むべきファイルのパスを返すイテレータです。
+    """
+
+    self._closeable.must_be_open()
+    visited = set()
+    def resolve (locs:Iterable[str]) -> Iterator[Path]:
+      for loc in locs:
+        file = host.url_to_path(loc)
+        if file in visited:
+          continue
+        visited.add(file)
+        tag, namespaces = read_root(file)
+        if tag == self._NAMESPACE + "sitemapindex":
+          with open_source(file) as stream:
+            yield from resolve([loc for loc, _ in self._iter_rows(stream)])
+        elif tag == self._NAMESPACE + "urlset" and accepts(namespaces):
+          yield file
+    return resolve(loc for loc, _ in self._fetch_all("SELECT loc, last_mod_seconds FROM sitemap ORDER BY loc ASC"))
+
   def list_all (self) -> list[Sitemap]:
 
     """サイトマップインデックスに登録された全てのサイトマップ情報をリストにして返します。
@@ -191,31 +285,31 @@ class SitemapIndex (ISitemap, ILoadable, ICloseable):
     """
 
     self._closeable.must_be_open()
-    self._cursor.execute("SELECT loc, last_mod_seconds FROM sitemap ORDER BY loc ASC")
+    if self._metrics is not None:
+      start = time.perf_counter()
     result = []
-    for loc, last_mod_seconds in self._cursor.fetchall():
+    for loc, last_mod_seconds in self._fetch_all("SELECT loc, last_mod_seconds FROM sitemap ORDER BY loc ASC"):
       last_mod = datetime.datetime.fromtimestamp(last_mod_seconds)
       result.append(Sitemap(loc, last_mod))
+    if self._metrics is not None:
+      report_phase(self._metrics, self._file, "list_all", start, len(result))
     return result
 
   def save_files (self, use_indent:bool=False) -> list[ISitemapFile]:
-    self._cursor.execute("SELECT loc, last_mod_seconds FROM sitemap ORDER BY loc ASC")
-    sitemaps = [(loc, datetime.datetime.fromtimestamp(last_mod_seconds)) for loc, last_mod_seconds in self._cursor.fetchall()]
-    result = []
-    if sitemaps:
-      sitemap_index_file = SitemapIndexFile(self._file, sitemaps)
-      sitemap_index_file.save(use_indent=use_indent)
-      result.append(sitemap_index_file)
-    return result
+    self._closeable.must_be_open()
+    with self._save_source() as source:
+      sitemaps = (Sitemap(loc, datetime.datetime.fromtimestamp(last_mod_seconds)) for loc, last_mod_seconds in source._iter_query("SELECT loc, last_mod_seconds FROM sitemap ORDER BY loc ASC"))
+      return write_files(self._file, sitemaps, SitemapIndexFile._render, SitemapIndexFile._TAG, SitemapIndexFile._ATTRIBUTES, SitemapIndexFile, use_indent=use_indent, max_count=self._max_count, max_bytes=self._max_bytes, metrics=self._metrics)
 
   _XML_SCHEMA_TO_PARSE:ClassVar[XMLSchema] = XMLSchema(importlib.resources.files("sitemap").joinpath("static/xsd/sitemap.xsd"), build=False)
   _XML_SCHEMA_TO_PARSE.add_schema(importlib.resources.files("sitemap").joinpath("static/xsd/siteindex.xsd"))
   _XML_SCHEMA_TO_PARSE.build()
 
-  def load (self, stream:TextIOBase):
-    self._closeable.must_be_open()
-    root = self._XML_SCHEMA_TO_PARSE.to_dict(stream)
-    for sitemap in root["sitemap"]:
+  _LOAD_BATCH_SIZE:ClassVar[int] = 10000
+
+  @classmethod
+  def _iter_rows (cls, stream:TextIOBase|BinaryIO, lazy:bool=False) -> Iterator[tuple[str, float]]:
+    for sitemap in decode_children(cls._XML_SCHEMA_TO_PARSE, stream, "sitemap", lazy):
       loc_source = sitemap["loc"]
       if loc_source:
         loc = loc_source
@@ -226,8 +320,25 @@ class SitemapIndex (ISitemap, ILoadable, ICloseable):
         last_mod = datetime.datetime.fromisoformat(last_mod_source)
       else:
         raise ValueError()
-      self.register(loc, last_mod)
+      yield loc, last_mod.timestamp()
 
-  def loads (self, source:str):
-    with StringIO(source) as stream:
+  def load (self, stream:TextIOBase|BinaryIO|Path|str):
+    self._closeable.must_be_open()
+    if self._metrics is not None:
+      start = time.perf_counter()
+    count = 0
+    with open_source(stream) as opened_stream:
+      for rows in batched(self._iter_rows(opened_stream, self._lazy_load), self._LOAD_BATCH_SIZE):
+        with self._lock:
+          self._connection.executemany(self._REGISTER_SQL, rows)
+        count += len(rows)
+    if self._metrics is not None:
+      report_phase(self._metrics, self._file, "load", start, count)
+
+  def loads (self, source:str|bytes):
+    if isinstance(source, bytes):
+      stream = BytesIO(source)
+    else:
+      stream = StringIO(source)
+    with stream:
       self.load(stream)
@@ -0,0 +1,180 @@
+import time
+import sqlite3
+import threading
+import contextlib
+from typing import ClassVar, Iterator, Self
+from closeable import ICloseable, Closeable
+from .metrics import report_phase, report_store
+
+class Store (ICloseable):
+
+  """登録内容を SQLite のインメモリデータベースに保持するクラスの基底クラスです。
+
+  Notes
+  -----
+  派生クラスは `_db_prepare` メソッドでテーブルを作成し、`__init__` メソッドの中で `_open_store` メソッドを呼び出します。
+  本クラスはデータベースへの接続の管理と、登録内容の直列化・復元・複製の処理を提供します。
+
+  データベースへの接続は全てのスレッドで共有されます。
+  よって登録だけでなく取得を含む全ての処理は、`_lock` を取得した上で処理ごとに作成したカーソルを用いて行われます。
+  複数の行を逐次返す処理では、一定件数を取得する間のみ `_lock` が取得されます。
+  """
+
+  def _db_prepare (self) -> sqlite3.Connection:
+    raise NotImplementedError()
+
+  def _open_store (self):
+    self._attach(self._db_prepare())
+
+  def _attach (self, connection:sqlite3.Connection):
+    self._lock = threading.RLock()
+    self._connection = connection
+    self._closeable = Closeable(self._close_handler)
+
+  def _restored (self):
+    pass
+
+  def _fetch_one (self, sql:str, parameters:tuple=()) -> tuple|None:
+    with self._lock:
+      return self._connection.execute(sql, parameters).fetchone()
+
+  def _fetch_all (self, sql:str, parameters:tuple=()) -> list[tuple]:
+    with self._lock:
+      return self._connection.execute(sql, parameters).fetchall()
+
+  _FETCH_SIZE:ClassVar[int] = 1000
+
+  def _iter_query (self, sql:str, parameters:tuple=()) -> Iterator[tuple]:
+    with self._lock:
+      cursor = self._connection.execute(sql, parameters)
+    try:
+      while True:
+        with self._lock:
+          rows = cursor.fetchmany(self._FETCH_SIZE)
+        if not rows:
+          return
+        yield from rows
+    finally:
+      with self._lock:
+        cursor.close()
+
+  @contextlib.contextmanager
+  def _save_source (self) -> Iterator[Self]:
+    if self._metrics is not None:
+      with self._lock:
+        report_store(self._metrics, self._file, self._connection)
+    if self._isolated_save:
+      if self._metrics is not None:
+        start = time.perf_counter()
+      source = self.clone()
+      if self._metrics is not None:
+        report_phase(self._metrics, self._file, "snapshot", start, 0)
+      try:
+        yield source
+      finally:
+        source.close()
+    else:
+      with self._lock:
+        yield self
+
+  def __enter__ (self):
+    return self
+
+  def __exit__ (self, exc_type, exc_value, traceback):
+    self._closeable.close()
+
+  @property
+  def closed (self) -> bool:
+    return self._closeable.closed
+
+  def _close_handler (self):
+    with self._lock:
+      self._connection.close()
+
+  def close (self):
+    self._closeable.close()
+
+  def snapshot (self) -> bytes:
+
+    """登録内容を、SQLite のデータベース全体を直列化したバイト列として返します。
+
+    Notes
+    -----
+    直列化は `sqlite3.Connection.serialize` により行われるため、登録内容の数に関わらず Python のオブジェクトは作成されません。
+    返されたバイト列は `restore` メソッドで読み込むことができます。
+    `pickle` による直列化も同じ方式で行われるため、登録済みのオブジェクトを別のプロセスに渡すことができます。
+    ただし `metrics` に指定された報告先は直列化されません。
+
+    Returns
+    -------
+    bytes
+      直列化されたデータベースです。
+    """
+
+    self._closeable.must_be_open()
+    with self._lock:
+      self._connection.commit()
+      return self._connection.serialize()
+
+  def restore (self, data:bytes):
+
+    """`snapshot` メソッドで作成されたバイト列から登録内容を復元します。
+
+    Notes
+    -----
+    現在の登録内容は全て破棄され、バイト列の内容に置き換えられます。
+
+    Arguments
+    ---------
+    data : bytes
+      `snapshot` メソッドで作成されたバイト列です。
+    """
+
+    self._closeable.must_be_open()
+    with self._lock:
+      self._connection.commit()
+      self._connection.deserialize(data)
+      self._restored()
+
+  def clone (self) -> Self:
+
+    """登録内容を複製した新たなオブジェクトを返します。
+
+    Notes
+    -----
+    複製は SQLite のバックアップ API によりデータベースのページ単位で行われます。
+    `copy.copy` でも同様に複製することができます。
+
+    Returns
+    -------
+    Self
+      設定と登録内容が同一のオブジェクトです。
+    """
+
+    self._closeable.must_be_open()
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    with self._lock:
+      self._connection.commit()
+      self._connection.backup(connection)
+    clone = object.__new__(type(self))
+    clone.__dict__.update(self.__dict__)
+    clone._attach(connection)
+    return clone
+
+  def __copy__ (self) -> Self:
+    return self.clone()
+
+  def __getstate__ (self) -> dict:
+    state = self.__dict__.copy()
+    del state["_connection"], state["_closeable"], state["_lock"]
+    state["_metrics"] = None
+    state["_database"] = self.snapshot()
+    return state
+
+  def __setstate__ (self, state:dict):
+    state = state.copy()
+    data = state.pop("_database")
+    self.__dict__.update(state)
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    connection.deserialize(data)
+    self._attach(connection)
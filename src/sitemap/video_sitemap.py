@@ -0,0 +1,81 @@
+import datetime
+from typing import NamedTuple, ClassVar
+from .extension import Extension, ExtensionSitemap
+
+class Video (NamedTuple):
+
+  """動画サイトマップの <video:video> の内容を表現します。
+
+  Notes
+  -----
+  属性は動画サイトマップの XML スキーマの要素の順番通りに宣言されています。
+  属性を持つ要素 (<video:restriction>, <video:price>, <video:uploader>, <video:platform>) と、複数指定可能な <video:tag> には対応していません。
+
+  Attributes
+  ----------
+  thumbnail_loc : str
+    <video:thumbnail_loc> の値です。
+  title : str
+    <video:title> の値です。
+  description : str
+    <video:description> の値です。
+  content_loc : str|None
+    <video:content_loc> の値です。
+  player_loc : str|None
+    <video:player_loc> の値です。
+  duration : int|None
+    <video:duration> の値です。単位は秒です。
+  expiration_date : datetime.datetime|None
+    <video:expiration_date> の値です。
+  rating : float|None
+    <video:rating> の値です。
+  view_count : int|None
+    <video:view_count> の値です。
+  publication_date : datetime.datetime|None
+    <video:publication_date> の値です。
+  family_friendly : bool|None
+    <video:family_friendly> の値です。
+  requires_subscription : bool|None
+    <video:requires_subscription> の値です。
+  live : bool|None
+    <video:live> の値です。
+  """
+
+  thumbnail_loc:str
+  title:str
+  description:str
+  content_loc:str|None = None
+  player_loc:str|None = None
+  duration:int|None = None
+  expiration_date:datetime.datetime|None = None
+  rating:float|None = None
+  view_count:int|None = None
+  publication_date:datetime.datetime|None = None
+  family_friendly:bool|None = None
+  requires_subscription:bool|None = None
+  live:bool|None = None
+
+class VideoSitemap (ExtensionSitemap[Video]):
+
+  """動画サイトマップを表現するクラスです。
+
+  Examples
+  --------
+  >>> sitemap = VideoSitemap("./sample.xml")
+  >>> sitemap.register("http://www.example.com/video.html", Video("http://www.example.com/thumbnail.jpg", "title", "description", content_loc="http://www.example.com/video.mp4"))
+  >>> sitemap.save_files()
+  [<sitemap.extension.ExtensionSitemapFile object at 0xXXXXXXXXXXXXXXXX>]
+
+  Notes
+  -----
+  一つのページには複数の <video:video> を記録することができ、各動画は `thumbnail_loc` により識別されます。
+  その他の引数は `ExtensionSitemap` と同様です。
+  """
+
+  EXTENSION:ClassVar[Extension[Video]] = Extension(
+    Video,
+    "video",
+    "http://www.google.com/schemas/sitemap-video/1.1",
+    key="thumbnail_loc",
+    schema="static/xsd/sitemap-video.xsd",
+  )
@@ -0,0 +1,473 @@
+import os
+import time
+import hashlib
+from pathlib import Path
+import datetime
+from typing import NamedTuple, Callable, Iterable, TypeVar
+from xml.sax.saxutils import escape
+from .abc import ISitemapFile
+from .metrics import IMetricsCollector, PhaseMetric, FileMetric, PhaseTimer
+
+MAX_ENTRIES_PER_FILE:int = 50000
+MAX_BYTES_PER_FILE:int = 50 * 1024 * 1024
+
+XML_DECLARATION:bytes = b"<?xml version='1.0' encoding='utf-8'?>\n"
+
+T = TypeVar("T")
+
+def numbered_file (file:Path, index:int) -> Path:
+
+  """分割保存される `index` 番目のファイルのパスを返します。
+
+  Notes
+  -----
+  最初のファイルは `file` そのものであり、以降は "sample2.xml", "sample3.xml" のように拡張子前に番号が添加されます。
+
+  Parameters
+  ----------
+  file : Path
+    基準となるファイルパスです。
+  index : int
+    0 から始まるファイルの番号です。
+
+  Returns
+  -------
+  Path
+    分割保存される際のファイルパスです。
+  """
+
+  if 0 < index:
+    return file.with_stem("{:s}{:d}".format(file.stem, index +1))
+  else:
+    return file
+
+def render_text_element (tag:str, text:str, use_indent:bool=False, level:int=0) -> str:
+
+  """テキストのみを持つ要素を文字列に変換します。
+
+  Parameters
+  ----------
+  tag : str
+    要素のタグ名です。
+  text : str
+    要素のテキストです。本関数内でエスケープ処理が行われます。
+  use_indent : bool
+    インデントを用いるかを設定します。
+  level : int
+    要素の深さです。ルート要素の直下が `1` になります。
+
+  Returns
+  -------
+  str
+    変換された文字列です。
+  """
+
+  if use_indent:
+    return "\n{:s}<{:s}>{:s}</{:s}>".format("  " * level, tag, escape(text), tag)
+  else:
+    return "<{:s}>{:s}</{:s}>".format(tag, escape(text), tag)
+
+def render_element (tag:str, children:Iterable[str], use_indent:bool=False, level:int=0) -> str:
+
+  """子要素を持つ要素を文字列に変換します。
+
+  Parameters
+  ----------
+  tag : str
+    要素のタグ名です。
+  children : Iterable[str]
+    既に文字列に変換された子要素の集合です。
+    子要素は `level +1` の深さで変換されている必要があります。
+  use_indent : bool
+    インデントを用いるかを設定します。
+  level : int
+    要素の深さです。ルート要素の直下が `1` になります。
+
+  Returns
+  -------
+  str
+    変換された文字列です。
+  """
+
+  if use_indent:
+    indent = "\n" + "  " * level
+    return "{:s}<{:s}>{:s}{:s}</{:s}>".format(indent, tag, "".join(children), indent, tag)
+  else:
+    return "<{:s}>{:s}</{:s}>".format(tag, "".join(children), tag)
+
+def render_document_parts (tag:str, attributes:dict[str, str], use_indent:bool=False) -> tuple[bytes, bytes, bytes]:
+
+  """サイトマップの XML 文書のうち、子要素以外の部分を返します。
+
+  Parameters
+  ----------
+  tag : str
+    ルート要素のタグ名です。
+  attributes : dict[str, str]
+    ルート要素の属性です。
+  use_indent : bool
+    インデントを用いるかを設定します。
+
+  Returns
+  -------
+  tuple[bytes, bytes, bytes]
+    XML 宣言を含む開始タグ、子要素を持たない場合の文書全体、終了タグの組です。
+  """
+
+  attributes_str = "".join(" {:s}=\"{:s}\"".format(name, escape(value, {"\"": "&quot;"})) for name, value in attributes.items())
+  start = XML_DECLARATION + "<{:s}{:s}>".format(tag, attributes_str).encode("utf-8")
+  empty = XML_DECLARATION + "<{:s}{:s} />".format(tag, attributes_str).encode("utf-8")
+  if use_indent:
+    end = "\n</{:s}>".format(tag).encode("utf-8")
+  else:
+    end = "</{:s}>".format(tag).encode("utf-8")
+  return start, empty, end
+
+class RenderedChunk (NamedTuple):
+
+  """メモリ上に変換されたサイトマップの XML 文書を表現します。
+
+  Attributes
+  ----------
+  content : bytes
+    UTF-8 で符号化された XML 文書です。
+  digest : str
+    `content` の SHA-256 ハッシュ値を 16 進数で表現した文字列です。
+  last_mod : datetime.datetime|None
+    文書に記録された情報のうち、最も新しい更新日時です。
+    更新日時を持たない場合は `None` になります。
+  count : int
+    文書に記録された子要素の数です。
+  """
+
+  content:bytes
+  digest:str
+  last_mod:datetime.datetime|None
+  count:int
+
+def render_document (parts:Iterable[bytes], tag:str, attributes:dict[str, str], use_indent:bool=False) -> bytes:
+
+  """変換済みの子要素からサイトマップの XML 文書をメモリ上に作成します。
+
+  Notes
+  -----
+  作成される内容は、同じ子要素を `SitemapWriter` で書き込んだファイルの内容と同一です。
+
+  Parameters
+  ----------
+  parts : Iterable[bytes]
+    UTF-8 で符号化された子要素の集合です。
+  tag : str
+    ルート要素のタグ名です。
+  attributes : dict[str, str]
+    ルート要素の属性です。
+  use_indent : bool
+    インデントを用いるかを設定します。
+
+  Returns
+  -------
+  bytes
+    UTF-8 で符号化された XML 文書です。
+  """
+
+  start, empty, end = render_document_parts(tag, attributes, use_indent)
+  body = b"".join(parts)
+  if body:
+    return start + body + end
+  else:
+    return empty
+
+class SitemapWriter:
+
+  """サイトマップの XML をファイルに逐次書き込むためのクラスです。
+
+  Notes
+  -----
+  本クラスが出力する内容は `xml.etree.ElementTree` で作成した要素を `ElementTree.indent`, `ElementTree.tostringlist` で保存した場合と同一です。
+  ルート要素の開始タグは最初の子要素が書き込まれる際に、終了タグは `close` メソッドが呼ばれた際に書き込まれます。
+
+  書き込みは一時ファイルに対して行われ、`close` メソッドが呼ばれた際に保存先のファイルと置き換えられます。
+  ただし保存先のファイルが既に存在する場合、書き込まれる内容はまずその内容と逐次比較され、
+  最初に内容が異なった時点で一時ファイルが作成され、それまでに一致した部分が複写されます。
+  よって保存先のファイルが既に同一の内容であれば一時ファイルへの書き込みも置き換えも行われず、そのファイルの更新日時は維持されます。
+  """
+
+  def __init__ (self, file:Path|str, tag:str, attributes:dict[str, str], use_indent:bool=False):
+    self._file = Path(file)
+    self._temp_file = self._file.with_name(self._file.name + ".tmp")
+    self._start, self._empty, self._end = render_document_parts(tag, attributes, use_indent)
+    self._stream = None
+    try:
+      self._source = open(self._file, "rb")
+    except FileNotFoundError:
+      self._source = None
+      self._stream = open(self._temp_file, "wb")
+    self._pending = self._stream is not None
+    self._matched = 0
+    self._hash = hashlib.sha256()
+    self._count = 0
+    self._size = len(self._start)
+    self._changed = True
+    self._finished = False
+
+  def __enter__ (self):
+    return self
+
+  def __exit__ (self, exc_type, exc_value, traceback):
+    if exc_type is None:
+      self.close()
+    else:
+      self.abort()
+
+  @property
+  def file (self) -> Path:
+    return self._file
+
+  @property
+  def count (self) -> int:
+
+    """書き込まれた子要素の数を返します。"""
+
+    return self._count
+
+  @property
+  def size (self) -> int:
+
+    """終了タグを含めた、ファイルの最終的なバイト数を返します。"""
+
+    return self._size + len(self._end)
+
+  @property
+  def digest (self) -> str:
+
+    """書き込まれた内容の SHA-256 ハッシュ値を 16 進数の文字列で返します。
+
+    Notes
+    -----
+    本プロパティは `close` メソッドが呼ばれた後に参照されることを想定しています。
+    """
+
+    return self._hash.hexdigest()
+
+  @property
+  def changed (self) -> bool:
+
+    """保存先のファイルの内容が変更されたかを返します。
+
+    Notes
+    -----
+    本プロパティは `close` メソッドが呼ばれた後に参照されることを想定しています。
+    """
+
+    return self._changed
+
+  def fits (self, part:bytes, max_count:int=MAX_ENTRIES_PER_FILE, max_bytes:int=MAX_BYTES_PER_FILE) -> bool:
+
+    """子要素を追加で書き込んだ際に、ファイルが制限に収まるかを判定します。
+
+    Notes
+    -----
+    子要素が一つも書き込まれていない場合、本メソッドは常に `True` を返します。
+
+    Parameters
+    ----------
+    part : bytes
+      書き込もうとしている子要素です。
+    max_count : int
+      ファイルに書き込める子要素の最大数です。
+    max_bytes : int
+      ファイルの最大バイト数です。
+
+    Returns
+    -------
+    bool
+      制限に収まるならば `True` を返します。
+    """
+
+    if self._count == 0:
+      return True
+    return self._count < max_count and self.size + len(part) <= max_bytes
+
+  def _diverge (self):
+    self._stream = open(self._temp_file, "wb")
+    self._pending = True
+    self._source.seek(0)
+    remaining = self._matched
+    while 0 < remaining:
+      data = self._source.read(min(remaining, 1024 * 1024))
+      self._stream.write(data)
+      remaining -= len(data)
+    self._source.close()
+    self._source = None
+
+  def _write (self, data:bytes):
+    self._hash.update(data)
+    if self._stream is None:
+      if self._source.read(len(data)) == data:
+        self._matched += len(data)
+        return
+      self._diverge()
+    self._stream.write(data)
+
+  def write (self, part:bytes):
+
+    """子要素を書き込みます。
+
+    Parameters
+    ----------
+    part : bytes
+      UTF-8 で符号化された子要素です。
+    """
+
+    if self._count == 0:
+      self._write(self._start)
+    self._write(part)
+    self._count += 1
+    self._size += len(part)
+
+  def finish (self):
+
+    """終了タグを書き込み、書き込みを完了します。
+
+    Notes
+    -----
+    保存先のファイルは置き換えられず、内容が異なる場合は一時ファイルが残されます。
+    一時ファイルは `commit` メソッドで保存先のファイルと置き換えられ、`abort` メソッドで削除されます。
+    `changed` プロパティは本メソッドが呼ばれた後に参照することができます。
+    """
+
+    if not self._finished:
+      self._finished = True
+      if self._count == 0:
+        self._write(self._empty)
+        self._size = len(self._empty) - len(self._end)
+      else:
+        self._write(self._end)
+      if self._stream is None and self._source.read(1) == b"":
+        self._changed = False
+        self._source.close()
+        self._source = None
+        return
+      if self._stream is None:
+        self._diverge()
+      self._changed = True
+      self._stream.close()
+
+  def commit (self):
+
+    """書き込みを完了し、一時ファイルで保存先のファイルを置き換えます。"""
+
+    self.finish()
+    if self._pending:
+      self._pending = False
+      os.replace(self._temp_file, self._file)
+
+  def close (self):
+
+    """終了タグを書き込み、保存先のファイルを置き換えます。"""
+
+    self.commit()
+
+  def abort (self):
+
+    """書き込みを中断し、一時ファイルを削除します。保存先のファイルは変更されません。"""
+
+    self._finished = True
+    if self._source is not None:
+      self._source.close()
+      self._source = None
+    if self._stream is not None:
+      self._stream.close()
+    if self._pending:
+      self._pending = False
+      os.remove(self._temp_file)
+
+def write_files (file:Path, entries:Iterable[T], render:Callable[[T, bool], bytes], tag:str, attributes:dict[str, str], new_file:Callable[[Path, list[T], str], ISitemapFile], use_indent:bool=False, max_count:int=MAX_ENTRIES_PER_FILE, max_bytes:int=MAX_BYTES_PER_FILE, metrics:IMetricsCollector|None=None) -> list[ISitemapFile]:
+
+  """整列済みの子要素を逐次書き込み、制限を越えるごとにファイルを分割します。
+
+  Notes
+  -----
+  各ファイルは一時ファイルに書き込まれ、全てのファイルの書き込みが完了した後にまとめて保存先のファイルと置き換えられます。
+  よって子要素の取得や変換の途中で例外が送出された場合、一時ファイルは全て削除され、保存先のファイルはいずれも変更されません。
+
+  Parameters
+  ----------
+  file : Path
+    最初に保存されるファイルのパスです。
+    以降のファイルは `numbered_file` に従い命名されます。
+  entries : Iterable[T]
+    書き込まれる子要素の情報です。
+  render : Callable[[T, bool], bytes]
+    子要素の情報とインデントの有無を受け取り、UTF-8 で符号化された子要素を返す関数です。
+  tag : str
+    ルート要素のタグ名です。
+  attributes : dict[str, str]
+    ルート要素の属性です。
+  new_file : Callable[[Path, list[T], str], ISitemapFile]
+    書き込みが完了したファイルのパス、その子要素の情報、および内容のハッシュ値から `ISitemapFile` を作成する関数です。
+  use_indent : bool
+    インデントを用いるかを設定します。
+  max_count : int
+    一つのファイルに書き込める子要素の最大数です。
+  max_bytes : int
+    一つのファイルの最大バイト数です。
+  metrics : IMetricsCollector|None
+    計測結果の報告先です。
+    指定された場合、子要素の取得 ("fetch")、変換 ("render")、書き込み ("write") の各段階および全体 ("save_files") に要した時間と、保存されたファイルごとの情報が報告されます。
+    未指定ならば計測は行われません。
+
+  Returns
+  -------
+  list[ISitemapFile]
+    保存されたファイルのリストです。
+    子要素が一つも無ければ空のリストが返されます。
+  """
+
+  write = SitemapWriter.write
+  finish = SitemapWriter.finish
+  commit = SitemapWriter.commit
+  if metrics is not None:
+    start = time.perf_counter()
+    fetch_timer = PhaseTimer()
+    render_timer = PhaseTimer()
+    write_timer = PhaseTimer()
+    entries = fetch_timer.iterate(entries)
+    render = render_timer.wrap(render)
+    write = write_timer.wrap(write)
+    finish = write_timer.wrap(finish)
+    commit = write_timer.wrap(commit)
+  result = []
+  writers = []
+  chunk = []
+
+  def finish_chunk (writer:SitemapWriter, chunk:list[T]):
+    finish(writer)
+    result.append(new_file(writer.file, chunk, writer.digest))
+
+  try:
+    for entry in entries:
+      part = render(entry, use_indent)
+      if writers and not writers[-1].fits(part, max_count, max_bytes):
+        finish_chunk(writers[-1], chunk)
+        chunk = []
+      if len(writers) == len(result):
+        writers.append(SitemapWriter(numbered_file(file, len(result)), tag, attributes, use_indent))
+      write(writers[-1], part)
+      chunk.append(entry)
+    if len(result) < len(writers):
+      finish_chunk(writers[-1], chunk)
+    for writer in writers:
+      commit(writer)
+      if metrics is not None:
+        metrics.on_file(FileMetric(file, writer.file, writer.size, writer.count, writer.changed))
+    writers = []
+  finally:
+    for writer in writers:
+      writer.abort()
+  if metrics is not None:
+    metrics.on_phase(PhaseMetric(file, "fetch", fetch_timer.seconds, fetch_timer.count))
+    metrics.on_phase(PhaseMetric(file, "render", render_timer.seconds, fetch_timer.count))
+    metrics.on_phase(PhaseMetric(file, "write", write_timer.seconds, fetch_timer.count))
+    metrics.on_phase(PhaseMetric(file, "save_files", time.perf_counter() - start, fetch_timer.count))
+  return result
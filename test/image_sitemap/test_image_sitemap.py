@@ -4,7 +4,7 @@ import shutil
 import datetime
 from io import StringIO
 from pathlib import Path
-from sitemap.image_sitemap import ImageSitemap, Image, URL
+from sitemap.image_sitemap import ImageSitemap, ImageLimitPolicy, Image, URL
 from collections import OrderedDict
 
 TEST_DIR = Path("./.test")
@@ -76,6 +76,60 @@ def test_image_sitemap_with_indent ():
   </url>
 </urlset>"""
 
+def test_image_sitemap_split ():
+
+  #ファイルの大きさが max_bytes を越える場合はページの境界で分割される。
+
+  content = "<?xml version='1.0' encoding='utf-8'?>\n<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\" xmlns:image=\"http://www.google.com/schemas/sitemap-image/1.1\"><url><loc>http://www.example.com/page.html</loc><image:image><image:loc>http://www.example.com/image.png</image:loc></image:image><image:image><image:loc>http://www.example.com/image2.png</image:loc></image:image></url></urlset>"
+  image_sitemap = ImageSitemap(TEST_DIR.joinpath("sample.xml"), max_bytes=len(content.encode("utf-8")))
+  image_sitemap.register("http://www.example.com/page.html", "http://www.example.com/image.png")
+  image_sitemap.register("http://www.example.com/page.html", "http://www.example.com/image2.png")
+  image_sitemap.register("http://www.example.com/page2.html", "http://www.example.com/image.png")
+  assert [sitemap_file.file for sitemap_file in image_sitemap.save_files()] == [
+    TEST_DIR.joinpath("sample.xml"),
+    TEST_DIR.joinpath("sample2.xml"),
+  ]
+  with open(TEST_DIR.joinpath("sample.xml"), "r") as file:
+    assert file.read() == content
+  with open(TEST_DIR.joinpath("sample2.xml"), "r") as file:
+    assert file.read() == "<?xml version='1.0' encoding='utf-8'?>\n<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\" xmlns:image=\"http://www.google.com/schemas/sitemap-image/1.1\"><url><loc>http://www.example.com/page2.html</loc><image:image><image:loc>http://www.example.com/image.png</image:loc></image:image></url></urlset>"
+
+def test_image_sitemap_max_images_per_page ():
+
+  #ページの画像の数が max_images_per_page を越えた場合は先頭から max_images_per_page 個の画像のみ保存される。
+
+  image_sitemap = ImageSitemap(TEST_DIR.joinpath("sample.xml"), max_images_per_page=1)
+  image_sitemap.register("http://www.example.com/page.html", "http://www.example.com/image.png")
+  image_sitemap.register("http://www.example.com/page.html", "http://www.example.com/image2.png")
+  image_sitemap.register("http://www.example.com/page2.html", "http://www.example.com/image.png")
+  assert [sitemap_file.file for sitemap_file in image_sitemap.save_files()] == [TEST_DIR.joinpath("sample.xml")]
+  with open(TEST_DIR.joinpath("sample.xml"), "r") as file:
+    assert file.read() == "<?xml version='1.0' encoding='utf-8'?>\n<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\" xmlns:image=\"http://www.google.com/schemas/sitemap-image/1.1\"><url><loc>http://www.example.com/page.html</loc><image:image><image:loc>http://www.example.com/image.png</image:loc></image:image></url><url><loc>http://www.example.com/page2.html</loc><image:image><image:loc>http://www.example.com/image.png</image:loc></image:image></url></urlset>"
+  assert len(image_sitemap.get("http://www.example.com/page.html").images) == 2
+
+def test_image_sitemap_max_images_per_page2 ():
+
+  #image_limit_policy に ImageLimitPolicy.RAISE を指定した場合は ValueError が送出される。
+
+  image_sitemap = ImageSitemap(TEST_DIR.joinpath("sample.xml"), max_images_per_page=1, image_limit_policy=ImageLimitPolicy.RAISE)
+  image_sitemap.register("http://www.example.com/page.html", "http://www.example.com/image.png")
+  image_sitemap.register("http://www.example.com/page.html", "http://www.example.com/image2.png")
+  with pytest.raises(ValueError):
+    image_sitemap.save_files()
+  assert TEST_DIR.joinpath("sample.xml").exists() == False
+  #先に書き込まれたファイルも含めて、保存先のファイルはいずれも変更されない。
+  image_sitemap = ImageSitemap(TEST_DIR.joinpath("sample.xml"), max_count=1, max_images_per_page=1, image_limit_policy=ImageLimitPolicy.RAISE)
+  image_sitemap.register("http://www.example.com/page.html", "http://www.example.com/image.png")
+  image_sitemap.register("http://www.example.com/page2.html", "http://www.example.com/image.png")
+  image_sitemap.save_files()
+  contents = [TEST_DIR.joinpath(name).read_bytes() for name in ("sample.xml", "sample2.xml")]
+  image_sitemap.register("http://www.example.com/page.html", "http://www.example.com/image.png", image_caption="caption")
+  image_sitemap.register("http://www.example.com/page2.html", "http://www.example.com/image2.png")
+  with pytest.raises(ValueError):
+    image_sitemap.save_files()
+  assert [TEST_DIR.joinpath(name).read_bytes() for name in ("sample.xml", "sample2.xml")] == contents
+  assert sorted(path.name for path in TEST_DIR.iterdir()) == ["sample.xml", "sample2.xml"]
+
 def test_image_sitemap_get ():
   image_sitemap = ImageSitemap(TEST_DIR.joinpath("sample.xml"))
   image_sitemap.register("http://www.example.com/page.html", "http://www.example.com/top-image.png")
@@ -304,3 +358,54 @@ def test_image_sitemap_loads ():
       ]
     )
   ]
+
+def test_image_sitemap_register ():
+
+  #登録済みの画像を再度登録した場合は既存の情報が更新される。
+
+  image_sitemap = ImageSitemap(TEST_DIR.joinpath("sample.xml"))
+  image_sitemap.register("http://www.example.com/page.html", "http://www.example.com/image.png", image_license="license")
+  image_sitemap.register("http://www.example.com/page.html", "http://www.example.com/image2.png", image_geo_location="geo location", image_license="license")
+  image_sitemap.register("http://www.example.com/page.html", "http://www.example.com/image.png", image_caption="caption", image_license="license2")
+  assert image_sitemap.get("http://www.example.com/page.html") == URL("http://www.example.com/page.html", [
+    Image("http://www.example.com/image.png", caption="caption", license="license2"),
+    Image("http://www.example.com/image2.png", geo_location="geo location", license="license"),
+  ])
+  image_sitemap.unregister("http://www.example.com/page.html", "http://www.example.com/image.png")
+  image_sitemap.unregister("http://www.example.com/page.html", "http://www.example.com/image2.png")
+  assert image_sitemap.get("http://www.example.com/page.html") is None
+  assert image_sitemap.list_all() == []
+
+def test_image_sitemap_load_files ():
+  source = ImageSitemap(TEST_DIR.joinpath("source.xml"), max_count=1)
+  source.register("http://www.example.com/", "http://www.example.com/image.png", image_caption="caption", image_geo_location="geo location", image_title="title", image_license="license")
+  source.register("http://www.example.com/", "http://www.example.com/image2.png")
+  source.register("http://www.example.com/page.html", "http://www.example.com/image.png", image_license="license")
+  files = [image_sitemap_file.file for image_sitemap_file in source.save_files()]
+  #逐次的に読み込んでも、複数のプロセスで読み込んでも同じ結果になる。
+  for workers in (1, 2):
+    image_sitemap = ImageSitemap(TEST_DIR.joinpath("sample.xml"))
+    image_sitemap.load_files(files, workers=workers)
+    assert image_sitemap.list_all() == source.list_all()
+
+def test_image_sitemap_lazy_load ():
+  source = ImageSitemap(TEST_DIR.joinpath("source.xml"))
+  source.register("http://www.example.com/", "http://www.example.com/image.png", image_caption="caption", image_geo_location="geo location", image_title="title", image_license="license")
+  source.register("http://www.example.com/", "http://www.example.com/image2.png")
+  source.register("http://www.example.com/page.html", "http://www.example.com/image.png")
+  source_file, = source.save_files()
+  #逐次的に検証しながら読み込んでも同じ結果になる。
+  image_sitemap = ImageSitemap(TEST_DIR.joinpath("sample.xml"), lazy_load=True)
+  image_sitemap.load(source_file.file)
+  assert image_sitemap.list_all() == source.list_all()
+
+def test_image_sitemap_load_parallel ():
+  source = ImageSitemap(TEST_DIR.joinpath("source.xml"))
+  for index in range(20):
+    source.register("http://www.example.com/{:d}.html".format(index), "http://www.example.com/image.png", image_caption="caption", image_license="license")
+    source.register("http://www.example.com/{:d}.html".format(index), "http://www.example.com/image2.png")
+  source_file, = source.save_files()
+  #ファイルを分割して読み込んでも、逐次的に読み込んだ場合と同じ結果になる。
+  image_sitemap = ImageSitemap(TEST_DIR.joinpath("sample.xml"))
+  image_sitemap.load_parallel(source_file.file, workers=1)
+  assert image_sitemap.list_all() == source.list_all()
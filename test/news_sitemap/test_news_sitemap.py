@@ -0,0 +1,52 @@
+import pytest
+import shutil
+import datetime
+from pathlib import Path
+from sitemap.news_sitemap import NewsSitemap, News
+
+TEST_DIR = Path("./.test")
+
+def setup_function (function):
+  TEST_DIR.mkdir(parents=True, exist_ok=True)
+
+def teardown_function (function):
+  shutil.rmtree(TEST_DIR)
+
+#main
+
+def test_news_sitemap ():
+  news_sitemap = NewsSitemap(TEST_DIR.joinpath("sample.xml"))
+  news_sitemap.register("http://www.example.com/article.html", News("The Example Times", "en", datetime.datetime(2025, 1, 23, 12, 30), "Companies A & B in Merger Talks"))
+  assert [sitemap_file.file for sitemap_file in news_sitemap.save_files()] == [TEST_DIR.joinpath("sample.xml")]
+  with open(TEST_DIR.joinpath("sample.xml"), "r") as file:
+    assert file.read() == "<?xml version='1.0' encoding='utf-8'?>\n<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\" xmlns:news=\"http://www.google.com/schemas/sitemap-news/0.9\"><url><loc>http://www.example.com/article.html</loc><news:news><news:publication><news:name>The Example Times</news:name><news:language>en</news:language></news:publication><news:publication_date>2025-01-23T12:30:00</news:publication_date><news:title>Companies A &amp; B in Merger Talks</news:title></news:news></url></urlset>"
+
+def test_news_sitemap2 ():
+
+  #一つのページには一つの <news:news> のみが記録される。
+
+  news_sitemap = NewsSitemap(TEST_DIR.joinpath("sample.xml"))
+  news_sitemap.register("http://www.example.com/article.html", News("The Example Times", "en", datetime.datetime(2025, 1, 23), "title"))
+  news_sitemap.register("http://www.example.com/article.html", News("The Example Times", "en", datetime.datetime(2025, 1, 24), "title2"))
+  assert news_sitemap.get("http://www.example.com/article.html") == [News("The Example Times", "en", datetime.datetime(2025, 1, 24), "title2")]
+  assert news_sitemap.get("http://www.example.com/missing.html") is None
+  with pytest.raises(ValueError):
+    news_sitemap.register("http://www.example.com/article.html", News("The Example Times", "en", datetime.datetime(2025, 1, 24), None))
+
+def test_news_sitemap_max_count ():
+
+  #一つのファイルに記録されるページの数は、既定では 1000 件までとなる。
+
+  news_sitemap = NewsSitemap(TEST_DIR.joinpath("sample.xml"))
+  news_sitemap.register_many(("http://www.example.com/{:04d}.html".format(index), News("The Example Times", "en", datetime.datetime(2025, 1, 23), "title")) for index in range(1001))
+  assert [sitemap_file.file for sitemap_file in news_sitemap.save_files()] == [TEST_DIR.joinpath("sample.xml"), TEST_DIR.joinpath("sample2.xml")]
+
+def test_news_sitemap_load ():
+  news_sitemap = NewsSitemap(TEST_DIR.joinpath("sample.xml"))
+  news_sitemap.register("http://www.example.com/article.html", News("The Example Times", "en", datetime.datetime(2025, 1, 23, 12, 30), "title"))
+  news_sitemap.register("http://www.example.com/article2.html", News("The Example Times", "ja", datetime.datetime(2025, 1, 24), "title2"))
+  news_sitemap.save_files(use_indent=True)
+  for lazy_load in (False, True):
+    loaded_news_sitemap = NewsSitemap(TEST_DIR.joinpath("sample2.xml"), lazy_load=lazy_load)
+    loaded_news_sitemap.load(TEST_DIR.joinpath("sample.xml"))
+    assert loaded_news_sitemap.list_all() == news_sitemap.list_all()
@@ -0,0 +1,99 @@
+import pytest
+import shutil
+import datetime
+from pathlib import Path
+from sitemap import Sitemap, ImageSitemap, ChangeFreq, ImageLimitPolicy
+from sitemap.image_sitemap import Image
+from sitemap.page_sitemap import PageSitemap, Page
+
+TEST_DIR = Path("./.test")
+
+def setup_function (function):
+  TEST_DIR.mkdir(parents=True, exist_ok=True)
+
+def teardown_function (function):
+  shutil.rmtree(TEST_DIR)
+
+#main
+
+def test_page_sitemap ():
+  page_sitemap = PageSitemap(TEST_DIR.joinpath("sample.xml"))
+  page_sitemap.register("http://www.example.com/", datetime.datetime(2025, 1, 23), priority=1.0, change_freq=ChangeFreq.DAILY)
+  page_sitemap.register_image("http://www.example.com/", "http://www.example.com/top-image2.png", image_caption="caption")
+  page_sitemap.register_image("http://www.example.com/", "http://www.example.com/top-image.png")
+  page_sitemap.register("http://www.example.com/page.html", datetime.datetime(2025, 1, 23))
+  sitemap_files = page_sitemap.save_files()
+  assert [sitemap_file.file for sitemap_file in sitemap_files] == [TEST_DIR.joinpath("sample.xml")]
+  assert sitemap_files[0].last_mod == datetime.datetime(2025, 1, 23)
+  #ページ情報と画像情報は同じ <url> に書き込まれる。
+  with open(TEST_DIR.joinpath("sample.xml"), "r") as file:
+    assert file.read() == "<?xml version='1.0' encoding='utf-8'?>\n<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\" xmlns:image=\"http://www.google.com/schemas/sitemap-image/1.1\"><url><loc>http://www.example.com/</loc><lastmod>2025-01-23</lastmod><changefreq>daily</changefreq><priority>1.000</priority><image:image><image:loc>http://www.example.com/top-image.png</image:loc></image:image><image:image><image:loc>http://www.example.com/top-image2.png</image:loc><image:caption>caption</image:caption></image:image></url><url><loc>http://www.example.com/page.html</loc><lastmod>2025-01-23</lastmod></url></urlset>"
+
+def test_page_sitemap2 ():
+
+  #未登録のページに画像は登録できない。
+
+  page_sitemap = PageSitemap(TEST_DIR.joinpath("sample.xml"))
+  with pytest.raises(ValueError):
+    page_sitemap.register_image("http://www.example.com/", "http://www.example.com/top-image.png")
+  assert page_sitemap.save_files() == []
+
+def test_page_sitemap_register_many ():
+  page_sitemap = PageSitemap(TEST_DIR.joinpath("sample.xml"))
+  page_sitemap.register_many([
+    Page("http://www.example.com/", datetime.datetime(2025, 1, 23), images=[Image("http://www.example.com/top-image.png", title="title")]),
+    Page("http://www.example.com/page.html", datetime.datetime(2025, 1, 24)),
+  ])
+  #ページ情報を更新しても画像情報は維持される。
+  page_sitemap.register("http://www.example.com/", datetime.datetime(2025, 1, 25))
+  assert page_sitemap.get("http://www.example.com/") == Page("http://www.example.com/", datetime.datetime(2025, 1, 25), images=[Image("http://www.example.com/top-image.png", title="title")])
+  assert page_sitemap.get("http://www.example.com/page.html") == Page("http://www.example.com/page.html", datetime.datetime(2025, 1, 24), images=[])
+  assert page_sitemap.get("http://www.example.com/missing.html") is None
+  page_sitemap.unregister_image("http://www.example.com/", "http://www.example.com/top-image.png")
+  page_sitemap.unregister("http://www.example.com/page.html")
+  assert page_sitemap.list_all() == [Page("http://www.example.com/", datetime.datetime(2025, 1, 25), images=[])]
+  page_sitemap.clear()
+  assert page_sitemap.list_all() == []
+
+def test_page_sitemap_image_limit ():
+  page_sitemap = PageSitemap(TEST_DIR.joinpath("sample.xml"), max_images_per_page=2)
+  page_sitemap.register("http://www.example.com/", datetime.datetime(2025, 1, 23))
+  for index in range(3):
+    page_sitemap.register_image("http://www.example.com/", "http://www.example.com/image{:d}.png".format(index))
+  page_sitemap.save_files()
+  loaded_page_sitemap = PageSitemap(TEST_DIR.joinpath("sample2.xml"))
+  loaded_page_sitemap.load(TEST_DIR.joinpath("sample.xml"))
+  assert [image.loc for image in loaded_page_sitemap.get("http://www.example.com/").images] == ["http://www.example.com/image0.png", "http://www.example.com/image1.png"]
+  page_sitemap = PageSitemap(TEST_DIR.joinpath("sample.xml"), max_images_per_page=2, image_limit_policy=ImageLimitPolicy.RAISE)
+  page_sitemap.register("http://www.example.com/", datetime.datetime(2025, 1, 23))
+  for index in range(3):
+    page_sitemap.register_image("http://www.example.com/", "http://www.example.com/image{:d}.png".format(index))
+  with pytest.raises(ValueError):
+    page_sitemap.save_files()
+
+def test_page_sitemap_load ():
+  page_sitemap = PageSitemap(TEST_DIR.joinpath("sample.xml"), max_count=2)
+  page_sitemap.register_many(Page("http://www.example.com/{:02d}.html".format(index), datetime.datetime(2025, 1, 23), change_freq=ChangeFreq.WEEKLY, images=[Image("http://www.example.com/{:02d}.png".format(index), geo_location="geo location", license="license")]) for index in range(5))
+  sitemap_files = page_sitemap.save_files(use_indent=True)
+  assert len(sitemap_files) == 3
+  for lazy_load in (False, True):
+    loaded_page_sitemap = PageSitemap(TEST_DIR.joinpath("sample.xml"), lazy_load=lazy_load)
+    for sitemap_file in sitemap_files:
+      loaded_page_sitemap.load(sitemap_file.file)
+    assert loaded_page_sitemap.list_all() == page_sitemap.list_all()
+
+def test_page_sitemap_load2 ():
+
+  #通常のサイトマップと画像サイトマップも読み込むことができる。
+
+  sitemap = Sitemap(TEST_DIR.joinpath("sitemap.xml"))
+  sitemap.register("http://www.example.com/", datetime.datetime(2025, 1, 23))
+  sitemap.save_files()
+  page_sitemap = PageSitemap(TEST_DIR.joinpath("sample.xml"))
+  page_sitemap.load(TEST_DIR.joinpath("sitemap.xml"))
+  assert page_sitemap.list_all() == [Page("http://www.example.com/", datetime.datetime(2025, 1, 23), images=[])]
+  image_sitemap = ImageSitemap(TEST_DIR.joinpath("image-sitemap.xml"))
+  image_sitemap.register("http://www.example.com/", "http://www.example.com/top-image.png")
+  image_sitemap.save_files()
+  with pytest.raises(ValueError):
+    page_sitemap.load(TEST_DIR.joinpath("image-sitemap.xml"))
@@ -1,10 +1,19 @@
 
+import re
+import gzip
 import pytest
 import shutil
 import datetime
-from io import StringIO
+import threading
+from io import StringIO, BytesIO
 from pathlib import Path
-from sitemap.sitemap import ChangeFreq, Sitemap, URL
+from sitemap.sitemap import ChangeFreq, Sitemap, URL, Alternate, iterparse_urls
+from sitemap.diff import ChangeType
+from sitemap.metrics import MetricsRecorder
+from sitemap.sitemap_index import SitemapIndex
+from sitemap.image_sitemap import ImageSitemap
+from sitemap.auto_sitemap_index import AutoSitemapIndex
+from sitemap.host import Host
 
 TEST_DIR = Path("./.test")
 
@@ -106,6 +115,33 @@ def test_sitemap_save_with_indent ():
   </url>
 </urlset>"""
 
+def test_sitemap_register ():
+
+  #登録済みの URL を再度登録した場合は既存の情報が更新される。
+
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"))
+  sitemap.register("http://www.example.com/page.html", last_mod=datetime.datetime(2025, 1, 23))
+  sitemap.register("http://www.example.com/page2.html", last_mod=datetime.datetime(2025, 1, 23))
+  sitemap.register("http://www.example.com/page.html", last_mod=datetime.datetime(2025, 2, 1), priority=1.0, change_freq=ChangeFreq.DAILY)
+  assert sitemap.list_all() == [
+    URL("http://www.example.com/page.html", last_mod=datetime.datetime(2025, 2, 1), priority=1.0, change_freq=ChangeFreq.DAILY),
+    URL("http://www.example.com/page2.html", last_mod=datetime.datetime(2025, 1, 23)),
+  ]
+
+def test_sitemap_register_many ():
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"))
+  sitemap.register("http://www.example.com/page.html", last_mod=datetime.datetime(2025, 1, 1))
+  sitemap.register_many([
+    URL("http://www.example.com/page.html", last_mod=datetime.datetime(2025, 1, 23)),
+    URL("http://www.example.com/page2.html", last_mod=datetime.datetime(2025, 1, 23)),
+    URL("http://www.example.com/page3.html", last_mod=datetime.datetime(2025, 1, 23)),
+  ])
+  assert sitemap.list_all() == [
+    URL("http://www.example.com/page.html", last_mod=datetime.datetime(2025, 1, 23)),
+    URL("http://www.example.com/page2.html", last_mod=datetime.datetime(2025, 1, 23)),
+    URL("http://www.example.com/page3.html", last_mod=datetime.datetime(2025, 1, 23)),
+  ]
+
 def test_sitemap_get ():
   sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"))
   sitemap.register("http://www.example.com/page.html", last_mod=datetime.datetime(2025, 1, 23))
@@ -223,3 +259,389 @@ def test_sitemap_loads ():
     URL("http://www.example.com/", last_mod=datetime.datetime(2025, 1, 23)),
     URL("http://www.example.com/page.html", last_mod=datetime.datetime(2025, 1, 23)),
   ]
+
+def test_sitemap_metrics ():
+  metrics = MetricsRecorder()
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"), max_count=2, metrics=metrics)
+  sitemap.register_many([
+    URL("http://www.example.com/", datetime.datetime(2025, 1, 23)),
+    URL("http://www.example.com/page1.html", datetime.datetime(2025, 1, 23)),
+    URL("http://www.example.com/page2.html", datetime.datetime(2025, 1, 23)),
+  ])
+  sitemap.save_files()
+  #各段階の処理件数が報告される。
+  assert [(metric.phase, metric.rows) for metric in metrics.phases] == [
+    ("register_many", 3),
+    ("fetch", 3),
+    ("render", 3),
+    ("write", 3),
+    ("save_files", 3),
+  ]
+  #ファイルごとのバイト数と件数が報告される。
+  assert [(metric.file, metric.bytes, metric.entries) for metric in metrics.files] == [
+    (TEST_DIR.joinpath("sample.xml"), TEST_DIR.joinpath("sample.xml").stat().st_size, 2),
+    (TEST_DIR.joinpath("sample2.xml"), TEST_DIR.joinpath("sample2.xml").stat().st_size, 1),
+  ]
+  assert len(metrics.stores) == 1
+  assert 0 < metrics.stores[0].bytes
+
+def test_sitemap_metrics2 ():
+
+  #計測結果の報告先が未指定ならば何も報告されない。
+
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"))
+  sitemap.register("http://www.example.com/", datetime.datetime(2025, 1, 23))
+  assert [sitemap_file.file for sitemap_file in sitemap.save_files()] == [TEST_DIR.joinpath("sample.xml")]
+
+def test_sitemap_diff ():
+  old_sitemap = Sitemap(TEST_DIR.joinpath("old.xml"))
+  old_sitemap.register_many([
+    URL("http://www.example.com/", datetime.datetime(2025, 1, 23, 9)),
+    URL("http://www.example.com/page1.html", datetime.datetime(2025, 1, 23)),
+    URL("http://www.example.com/page2.html", datetime.datetime(2025, 1, 23)),
+  ])
+  new_sitemap = Sitemap(TEST_DIR.joinpath("new.xml"), max_count=1)
+  new_sitemap.register_many([
+    URL("http://www.example.com/", datetime.datetime(2025, 1, 23, 18)),
+    URL("http://www.example.com/page2.html", datetime.datetime(2025, 1, 24)),
+    URL("http://www.example.com/page3.html", datetime.datetime(2025, 1, 23), 0.8, ChangeFreq.DAILY),
+  ])
+  #更新日時は日付単位で比較されるため、時刻のみが異なる URL は差分に含まれない。
+  assert [(change.change_type, change.loc) for change in old_sitemap.diff(new_sitemap)] == [
+    (ChangeType.REMOVED, "http://www.example.com/page1.html"),
+    (ChangeType.MODIFIED, "http://www.example.com/page2.html"),
+    (ChangeType.ADDED, "http://www.example.com/page3.html"),
+  ]
+  #保存済みのファイルとの比較も同じ結果になる。
+  new_files = [sitemap_file.file for sitemap_file in new_sitemap.save_files()]
+  assert list(old_sitemap.diff(new_files)) == list(old_sitemap.diff(new_sitemap))
+  assert list(new_sitemap.diff(new_files)) == []
+  #保存済みのファイルを比較元とすることもできる。
+  old_files = [sitemap_file.file for sitemap_file in old_sitemap.save_files()]
+  assert list(Sitemap.diff_sources(old_files, new_sitemap)) == list(old_sitemap.diff(new_sitemap))
+  assert list(Sitemap.diff_sources(old_files, new_files)) == list(old_sitemap.diff(new_sitemap))
+  #優先度はファイルに記録される精度で比較される。
+  new_sitemap.register("http://www.example.com/page3.html", datetime.datetime(2025, 1, 23), 0.80001, ChangeFreq.DAILY)
+  assert list(new_sitemap.diff(new_files)) == []
+
+def test_sitemap_diff2 ():
+
+  #URL 順に整列されていないファイルが指定された場合は ValueError が送出される。
+
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"), max_count=1)
+  sitemap.register_many([
+    URL("http://www.example.com/", datetime.datetime(2025, 1, 23)),
+    URL("http://www.example.com/page.html", datetime.datetime(2025, 1, 23)),
+  ])
+  files = [sitemap_file.file for sitemap_file in sitemap.save_files()]
+  with pytest.raises(ValueError):
+    list(sitemap.diff(reversed(files)))
+
+def test_sitemap_sweep ():
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"))
+  sitemap.register_many([
+    URL("http://www.example.com/", datetime.datetime(2025, 1, 23)),
+    URL("http://www.example.com/page1.html", datetime.datetime(2025, 1, 23)),
+    URL("http://www.example.com/page2.html", datetime.datetime(2025, 1, 23)),
+  ])
+  assert sitemap.begin_generation() == 1
+  sitemap.register("http://www.example.com/", datetime.datetime(2025, 1, 24))
+  sitemap.touch_many(["http://www.example.com/page2.html"])
+  #新たな世代で登録も確認もされなかった URL のみが削除される。
+  assert sitemap.sweep() == 1
+  assert sitemap.list_all() == [
+    URL("http://www.example.com/", datetime.datetime(2025, 1, 24)),
+    URL("http://www.example.com/page2.html", datetime.datetime(2025, 1, 23)),
+  ]
+  #世代を開始しなければ何も削除されない。
+  assert sitemap.sweep() == 0
+
+def test_sitemap_changes_since ():
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"), track_changes=True)
+  sitemap.register_many([
+    URL("http://www.example.com/", datetime.datetime(2025, 1, 23)),
+    URL("http://www.example.com/page1.html", datetime.datetime(2025, 1, 23)),
+    URL("http://www.example.com/page2.html", datetime.datetime(2025, 1, 23)),
+  ])
+  checkpoint = sitemap.checkpoint
+  assert checkpoint == 3
+  #内容の変わらない再登録や touch は変更として記録されない。
+  sitemap.register("http://www.example.com/", datetime.datetime(2025, 1, 23))
+  sitemap.begin_generation()
+  sitemap.touch("http://www.example.com/")
+  sitemap.register("http://www.example.com/page1.html", datetime.datetime(2025, 1, 24))
+  sitemap.unregister("http://www.example.com/page2.html")
+  sitemap.register("http://www.example.com/page3.html", datetime.datetime(2025, 1, 24))
+  #変更を受け取る通知先の代わりに、受け取った URL を記録する。
+  received = []
+  for entry in sitemap.changes_since(checkpoint):
+    received.append((entry.loc, entry.url))
+    checkpoint = entry.sequence
+  assert received == [
+    ("http://www.example.com/page1.html", URL("http://www.example.com/page1.html", datetime.datetime(2025, 1, 24))),
+    ("http://www.example.com/page2.html", None),
+    ("http://www.example.com/page3.html", URL("http://www.example.com/page3.html", datetime.datetime(2025, 1, 24))),
+  ]
+  assert checkpoint == sitemap.checkpoint
+  #sweep による削除も変更として記録される。
+  sitemap.begin_generation()
+  sitemap.touch_many(["http://www.example.com/", "http://www.example.com/page1.html"])
+  sitemap.sweep()
+  assert [(entry.loc, entry.url) for entry in sitemap.changes_since(checkpoint)] == [
+    ("http://www.example.com/page3.html", None),
+  ]
+  #通知済みの変更を削除しても、変更の番号は減少しない。
+  checkpoint = sitemap.checkpoint
+  assert sitemap.prune_changes(checkpoint) == 4
+  assert sitemap.checkpoint == checkpoint
+  assert list(sitemap.changes_since()) == []
+  sitemap.clear()
+  assert [entry.loc for entry in sitemap.changes_since(checkpoint)] == ["http://www.example.com/", "http://www.example.com/page1.html"]
+
+def test_sitemap_changes_since2 ():
+  #track_changes を指定しなければ変更は記録されない。
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"))
+  version = sitemap.version
+  sitemap.register("http://www.example.com/", datetime.datetime(2025, 1, 23))
+  assert sitemap.version != version
+  with pytest.raises(ValueError):
+    sitemap.checkpoint
+  with pytest.raises(ValueError):
+    sitemap.changes_since()
+  with pytest.raises(ValueError):
+    sitemap.prune_changes(0)
+
+def test_sitemap_render_chunk ():
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"), max_count=1000)
+  sitemap.register_many(URL("http://www.example.com/{:05d}.html".format(index), datetime.datetime(2025, 1, 23)) for index in range(0, 20000, 2))
+  sitemap.render_chunk(0)
+  #索引の作成後に追加・削除された URL も各文書の区切りに反映される。
+  sitemap.register_many(URL("http://www.example.com/{:05d}.html".format(index), datetime.datetime(2025, 1, 24)) for index in range(1, 20000, 6))
+  for index in range(0, 20000, 10):
+    sitemap.unregister("http://www.example.com/{:05d}.html".format(index))
+  urls = sitemap.list_all()
+  assert sitemap.chunk_count() == (len(urls) + 999) // 1000
+  for index in range(sitemap.chunk_count()):
+    chunk = sitemap.render_chunk(index)
+    assert chunk.count == len(urls[index * 1000:(index +1) * 1000])
+    assert chunk.content.count(b"<url>") == chunk.count
+    assert "<loc>{:s}</loc>".format(urls[index * 1000].loc).encode("utf-8") in chunk.content
+  with pytest.raises(IndexError):
+    sitemap.render_chunk(sitemap.chunk_count())
+
+def test_sitemap_render_chunk2 ():
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"), max_count=1000)
+  sitemap.register_many(URL("http://www.example.com/{:05d}.html".format(index), datetime.datetime(2025, 1, 23)) for index in range(30000))
+  #文書の作成や保存は version を変更しない。
+  version = sitemap.version
+  sitemap.chunk_count()
+  sitemap.render_chunk(0)
+  sitemap.render_chunk(29)
+  sitemap.save_chunk(1)
+  assert sitemap.version == version
+
+def test_sitemap_render_chunk3 ():
+  class RacingSitemap (Sitemap):
+    def _chunk_start (self, index:int) -> str|None:
+      start_loc = super()._chunk_start(index)
+      thread = threading.Thread(target=self.register_many, args=([URL("http://www.example.com/00000.html", datetime.datetime(2025, 1, 23)), URL("http://www.example.com/02002.html", datetime.datetime(2025, 1, 23))],))
+      thread.start()
+      thread.join(0.1)
+      threads.append(thread)
+      return start_loc
+  threads = []
+  sitemap = RacingSitemap(TEST_DIR.joinpath("sample.xml"), max_count=1000)
+  sitemap.register_many(URL("http://www.example.com/{:05d}.html".format(index), datetime.datetime(2025, 1, 23)) for index in range(1, 6000, 2))
+  expected = b"".join("<loc>http://www.example.com/{:05d}.html</loc>".format(index).encode("utf-8") for index in range(2001, 4000, 2))
+  #文書の区切りを求めた後に別のスレッドから登録されても、文書は区切りと同じ時点の登録内容から作成される。
+  content = sitemap.render_chunk(1).content
+  for thread in threads:
+    thread.join()
+  assert b"".join(re.findall(rb"<loc>.*?</loc>", content)) == expected
+  assert sitemap.get("http://www.example.com/00000.html") is not None
+  assert sitemap.get("http://www.example.com/02002.html") is not None
+
+def test_sitemap_save_chunk ():
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"), max_count=1)
+  sitemap.register("http://www.example.com/", datetime.datetime(2025, 1, 23))
+  sitemap.register("http://www.example.com/page.html", datetime.datetime(2025, 1, 23))
+  sitemap.save_files()
+  expected = TEST_DIR.joinpath("sample2.xml").read_bytes()
+  TEST_DIR.joinpath("sample2.xml").unlink()
+  #任意の文書のみを保存できる。
+  assert sitemap.save_chunk(1).file == TEST_DIR.joinpath("sample2.xml")
+  assert TEST_DIR.joinpath("sample2.xml").read_bytes() == expected
+
+def test_sitemap_compact_files ():
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"), compact_files=True)
+  sitemap.register("http://www.example.com/", datetime.datetime(2025, 1, 23), 0.8, ChangeFreq.DAILY)
+  sitemap.register("http://www.example.com/page.html", datetime.datetime(2025, 1, 24))
+  sitemap_file, = sitemap.save_files()
+  content = TEST_DIR.joinpath("sample.xml").read_bytes()
+  #圧縮して保持されたページ情報から同一の内容を保存できる。
+  assert sitemap_file.last_mod == datetime.datetime(2025, 1, 24)
+  TEST_DIR.joinpath("sample.xml").unlink()
+  sitemap_file.save()
+  assert TEST_DIR.joinpath("sample.xml").read_bytes() == content
+
+def test_sitemap_load_files ():
+  source = Sitemap(TEST_DIR.joinpath("source.xml"), max_count=2)
+  source.register_many(URL("http://www.example.com/{:d}.html".format(index), datetime.datetime(2025, 1, 23), change_freq=ChangeFreq.DAILY) for index in range(5))
+  files = [sitemap_file.file for sitemap_file in source.save_files()]
+  #逐次的に読み込んでも、複数のプロセスで読み込んでも同じ結果になる。
+  for workers in (1, 2):
+    sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"))
+    sitemap.load_files(files, workers=workers)
+    assert sitemap.list_all() == source.list_all()
+
+def test_sitemap_load_from_index ():
+  host = Host("http", "www.example.com", TEST_DIR)
+  source = Sitemap(TEST_DIR.joinpath("sitemap.xml"), max_count=2)
+  source.register_many(URL("http://www.example.com/{:d}.html".format(index), datetime.datetime(2025, 1, 23)) for index in range(5))
+  auto_sitemap_index = AutoSitemapIndex(host, TEST_DIR.joinpath("sitemap-index.xml"), [source])
+  auto_sitemap_index.save_files()
+  sitemap_index = SitemapIndex(TEST_DIR.joinpath("sitemap-index.xml"))
+  with open(TEST_DIR.joinpath("sitemap-index.xml"), "r", encoding="utf-8") as stream:
+    sitemap_index.load(stream)
+  #サイトマップインデックスに登録された URL をファイルパスに変換して読み込む。
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"))
+  sitemap.load_from_index(sitemap_index, host, workers=1)
+  assert sitemap.list_all() == source.list_all()
+
+def test_sitemap_load_from_index2 ():
+
+  #画像サイトマップと共に入れ子で登録されたサイトマップインデックスからも、それぞれの種類のファイルのみを読み込む。
+
+  host = Host("http", "www.example.com", TEST_DIR)
+  source = Sitemap(TEST_DIR.joinpath("sitemap.xml"), max_count=2)
+  source.register_many(URL("http://www.example.com/{:d}.html".format(index), datetime.datetime(2025, 1, 23)) for index in range(5))
+  image_source = ImageSitemap(TEST_DIR.joinpath("image-sitemap.xml"))
+  image_source.register("http://www.example.com/0.html", "http://www.example.com/0.png")
+  auto_sitemap_index = AutoSitemapIndex(host, TEST_DIR.joinpath("sitemap-index.xml"), [source, image_source], nested=True, max_count=2)
+  auto_sitemap_index.save_files()
+  sitemap_index = SitemapIndex(TEST_DIR.joinpath("sitemap-index.xml"))
+  sitemap_index.load(TEST_DIR.joinpath("sitemap-index.xml"))
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"))
+  sitemap.load_from_index(sitemap_index, host, workers=1)
+  assert sitemap.list_all() == source.list_all()
+  image_sitemap = ImageSitemap(TEST_DIR.joinpath("image-sample.xml"))
+  image_sitemap.load_from_index(sitemap_index, host, workers=1)
+  assert image_sitemap.list_all() == image_source.list_all()
+
+def test_sitemap_load_gzip ():
+  source = """<?xml version='1.0' encoding='utf-8'?>
+<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\">
+  <url>
+    <loc>http://www.example.com/</loc>
+    <lastmod>2025-01-23</lastmod>
+  </url>
+</urlset>
+"""
+  expected = [URL("http://www.example.com/", last_mod=datetime.datetime(2025, 1, 23))]
+  TEST_DIR.joinpath("sample.xml.gz").write_bytes(gzip.compress(source.encode("utf-8")))
+  #gzip で圧縮されたファイル・バイト列、およびバイナリの file-like オブジェクトを読み込める。
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"))
+  sitemap.load(TEST_DIR.joinpath("sample.xml.gz"))
+  assert sitemap.list_all() == expected
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"))
+  sitemap.loads(gzip.compress(source.encode("utf-8")))
+  assert sitemap.list_all() == expected
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"))
+  with BytesIO(source.encode("utf-8")) as stream:
+    sitemap.load(stream)
+  assert sitemap.list_all() == expected
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"))
+  sitemap.load_files([TEST_DIR.joinpath("sample.xml.gz")], workers=1)
+  assert sitemap.list_all() == expected
+  assert list(iterparse_urls(TEST_DIR.joinpath("sample.xml.gz"))) == expected
+
+def test_sitemap_lazy_load ():
+  source = Sitemap(TEST_DIR.joinpath("source.xml"))
+  source.register_many(URL("http://www.example.com/{:d}.html".format(index), datetime.datetime(2025, 1, 23), change_freq=ChangeFreq.DAILY) for index in range(5))
+  source_file, = source.save_files()
+  #逐次的に検証しながら読み込んでも同じ結果になる。
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"), lazy_load=True)
+  sitemap.load(source_file.file)
+  assert sitemap.list_all() == source.list_all()
+  #スキーマに違反する内容は読み込めない。
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"), lazy_load=True)
+  with pytest.raises(Exception):
+    sitemap.loads("""<?xml version='1.0' encoding='utf-8'?>
+<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\">
+  <url>
+    <loc>http://www.example.com/</loc>
+    <lastmod>2025-01-23</lastmod>
+    <unknown/>
+  </url>
+</urlset>
+""")
+  with pytest.raises(Exception):
+    sitemap.loads("""<?xml version='1.0' encoding='utf-8'?>
+<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\">
+</urlset>
+""")
+
+def test_sitemap_load_parallel ():
+  source = Sitemap(TEST_DIR.joinpath("source.xml"))
+  source.register_many(URL("http://www.example.com/{:d}.html".format(index), datetime.datetime(2025, 1, 23), change_freq=ChangeFreq.DAILY) for index in range(100))
+  source_file, = source.save_files(use_indent=True)
+  #ファイルを分割して読み込んでも、逐次的に読み込んだ場合と同じ結果になる。
+  for workers in (1, 2):
+    sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"))
+    sitemap.load_parallel(source_file.file, workers=workers)
+    assert sitemap.list_all() == source.list_all()
+  #gzip で圧縮されたファイルは分割せずに読み込む。
+  TEST_DIR.joinpath("source.xml.gz").write_bytes(gzip.compress(source_file.file.read_bytes()))
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"))
+  sitemap.load_parallel(TEST_DIR.joinpath("source.xml.gz"), workers=2)
+  assert sitemap.list_all() == source.list_all()
+
+def test_sitemap_alternates ():
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"))
+  sitemap.register("http://www.example.com/en/", datetime.datetime(2025, 1, 23))
+  sitemap.register("http://www.example.com/ja/", datetime.datetime(2025, 1, 23))
+  sitemap.register("http://www.example.com/page.html", datetime.datetime(2025, 1, 23))
+  sitemap.register_alternates([Alternate("en", "http://www.example.com/en/"), Alternate("ja", "http://www.example.com/ja/"), Alternate("x-default", "http://www.example.com/en/")])
+  assert sitemap.get_alternates("http://www.example.com/ja/") == [Alternate("en", "http://www.example.com/en/"), Alternate("ja", "http://www.example.com/ja/"), Alternate("x-default", "http://www.example.com/en/")]
+  assert sitemap.get_alternates("http://www.example.com/page.html") == []
+  sitemap_files = sitemap.save_files()
+  links = "<xhtml:link rel=\"alternate\" hreflang=\"en\" href=\"http://www.example.com/en/\" /><xhtml:link rel=\"alternate\" hreflang=\"ja\" href=\"http://www.example.com/ja/\" /><xhtml:link rel=\"alternate\" hreflang=\"x-default\" href=\"http://www.example.com/en/\" />"
+  content = "<?xml version='1.0' encoding='utf-8'?>\n<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\" xmlns:xhtml=\"http://www.w3.org/1999/xhtml\"><url><loc>http://www.example.com/en/</loc><lastmod>2025-01-23</lastmod>{links:s}</url><url><loc>http://www.example.com/ja/</loc><lastmod>2025-01-23</lastmod>{links:s}</url><url><loc>http://www.example.com/page.html</loc><lastmod>2025-01-23</lastmod></url></urlset>".format(links=links)
+  with open(TEST_DIR.joinpath("sample.xml"), "r") as file:
+    assert file.read() == content
+  #render_chunk, save_chunk, SitemapFile.save も同一の内容を作成する。
+  assert sitemap.render_chunk(0).content == content.encode("utf-8")
+  sitemap_files[0].save()
+  with open(TEST_DIR.joinpath("sample.xml"), "r") as file:
+    assert file.read() == content
+  #保存したファイルから集合を読み込むことができる。
+  for lazy_load in (False, True):
+    loaded_sitemap = Sitemap(TEST_DIR.joinpath("sample2.xml"), lazy_load=lazy_load)
+    loaded_sitemap.load(TEST_DIR.joinpath("sample.xml"))
+    assert loaded_sitemap.get_alternates("http://www.example.com/en/") == sitemap.get_alternates("http://www.example.com/en/")
+    loaded_sitemap.save_files()
+    with open(TEST_DIR.joinpath("sample2.xml"), "r") as file:
+      assert file.read() == content
+
+def test_sitemap_alternates2 ():
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"), track_changes=True)
+  sitemap.register("http://www.example.com/en/", datetime.datetime(2025, 1, 23))
+  sitemap.register_alternates([Alternate("en", "http://www.example.com/en/"), Alternate("ja", "http://www.example.com/ja/")])
+  #同一のページを含む集合を登録すると、以前の集合は置き換えられる。
+  checkpoint = sitemap.checkpoint
+  sitemap.register_alternates([Alternate("en", "http://www.example.com/en/"), Alternate("fr", "http://www.example.com/fr/")])
+  assert sitemap.get_alternates("http://www.example.com/ja/") == []
+  assert sitemap.get_alternates("http://www.example.com/en/") == [Alternate("en", "http://www.example.com/en/"), Alternate("fr", "http://www.example.com/fr/")]
+  #登録済みのページの集合の変更は、変更として記録される。
+  assert [entry.loc for entry in sitemap.changes_since(checkpoint)] == ["http://www.example.com/en/"]
+  #内容の変わらない再登録は変更とは見なされない。
+  checkpoint = sitemap.checkpoint
+  sitemap.register_alternates([Alternate("en", "http://www.example.com/en/"), Alternate("fr", "http://www.example.com/fr/")])
+  assert list(sitemap.changes_since(checkpoint)) == []
+  with pytest.raises(ValueError):
+    sitemap.register_alternates([Alternate("en", "http://www.example.com/en/"), Alternate("en", "http://www.example.com/fr/")])
+  sitemap.unregister_alternates("http://www.example.com/fr/")
+  assert sitemap.get_alternates("http://www.example.com/en/") == []
+  sitemap.save_files()
+  with open(TEST_DIR.joinpath("sample.xml"), "r") as file:
+    assert file.read() == "<?xml version='1.0' encoding='utf-8'?>\n<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\"><url><loc>http://www.example.com/en/</loc><lastmod>2025-01-23</lastmod></url></urlset>"
@@ -2,6 +2,7 @@
 import pytest
 import shutil
 import datetime
+import hashlib
 from pathlib import Path
 from sitemap.sitemap import ChangeFreq, SitemapFile
 
@@ -99,3 +100,33 @@ def test_sitemap_file_with_indent ():
     <changefreq>never</changefreq>
   </url>
 </urlset>"""
+
+def test_sitemap_file_digest ():
+  sitemap_file = SitemapFile(TEST_DIR.joinpath("sample.xml"), [
+    ("http://www.example.com/page.html", datetime.datetime(2025, 1, 23), 0.5, ChangeFreq.NONE),
+    ("http://www.example.com/page2.html", datetime.datetime(2025, 2, 1), 0.5, ChangeFreq.NONE),
+  ])
+  assert sitemap_file.digest is None
+  assert sitemap_file.last_mod == datetime.datetime(2025, 2, 1)
+  sitemap_file.save()
+  with open(TEST_DIR.joinpath("sample.xml"), "rb") as file:
+    assert sitemap_file.digest == hashlib.sha256(file.read()).hexdigest()
+
+def test_sitemap_file_unchanged (monkeypatch):
+  urls = [("http://www.example.com/page{:d}.html".format(index), datetime.datetime(2025, 1, 23), 0.5, ChangeFreq.NONE) for index in range(3)]
+  SitemapFile(TEST_DIR.joinpath("sample.xml"), urls).save()
+  #内容に変化がなければ、一時ファイルを含めて何も書き込まれない。
+  opened = []
+  def recording_open (file, mode="r", *args, **kwargs):
+    opened.append((Path(file).name, mode))
+    return open(file, mode, *args, **kwargs)
+  monkeypatch.setattr("sitemap.writer.open", recording_open, raising=False)
+  SitemapFile(TEST_DIR.joinpath("sample.xml"), urls).save()
+  assert opened == [("sample.xml", "rb")]
+  #内容が途中で異なる場合、長い場合、短い場合のいずれも正しく置き換えられる。
+  for changed_urls in (urls[:1] + urls[2:], urls + urls[:1], urls[:2], []):
+    SitemapFile(TEST_DIR.joinpath("expected.xml"), changed_urls).save()
+    SitemapFile(TEST_DIR.joinpath("sample.xml"), changed_urls).save()
+    with open(TEST_DIR.joinpath("sample.xml"), "rb") as file, open(TEST_DIR.joinpath("expected.xml"), "rb") as expected_file:
+      assert file.read() == expected_file.read()
+    assert not TEST_DIR.joinpath("sample.xml.tmp").exists()
@@ -1,4 +1,5 @@
 
+import gzip
 import pytest
 import shutil
 import datetime
@@ -55,6 +56,40 @@ def test_sitemap_index_with_indent ():
   </sitemap>
 </sitemapindex>"""
 
+def test_sitemap_index_split ():
+
+  #登録数が max_count を越えた場合は複数のファイルに分割される。
+
+  sitemap_index = SitemapIndex(TEST_DIR.joinpath("sample.xml"), max_count=2)
+  sitemap_index.register("http://www.example.com/sitemap.xml", last_mod=datetime.datetime(2025, 1, 23))
+  sitemap_index.register("http://www.example.com/sitemap2.xml", last_mod=datetime.datetime(2025, 1, 23))
+  sitemap_index.register("http://www.example.com/sitemap3.xml", last_mod=datetime.datetime(2025, 1, 23))
+  assert [sitemap_file.file for sitemap_file in sitemap_index.save_files()] == [
+    TEST_DIR.joinpath("sample.xml"),
+    TEST_DIR.joinpath("sample2.xml"),
+  ]
+  with open(TEST_DIR.joinpath("sample.xml"), "r") as file:
+    assert file.read() == "<?xml version='1.0' encoding='utf-8'?>\n<sitemapindex xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\"><sitemap><loc>http://www.example.com/sitemap.xml</loc><lastmod>2025-01-23</lastmod></sitemap><sitemap><loc>http://www.example.com/sitemap2.xml</loc><lastmod>2025-01-23</lastmod></sitemap></sitemapindex>"
+  with open(TEST_DIR.joinpath("sample2.xml"), "r") as file:
+    assert file.read() == "<?xml version='1.0' encoding='utf-8'?>\n<sitemapindex xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\"><sitemap><loc>http://www.example.com/sitemap3.xml</loc><lastmod>2025-01-23</lastmod></sitemap></sitemapindex>"
+
+def test_sitemap_index_split2 ():
+
+  #ファイルの大きさが max_bytes を越える場合は複数のファイルに分割される。
+
+  content = "<?xml version='1.0' encoding='utf-8'?>\n<sitemapindex xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\"><sitemap><loc>http://www.example.com/sitemap.xml</loc><lastmod>2025-01-23</lastmod></sitemap></sitemapindex>"
+  sitemap_index = SitemapIndex(TEST_DIR.joinpath("sample.xml"), max_bytes=len(content.encode("utf-8")))
+  sitemap_index.register("http://www.example.com/sitemap.xml", last_mod=datetime.datetime(2025, 1, 23))
+  sitemap_index.register("http://www.example.com/sitemap2.xml", last_mod=datetime.datetime(2025, 1, 23))
+  sitemap_index.register("http://www.example.com/sitemap3.xml", last_mod=datetime.datetime(2025, 1, 23))
+  assert [sitemap_file.file for sitemap_file in sitemap_index.save_files()] == [
+    TEST_DIR.joinpath("sample.xml"),
+    TEST_DIR.joinpath("sample2.xml"),
+    TEST_DIR.joinpath("sample3.xml"),
+  ]
+  with open(TEST_DIR.joinpath("sample.xml"), "r") as file:
+    assert file.read() == content
+
 def test_sitemap_index_get ():
   sitemap_index = SitemapIndex(TEST_DIR.joinpath("sample.xml"))
   sitemap_index.register("http://www.example.com/sitemap.xml", last_mod=datetime.datetime(2025, 1, 23))
@@ -120,6 +155,20 @@ def test_sitemap_index_list_all ():
     Sitemap("http://www.example.com/sitemap3.xml", last_mod=datetime.datetime(2025, 1, 23)),
   ]
 
+def test_sitemap_index_register_many ():
+  sitemap_index = SitemapIndex(TEST_DIR.joinpath("sample.xml"))
+  sitemap_index.register("http://www.example.com/sitemap.xml", last_mod=datetime.datetime(2025, 1, 1))
+  sitemap_index.register_many([
+    ("http://www.example.com/sitemap.xml", datetime.datetime(2025, 1, 23)),
+    ("http://www.example.com/sitemap2.xml", datetime.datetime(2025, 1, 23)),
+    ("http://www.example.com/sitemap3.xml", datetime.datetime(2025, 1, 23)),
+  ])
+  assert sitemap_index.list_all() == [
+    Sitemap("http://www.example.com/sitemap.xml", last_mod=datetime.datetime(2025, 1, 23)),
+    Sitemap("http://www.example.com/sitemap2.xml", last_mod=datetime.datetime(2025, 1, 23)),
+    Sitemap("http://www.example.com/sitemap3.xml", last_mod=datetime.datetime(2025, 1, 23)),
+  ]
+
 def test_sitemap_index_load ():
   sitemap_index = SitemapIndex(TEST_DIR.joinpath("sample.xml"))
   with StringIO("""<?xml version='1.0' encoding='utf-8'?>
@@ -168,3 +217,28 @@ def test_sitemap_index_loads ():
     Sitemap("http://www.example.com/sitemap2.xml", last_mod=datetime.datetime(2025, 1, 23)),
     Sitemap("http://www.example.com/sitemap3.xml", last_mod=datetime.datetime(2025, 1, 23)),
   ]
+
+def test_sitemap_index_loads_gzip ():
+  sitemap_index = SitemapIndex(TEST_DIR.joinpath("sample.xml"))
+  #gzip で圧縮されたバイト列を読み込める。
+  sitemap_index.loads(gzip.compress("""<?xml version='1.0' encoding='utf-8'?>
+<sitemapindex xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\">
+  <sitemap>
+    <loc>http://www.example.com/sitemap.xml</loc>
+    <lastmod>2025-01-23</lastmod>
+  </sitemap>
+</sitemapindex>
+""".encode("utf-8")))
+  assert sitemap_index.list_all() == [
+    Sitemap("http://www.example.com/sitemap.xml", last_mod=datetime.datetime(2025, 1, 23)),
+  ]
+
+def test_sitemap_index_lazy_load ():
+  source = SitemapIndex(TEST_DIR.joinpath("source.xml"))
+  source.register("http://www.example.com/sitemap.xml", datetime.datetime(2025, 1, 23))
+  source.register("http://www.example.com/sitemap2.xml", datetime.datetime(2025, 1, 24))
+  source_file, = source.save_files()
+  #逐次的に検証しながら読み込んでも同じ結果になる。
+  sitemap_index = SitemapIndex(TEST_DIR.joinpath("sample.xml"), lazy_load=True)
+  sitemap_index.load(source_file.file)
+  assert sitemap_index.list_all() == source.list_all()
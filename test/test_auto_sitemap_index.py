@@ -3,7 +3,7 @@ import pytest
 import shutil
 import datetime
 from pathlib import Path
-from sitemap import Sitemap, ImageSitemap, SitemapIndex, Host, AutoSitemapIndex
+from sitemap import Sitemap, ImageSitemap, SitemapIndex, Host, AutoSitemapIndex, MetricsRecorder
 
 TEST_DIR = Path("./.test")
 
@@ -32,7 +32,7 @@ def test_auto_sitemap_index ():
   with open(TEST_DIR.joinpath("image-sitemap.xml"), "r") as file:
     assert file.read() == "<?xml version='1.0' encoding='utf-8'?>\n<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\" xmlns:image=\"http://www.google.com/schemas/sitemap-image/1.1\"><url><loc>http://www.example.com/</loc><image:image><image:loc>http://www.example.com/top-image.png</image:loc></image:image></url></urlset>"
   with open(TEST_DIR.joinpath("sitemap-index.xml"), "r") as file:
-    assert file.read() == "<?xml version='1.0' encoding='utf-8'?>\n<sitemapindex xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\"><sitemap><loc>http://www.example.com/image-sitemap.xml</loc><lastmod>{today:s}</lastmod></sitemap><sitemap><loc>http://www.example.com/sitemap.xml</loc><lastmod>{today:s}</lastmod></sitemap></sitemapindex>".format(today=datetime.date.today().isoformat())
+    assert file.read() == "<?xml version='1.0' encoding='utf-8'?>\n<sitemapindex xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\"><sitemap><loc>http://www.example.com/image-sitemap.xml</loc><lastmod>{today:s}</lastmod></sitemap><sitemap><loc>http://www.example.com/sitemap.xml</loc><lastmod>2025-01-23</lastmod></sitemap></sitemapindex>".format(today=datetime.date.today().isoformat())
 
 def test_auto_sitemap_index2 ():
 
@@ -83,7 +83,7 @@ def test_auto_sitemap_index_with_indent ():
   </sitemap>
   <sitemap>
     <loc>http://www.example.com/sitemap.xml</loc>
-    <lastmod>{today:s}</lastmod>
+    <lastmod>2025-01-23</lastmod>
   </sitemap>
 </sitemapindex>""".format(today=datetime.date.today().isoformat())
 
@@ -113,3 +113,82 @@ def test_auto_sitemap_index3 ():
     <lastmod>2025-01-23</lastmod>
   </sitemap>
 </sitemapindex>"""
+
+def test_auto_sitemap_index_nested ():
+
+  #nested 属性を指定した場合はサイトマップインデックスが入れ子の構成で保存される。
+
+  host = Host("http", "www.example.com", TEST_DIR)
+  sitemap = Sitemap(TEST_DIR.joinpath("sitemap.xml"), max_count=1)
+  sitemap.register("http://www.example.com/", last_mod=datetime.datetime(2025, 1, 23))
+  sitemap.register("http://www.example.com/page.html", last_mod=datetime.datetime(2025, 1, 23))
+  sitemap.register("http://www.example.com/page2.html", last_mod=datetime.datetime(2025, 1, 23))
+  auto_sitemap_index = AutoSitemapIndex(host, TEST_DIR.joinpath("sitemap-index.xml"), [sitemap], nested=True, max_count=2)
+  assert [sitemap_file.file for sitemap_file in auto_sitemap_index.save_files()] == [
+    TEST_DIR.joinpath("sitemap.xml"),
+    TEST_DIR.joinpath("sitemap2.xml"),
+    TEST_DIR.joinpath("sitemap3.xml"),
+    TEST_DIR.joinpath("sitemap-index-part.xml"),
+    TEST_DIR.joinpath("sitemap-index-part2.xml"),
+    TEST_DIR.joinpath("sitemap-index.xml"),
+  ]
+  with open(TEST_DIR.joinpath("sitemap-index-part.xml"), "r") as file:
+    assert file.read() == "<?xml version='1.0' encoding='utf-8'?>\n<sitemapindex xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\"><sitemap><loc>http://www.example.com/sitemap.xml</loc><lastmod>2025-01-23</lastmod></sitemap><sitemap><loc>http://www.example.com/sitemap2.xml</loc><lastmod>2025-01-23</lastmod></sitemap></sitemapindex>"
+  with open(TEST_DIR.joinpath("sitemap-index-part2.xml"), "r") as file:
+    assert file.read() == "<?xml version='1.0' encoding='utf-8'?>\n<sitemapindex xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\"><sitemap><loc>http://www.example.com/sitemap3.xml</loc><lastmod>2025-01-23</lastmod></sitemap></sitemapindex>"
+  with open(TEST_DIR.joinpath("sitemap-index.xml"), "r") as file:
+    assert file.read() == "<?xml version='1.0' encoding='utf-8'?>\n<sitemapindex xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\"><sitemap><loc>http://www.example.com/sitemap-index-part.xml</loc><lastmod>2025-01-23</lastmod></sitemap><sitemap><loc>http://www.example.com/sitemap-index-part2.xml</loc><lastmod>2025-01-23</lastmod></sitemap></sitemapindex>"
+
+def test_auto_sitemap_index_workers ():
+
+  #workers 属性の値に関わらず同じ順序で結果が返される。
+
+  host = Host("http", "www.example.com", TEST_DIR)
+  sitemaps = []
+  for index in range(8):
+    sitemap = Sitemap(TEST_DIR.joinpath("sitemap-{:d}.xml".format(index)))
+    sitemap.register("http://www.example.com/{:d}.html".format(index), last_mod=datetime.datetime(2025, 1, 23))
+    sitemaps.append(sitemap)
+  for workers in (1, 4):
+    auto_sitemap_index = AutoSitemapIndex(host, TEST_DIR.joinpath("sitemap-index.xml"), sitemaps, workers=workers)
+    assert [sitemap_file.file for sitemap_file in auto_sitemap_index.save_files()] == [TEST_DIR.joinpath("sitemap-{:d}.xml".format(index)) for index in range(8)] + [TEST_DIR.joinpath("sitemap-index.xml")]
+
+def test_auto_sitemap_index_unchanged ():
+
+  #内容に変化のないファイルは再度書き込まれない。
+
+  host = Host("http", "www.example.com", TEST_DIR)
+  sitemap = Sitemap(TEST_DIR.joinpath("sitemap.xml"))
+  sitemap.register("http://www.example.com/", last_mod=datetime.datetime(2025, 1, 23))
+  auto_sitemap_index = AutoSitemapIndex(host, TEST_DIR.joinpath("sitemap-index.xml"), [sitemap])
+  sitemap_files = auto_sitemap_index.save_files()
+  stat = TEST_DIR.joinpath("sitemap.xml").stat()
+  assert [sitemap_file.digest for sitemap_file in auto_sitemap_index.save_files()] == [sitemap_file.digest for sitemap_file in sitemap_files]
+  assert TEST_DIR.joinpath("sitemap.xml").stat().st_mtime_ns == stat.st_mtime_ns
+  assert TEST_DIR.joinpath("sitemap.xml").stat().st_ino == stat.st_ino
+  sitemap.register("http://www.example.com/page.html", last_mod=datetime.datetime(2025, 2, 1))
+  sitemap_files2 = auto_sitemap_index.save_files()
+  assert sitemap_files2[0].digest != sitemap_files[0].digest
+  assert sitemap_files2[0].last_mod == datetime.datetime(2025, 2, 1)
+  with open(TEST_DIR.joinpath("sitemap-index.xml"), "r") as file:
+    assert file.read() == "<?xml version='1.0' encoding='utf-8'?>\n<sitemapindex xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\"><sitemap><loc>http://www.example.com/sitemap.xml</loc><lastmod>2025-02-01</lastmod></sitemap></sitemapindex>"
+
+def test_auto_sitemap_index_metrics ():
+  metrics = MetricsRecorder()
+  host = Host("http", "www.example.com", TEST_DIR)
+  sitemap = Sitemap(TEST_DIR.joinpath("sitemap.xml"))
+  sitemap.register("http://www.example.com/", last_mod=datetime.datetime(2025, 1, 23))
+  auto_sitemap_index = AutoSitemapIndex(host, TEST_DIR.joinpath("sitemap-index.xml"), [sitemap], metrics=metrics)
+  auto_sitemap_index.save_files()
+  #AutoSitemapIndex 自体の各段階と、サイトマップインデックスの保存に関する計測結果が報告される。
+  assert [metric.phase for metric in metrics.phases if metric.source == TEST_DIR.joinpath("sitemap-index.xml")] == [
+    "save_sitemaps",
+    "register_many",
+    "register_files",
+    "fetch",
+    "render",
+    "write",
+    "save_files",
+    "save_files",
+  ]
+  assert [metric.file for metric in metrics.files] == [TEST_DIR.joinpath("sitemap-index.xml")]
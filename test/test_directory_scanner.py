@@ -0,0 +1,58 @@
+import pytest
+import os
+import shutil
+import datetime
+from pathlib import Path
+from sitemap import Sitemap, Host, DirectoryScanner
+from sitemap.sitemap import URL
+
+TEST_DIR = Path("./.test")
+
+def setup_function (function):
+  TEST_DIR.mkdir(parents=True, exist_ok=True)
+  for name in ["index.html", "style.css", "blog/page.html", "blog/2025/page2.html", "drafts/page3.html"]:
+    file = TEST_DIR.joinpath(name)
+    file.parent.mkdir(parents=True, exist_ok=True)
+    file.touch()
+    timestamp = datetime.datetime(2025, 1, 23).timestamp()
+    os.utime(file, (timestamp, timestamp))
+
+def teardown_function (function):
+  shutil.rmtree(TEST_DIR)
+
+#main
+
+def test_directory_scanner ():
+  host = Host("http", "www.example.com", TEST_DIR)
+  scanner = DirectoryScanner(host, includes=["*.html"], excludes=["drafts"])
+  assert sorted(scanner.scan()) == [
+    URL("http://www.example.com/blog/2025/page2.html", last_mod=datetime.datetime(2025, 1, 23)),
+    URL("http://www.example.com/blog/page.html", last_mod=datetime.datetime(2025, 1, 23)),
+    URL("http://www.example.com/index.html", last_mod=datetime.datetime(2025, 1, 23)),
+  ]
+
+def test_directory_scanner_workers ():
+
+  #workers を指定した場合も同じページ情報が列挙される。
+
+  host = Host("http", "www.example.com", TEST_DIR)
+  scanner = DirectoryScanner(host, excludes=["blog/2025"])
+  parallel_scanner = DirectoryScanner(host, excludes=["blog/2025"], workers=4)
+  assert sorted(parallel_scanner.scan()) == sorted(scanner.scan())
+  assert [url.loc for url in sorted(scanner.scan())] == [
+    "http://www.example.com/blog/page.html",
+    "http://www.example.com/drafts/page3.html",
+    "http://www.example.com/index.html",
+    "http://www.example.com/style.css",
+  ]
+
+def test_directory_scanner_register_to ():
+  host = Host("http", "www.example.com", TEST_DIR)
+  scanner = DirectoryScanner(host, includes=["*.html"], excludes=["drafts"])
+  sitemap = Sitemap(TEST_DIR.joinpath("sitemap.xml"))
+  scanner.register_to(sitemap)
+  assert sitemap.list_all() == [
+    URL("http://www.example.com/blog/2025/page2.html", last_mod=datetime.datetime(2025, 1, 23)),
+    URL("http://www.example.com/blog/page.html", last_mod=datetime.datetime(2025, 1, 23)),
+    URL("http://www.example.com/index.html", last_mod=datetime.datetime(2025, 1, 23)),
+  ]
@@ -0,0 +1,81 @@
+import pytest
+import shutil
+import datetime
+from pathlib import Path
+from typing import NamedTuple
+from sitemap import Extension, ExtensionSitemap
+
+TEST_DIR = Path("./.test")
+
+def setup_function (function):
+  TEST_DIR.mkdir(parents=True, exist_ok=True)
+
+def teardown_function (function):
+  shutil.rmtree(TEST_DIR)
+
+class Article (NamedTuple):
+  name:str
+  language:str|None = None
+  published:datetime.datetime|None = None
+  score:float|None = None
+  featured:bool|None = None
+
+class ArticleSitemap (ExtensionSitemap[Article]):
+  EXTENSION = Extension(Article, "article", "http://www.example.com/schemas/article", tag="entry", paths={"name": "publication/name", "language": "publication/language"}, key="name")
+
+#main
+
+def test_extension ():
+  fields = ArticleSitemap.EXTENSION.fields
+  assert [(field.name, field.path, field.type, field.required) for field in fields] == [
+    ("name", ("publication", "name"), str, True),
+    ("language", ("publication", "language"), str, False),
+    ("published", ("published",), datetime.datetime, False),
+    ("score", ("score",), float, False),
+    ("featured", ("featured",), bool, False),
+  ]
+
+def test_extension2 ():
+
+  #対応していない型や、存在しない属性名は指定できない。
+
+  class Invalid (NamedTuple):
+    value:list[str]
+  with pytest.raises(TypeError):
+    Extension(Invalid, "invalid", "http://www.example.com/schemas/invalid")
+  with pytest.raises(ValueError):
+    Extension(Article, "article", "http://www.example.com/schemas/article", key="missing")
+
+def test_extension_sitemap ():
+  article_sitemap = ArticleSitemap(TEST_DIR.joinpath("sample.xml"))
+  article_sitemap.register_many([
+    ("http://www.example.com/", Article("<name>", "en", datetime.datetime(2025, 1, 23), 0.5, True)),
+    ("http://www.example.com/", Article("name2")),
+  ])
+  assert article_sitemap.get("http://www.example.com/") == [Article("<name>", "en", datetime.datetime(2025, 1, 23), 0.5, True), Article("name2")]
+  article_sitemap.save_files(use_indent=True)
+  #値が一つも無い要素は書き込まれない。
+  with open(TEST_DIR.joinpath("sample.xml"), "r") as file:
+    assert file.read() == """<?xml version='1.0' encoding='utf-8'?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" xmlns:article="http://www.example.com/schemas/article">
+  <url>
+    <loc>http://www.example.com/</loc>
+    <article:entry>
+      <article:publication>
+        <article:name>&lt;name&gt;</article:name>
+        <article:language>en</article:language>
+      </article:publication>
+      <article:published>2025-01-23T00:00:00</article:published>
+      <article:score>0.5</article:score>
+      <article:featured>yes</article:featured>
+    </article:entry>
+    <article:entry>
+      <article:publication>
+        <article:name>name2</article:name>
+      </article:publication>
+    </article:entry>
+  </url>
+</urlset>"""
+  #XML スキーマが指定されていない拡張は読み込めない。
+  with pytest.raises(ValueError):
+    article_sitemap.load(TEST_DIR.joinpath("sample.xml"))
@@ -0,0 +1,46 @@
+import pytest
+from sitemap import FrontCodedStrings
+
+#main
+
+def test_front_coded_strings ():
+  strings = sorted("http://www.example.com/{:s}/{:d}.html".format(category, index) for category in ("news", "products", "日本語") for index in range(50))
+  front_coded_strings = FrontCodedStrings(strings, block_size=4)
+  assert len(front_coded_strings) == len(strings)
+  assert list(front_coded_strings) == strings
+  assert [front_coded_strings[index] for index in range(len(strings))] == strings
+  assert front_coded_strings[-1] == strings[-1]
+  #各文字列の位置は二分探索で求められる。
+  for index, string in enumerate(strings):
+    assert front_coded_strings.index(string) == index
+  assert "http://www.example.com/news/50.html" not in front_coded_strings
+  assert "http://www.example.com/" not in front_coded_strings
+  assert "http://www.example.com/zzz" not in front_coded_strings
+  assert front_coded_strings.nbytes < sum(len(string.encode("utf-8")) for string in strings)
+
+def test_front_coded_strings2 ():
+
+  #空の集合も扱える。
+
+  front_coded_strings = FrontCodedStrings([])
+  assert len(front_coded_strings) == 0
+  assert list(front_coded_strings) == []
+  assert "http://www.example.com/" not in front_coded_strings
+  with pytest.raises(IndexError):
+    front_coded_strings[0]
+
+def test_front_coded_strings3 ():
+
+  #整列されていない集合は ValueError を送出する。
+
+  with pytest.raises(ValueError):
+    FrontCodedStrings(["http://www.example.com/page.html", "http://www.example.com/"])
+  with pytest.raises(ValueError):
+    FrontCodedStrings(["http://www.example.com/", "http://www.example.com/"])
+
+def test_front_coded_strings4 ():
+
+  #255 バイト以上の文字列も扱える。
+
+  strings = ["http://www.example.com/" + "a" * 300, "http://www.example.com/" + "a" * 300 + "b" * 300]
+  assert list(FrontCodedStrings(strings)) == strings
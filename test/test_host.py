@@ -1,7 +1,7 @@
 
 import pytest
 from pathlib import Path
-from sitemap import Host
+from sitemap import Host, HostRegistry
 
 def test_host ():
   host = Host("http", "www.example.com", "./")
@@ -11,3 +11,93 @@ def test_host ():
   assert host.path_to_url("./", params="", query="a=b&c=d", fragment="e") == "http://www.example.com/?a=b&c=d#e"
   assert host.path_to_url("./sample", params="", query="a=b&c=d", fragment="e", is_dir=False) == "http://www.example.com/sample?a=b&c=d#e"
   assert host.path_to_url("./sample", params="", query="a=b&c=d", fragment="e", is_dir=True) == "http://www.example.com/sample/?a=b&c=d#e"
+
+def test_host_without_filesystem ():
+
+  #use_filesystem が偽であればファイルシステムにアクセスせずに URL を作成する。
+
+  host = Host("http", "www.example.com", "./", use_filesystem=False)
+  assert host.path_to_url("./") == "http://www.example.com/"
+  assert host.path_to_url("./sample") == "http://www.example.com/sample"
+  assert host.path_to_url("./sample/") == "http://www.example.com/sample/"
+  assert host.path_to_url("./sample", is_dir=True) == "http://www.example.com/sample/"
+  assert host.path_to_url("./sample/page.html", query="a=b") == "http://www.example.com/sample/page.html?a=b"
+  assert host.path_to_url("./test") == "http://www.example.com/test"
+
+def test_host_paths_to_urls ():
+  host = Host("http", "www.example.com", "./", use_filesystem=False)
+  assert list(host.paths_to_urls(["./", "./page.html", "./sample/page.html", "./sample/page2.html"])) == [
+    "http://www.example.com/",
+    "http://www.example.com/page.html",
+    "http://www.example.com/sample/page.html",
+    "http://www.example.com/sample/page2.html",
+  ]
+  assert list(host.paths_to_urls(["./sample"], is_dir=True)) == ["http://www.example.com/sample/"]
+
+def test_host_url_to_path ():
+  host = Host("http", "www.example.com", "./public")
+  assert host.url_to_path("http://www.example.com/") == Path("./public")
+  assert host.url_to_path("http://www.example.com/sitemap.xml") == Path("./public/sitemap.xml")
+  assert host.url_to_path("http://www.example.com/sample/page.html?a=b") == Path("./public/sample/page.html")
+  #スキームやドメインが一致しない URL は変換できない。
+  with pytest.raises(ValueError):
+    host.url_to_path("https://www.example.com/sitemap.xml")
+  with pytest.raises(ValueError):
+    host.url_to_path("http://www.example.org/sitemap.xml")
+
+def test_host_url_to_path2 (tmp_path):
+  host = Host("http", "www.example.com", "./public")
+  #root_dir を越えない ".." は解決される。
+  assert host.url_to_path("http://www.example.com/sample/../sitemap.xml") == Path("./public/sitemap.xml")
+  assert host.url_to_path("http://www.example.com/./sample/./page.html") == Path("./public/sample/page.html")
+  #root_dir の外を指す URL は変換できない。
+  for url in ("http://www.example.com/../../etc/passwd", "http://www.example.com/sample/../../etc/passwd", "http://www.example.com/.."):
+    with pytest.raises(ValueError):
+      host.url_to_path(url)
+  #シンボリックリンクにより root_dir の外を指す場合も変換できない。
+  tmp_path.joinpath("public").mkdir()
+  tmp_path.joinpath("public", "link").symlink_to(tmp_path)
+  host = Host("http", "www.example.com", tmp_path.joinpath("public"))
+  with pytest.raises(ValueError):
+    host.url_to_path("http://www.example.com/link/secret.txt")
+  assert Host("http", "www.example.com", tmp_path.joinpath("public"), use_filesystem=False).url_to_path("http://www.example.com/link/secret.txt") == tmp_path.joinpath("public", "link", "secret.txt")
+
+def test_host_registry ():
+  registry = HostRegistry([
+    Host("http", "www.example.com", "./public", use_filesystem=False),
+    Host("https", "blog.example.com", "./public/blog", use_filesystem=False),
+  ])
+  assert len(registry) == 2
+  #最も長く一致する root_dir を持つ Host が選択される。
+  assert registry.path_to_url("./public/page.html") == "http://www.example.com/page.html"
+  assert registry.path_to_url("./public/blog/post.html") == "https://blog.example.com/post.html"
+  assert registry.path_to_url("./public/blogs/post.html") == "http://www.example.com/blogs/post.html"
+  assert registry.url_to_path("https://blog.example.com/post.html") == Path("./public/blog/post.html")
+  assert registry.url_to_path("http://www.example.com/blog/post.html") == Path("./public/blog/post.html")
+  assert registry.find_by_path("./private/page.html") is None
+  assert registry.find_by_url("http://blog.example.com/post.html") is None
+  with pytest.raises(ValueError):
+    registry.path_to_url("./private/page.html")
+  with pytest.raises(ValueError):
+    registry.url_to_path("http://www.example.org/")
+  #同一の root_dir やドメインを持つ Host は登録できない。
+  with pytest.raises(ValueError):
+    registry.register(Host("http", "www.example.org", "./public"))
+  with pytest.raises(ValueError):
+    registry.register(Host("http", "www.example.com", "./other"))
+
+def test_host_registry2 ():
+  registry = HostRegistry([
+    Host("http", "www.example.com", "./public", use_filesystem=False),
+    Host("https", "blog.example.com", "./public/blog", use_filesystem=False),
+  ])
+  #相対パスと絶対パス、".." を含むパスも同じ Host に対応する。
+  assert registry.find_by_path(Path("./public/blog/post.html").absolute()).netloc == "blog.example.com"
+  assert registry.path_to_url(Path("./public/blog/post.html").absolute()) == "https://blog.example.com/post.html"
+  assert registry.path_to_url("./public/page/../blog/post.html") == "https://blog.example.com/post.html"
+  assert registry.path_to_url("./public/blog/../page.html") == "http://www.example.com/page.html"
+  assert registry.path_to_url("./public/blog/sample/") == "https://blog.example.com/sample/"
+  assert registry.find_by_path("./public/../private/page.html") is None
+  #表記の異なる同一の root_dir を持つ Host は登録できない。
+  with pytest.raises(ValueError):
+    registry.register(Host("http", "www.example.org", Path("./public/blog/").absolute()))
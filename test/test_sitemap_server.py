@@ -0,0 +1,167 @@
+import gzip
+import pytest
+import shutil
+import asyncio
+import datetime
+import threading
+from pathlib import Path
+from sitemap import Sitemap, Host, SitemapServer
+
+TEST_DIR = Path("./.test")
+
+def setup_function (function):
+  TEST_DIR.mkdir(parents=True, exist_ok=True)
+
+def teardown_function (function):
+  shutil.rmtree(TEST_DIR)
+
+def request (server:SitemapServer, path:str, **headers) -> tuple[str, dict[str, str], bytes]:
+  environ = {"REQUEST_METHOD": "GET", "PATH_INFO": path}
+  for name, value in headers.items():
+    environ["HTTP_" + name.upper()] = value
+  response = {}
+  def start_response (status, response_headers):
+    response["status"] = status
+    response["headers"] = dict(response_headers)
+  body = b"".join(server.wsgi(environ, start_response))
+  return response["status"], response["headers"], body
+
+#main
+
+def test_sitemap_server ():
+  host = Host("http", "www.example.com", TEST_DIR)
+  sitemap = Sitemap(TEST_DIR.joinpath("sitemap.xml"), max_count=1)
+  sitemap.register("http://www.example.com/", datetime.datetime(2025, 1, 23))
+  sitemap.register("http://www.example.com/page.html", datetime.datetime(2025, 1, 24))
+  server = SitemapServer(host, sitemap, TEST_DIR.joinpath("sitemap-index.xml"))
+  #配信される内容は save_files で保存した内容と同一になる。
+  status, headers, body = request(server, "/sitemap2.xml")
+  assert status == "200 OK"
+  assert headers["Content-Type"] == "application/xml; charset=utf-8"
+  sitemap.save_files()
+  assert body == TEST_DIR.joinpath("sitemap2.xml").read_bytes()
+  status, headers, body = request(server, "/sitemap-index.xml")
+  assert status == "200 OK"
+  assert body == b"<?xml version='1.0' encoding='utf-8'?>\n<sitemapindex xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\"><sitemap><loc>http://www.example.com/sitemap.xml</loc><lastmod>2025-01-23</lastmod></sitemap><sitemap><loc>http://www.example.com/sitemap2.xml</loc><lastmod>2025-01-24</lastmod></sitemap></sitemapindex>"
+  #存在しない文書は 404 になる。
+  status, headers, body = request(server, "/sitemap3.xml")
+  assert status == "404 Not Found"
+
+def test_sitemap_server2 ():
+
+  #gzip と条件付きの要求に対応する。
+
+  host = Host("http", "www.example.com", TEST_DIR)
+  sitemap = Sitemap(TEST_DIR.joinpath("sitemap.xml"))
+  sitemap.register("http://www.example.com/", datetime.datetime(2025, 1, 23))
+  server = SitemapServer(host, sitemap, TEST_DIR.joinpath("sitemap-index.xml"))
+  status, headers, body = request(server, "/sitemap.xml", accept_encoding="gzip, deflate")
+  assert headers["Content-Encoding"] == "gzip"
+  assert gzip.decompress(body) == sitemap.render_chunk(0).content
+  status, _, body = request(server, "/sitemap.xml", accept_encoding="gzip", if_none_match=headers["ETag"])
+  assert status == "304 Not Modified"
+  assert body == b""
+  status, _, _ = request(server, "/sitemap.xml", if_modified_since=headers["Last-Modified"])
+  assert status == "304 Not Modified"
+  #内容が変更されれば新たな文書が配信される。
+  sitemap.register("http://www.example.com/", datetime.datetime(2025, 1, 24))
+  status, new_headers, _ = request(server, "/sitemap.xml", accept_encoding="gzip", if_none_match=headers["ETag"])
+  assert status == "200 OK"
+  assert new_headers["ETag"] != headers["ETag"]
+
+def test_sitemap_server3 ():
+
+  #ASGI アプリケーションとしても動作する。
+
+  host = Host("http", "www.example.com", TEST_DIR)
+  sitemap = Sitemap(TEST_DIR.joinpath("sitemap.xml"))
+  sitemap.register("http://www.example.com/", datetime.datetime(2025, 1, 23))
+  server = SitemapServer(host, sitemap, TEST_DIR.joinpath("sitemap-index.xml"))
+  messages = []
+  async def receive ():
+    return {"type": "http.request", "body": b"", "more_body": False}
+  async def send (message):
+    messages.append(message)
+  asyncio.run(server.asgi({"type": "http", "method": "GET", "path": "/sitemap.xml", "headers": []}, receive, send))
+  assert messages[0]["status"] == 200
+  assert messages[1]["body"] == sitemap.render_chunk(0).content
+
+def test_sitemap_server4 ():
+
+  #品質値が 0 の gzip は許可されないものとして扱う。
+
+  host = Host("http", "www.example.com", TEST_DIR)
+  sitemap = Sitemap(TEST_DIR.joinpath("sitemap.xml"))
+  sitemap.register("http://www.example.com/", datetime.datetime(2025, 1, 23))
+  server = SitemapServer(host, sitemap, TEST_DIR.joinpath("sitemap-index.xml"))
+  for accept_encoding in ("gzip;q=0", "gzip; q=0.0, deflate", "*, gzip;q=0", "identity", "x-gzipped"):
+    status, headers, body = request(server, "/sitemap.xml", accept_encoding=accept_encoding)
+    assert "Content-Encoding" not in headers
+    assert body == sitemap.render_chunk(0).content
+  for accept_encoding in ("gzip;q=0.5", "deflate, *", "GZIP"):
+    status, headers, body = request(server, "/sitemap.xml", accept_encoding=accept_encoding)
+    assert headers["Content-Encoding"] == "gzip"
+
+def test_sitemap_server5 ():
+
+  #別のスレッドから登録を続けている間も配信できる。
+
+  host = Host("http", "www.example.com", TEST_DIR)
+  sitemap = Sitemap(TEST_DIR.joinpath("sitemap.xml"), max_count=100)
+  server = SitemapServer(host, sitemap, TEST_DIR.joinpath("sitemap-index.xml"))
+  def register ():
+    for index in range(2000):
+      sitemap.register("http://www.example.com/{:05d}.html".format(index), datetime.datetime(2025, 1, 23))
+  thread = threading.Thread(target=register)
+  thread.start()
+  while thread.is_alive():
+    status, _, _ = request(server, "/sitemap-index.xml")
+    assert status == "200 OK"
+    status, _, _ = request(server, "/sitemap.xml")
+    assert status in ("200 OK", "404 Not Found")
+  thread.join()
+  status, _, body = request(server, "/sitemap-index.xml")
+  assert body.count(b"<sitemap>") == 20
+
+def test_sitemap_server6 ():
+  host = Host("http", "www.example.com", TEST_DIR)
+  sitemap = Sitemap(TEST_DIR.joinpath("sitemap.xml"), max_count=1)
+  sitemap.register("http://www.example.com/", datetime.datetime(2025, 1, 23))
+  sitemap.register("http://www.example.com/page.html", datetime.datetime(2025, 1, 24))
+  server = SitemapServer(host, sitemap, TEST_DIR.joinpath("sitemap-index.xml"))
+  render_chunk = sitemap.render_chunk
+  rendered = []
+  started = threading.Event()
+  resumed = threading.Event()
+  def slow_render_chunk (index:int, use_indent:bool=False):
+    rendered.append(index)
+    if index == 1:
+      started.set()
+      resumed.wait()
+    return render_chunk(index, use_indent)
+  sitemap.render_chunk = slow_render_chunk
+  responses = []
+  threads = [threading.Thread(target=lambda: responses.append(request(server, "/sitemap2.xml"))) for _ in range(2)]
+  for thread in threads:
+    thread.start()
+  started.wait()
+  #作成中の文書があっても、他の文書は待たされることなく配信される。
+  other_responses = []
+  other_thread = threading.Thread(target=lambda: other_responses.append(request(server, "/sitemap.xml")))
+  other_thread.start()
+  other_thread.join(5)
+  blocked = other_thread.is_alive()
+  resumed.set()
+  for thread in [*threads, other_thread]:
+    thread.join()
+  assert not blocked
+  assert [status for status, _, _ in other_responses] == ["200 OK"]
+  #同時に要求された同じ文書は一度のみ作成される。
+  assert [status for status, _, _ in responses] == ["200 OK", "200 OK"]
+  assert rendered == [1, 0]
+  #登録内容の変更後に作成された文書は、次の要求でもキャッシュから配信される。
+  sitemap.register("http://www.example.com/page.html", datetime.datetime(2025, 1, 25))
+  rendered.clear()
+  request(server, "/sitemap2.xml")
+  request(server, "/sitemap2.xml")
+  assert rendered == [1]
@@ -0,0 +1,146 @@
+import copy
+import pickle
+import pytest
+import shutil
+import datetime
+import threading
+from pathlib import Path
+from sitemap import Sitemap, ImageSitemap, PageSitemap, NewsSitemap, SitemapIndex, PhaseMetric, CallbackMetricsCollector, iterparse_urls
+from sitemap.news_sitemap import News
+from sitemap.sitemap import URL
+
+TEST_DIR = Path("./.test")
+
+def setup_function (function):
+  TEST_DIR.mkdir(parents=True, exist_ok=True)
+
+def teardown_function (function):
+  shutil.rmtree(TEST_DIR)
+
+#main
+
+def test_sitemap_snapshot ():
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"))
+  sitemap.register("http://www.example.com/", datetime.datetime(2025, 1, 23))
+  data = sitemap.snapshot()
+  sitemap.register("http://www.example.com/page.html", datetime.datetime(2025, 1, 23))
+  #復元すると、スナップショットを作成した時点の登録内容に戻る。
+  sitemap.restore(data)
+  assert [url.loc for url in sitemap.list_all()] == ["http://www.example.com/"]
+  sitemap.register("http://www.example.com/page.html", datetime.datetime(2025, 1, 23))
+  assert [url.loc for url in sitemap.list_all()] == ["http://www.example.com/", "http://www.example.com/page.html"]
+
+def test_sitemap_clone ():
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"), max_count=1, track_changes=True)
+  sitemap.register("http://www.example.com/", datetime.datetime(2025, 1, 23))
+  for clone in (sitemap.clone(), copy.copy(sitemap), pickle.loads(pickle.dumps(sitemap))):
+    #複製は元のオブジェクトと独立している。
+    clone.register("http://www.example.com/page.html", datetime.datetime(2025, 1, 23))
+    assert len(clone.list_all()) == 2
+    assert len(sitemap.list_all()) == 1
+    assert clone.chunk_count() == 2
+    assert clone.checkpoint == 2
+    clone.close()
+  assert not sitemap.closed
+
+def test_image_sitemap_clone ():
+  image_sitemap = ImageSitemap(TEST_DIR.joinpath("sample.xml"))
+  image_sitemap.register("http://www.example.com/", "http://www.example.com/image.png")
+  for clone in (image_sitemap.clone(), pickle.loads(pickle.dumps(image_sitemap))):
+    clone.register("http://www.example.com/", "http://www.example.com/image2.png")
+    assert len(clone.get("http://www.example.com/").images) == 2
+    assert len(image_sitemap.get("http://www.example.com/").images) == 1
+
+def test_sitemap_index_clone ():
+  sitemap_index = SitemapIndex(TEST_DIR.joinpath("sample.xml"))
+  sitemap_index.register("http://www.example.com/sitemap.xml", datetime.datetime(2025, 1, 23))
+  for clone in (sitemap_index.clone(), pickle.loads(pickle.dumps(sitemap_index))):
+    clone.register("http://www.example.com/sitemap2.xml", datetime.datetime(2025, 1, 23))
+    assert len(clone.list_all()) == 2
+    assert len(sitemap_index.list_all()) == 1
+
+def test_sitemap_snapshot2 ():
+
+  #閉じられたオブジェクトは複製できない。
+
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"))
+  sitemap.close()
+  with pytest.raises(Exception):
+    sitemap.snapshot()
+  with pytest.raises(Exception):
+    pickle.dumps(sitemap)
+
+def test_sitemap_isolated_save ():
+  sitemap = None
+  def on_metric (metric):
+    #保存の途中で登録された内容は、保存されるファイルに含まれない。
+    if isinstance(metric, PhaseMetric) and metric.phase == "snapshot":
+      sitemap.register("http://www.example.com/page2.html", datetime.datetime(2025, 1, 23))
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"), metrics=CallbackMetricsCollector(on_metric), isolated_save=True)
+  sitemap.register("http://www.example.com/", datetime.datetime(2025, 1, 23))
+  sitemap.register("http://www.example.com/page.html", datetime.datetime(2025, 1, 23))
+  sitemap_files = sitemap.save_files()
+  assert [url.loc for url in iterparse_urls(sitemap_files[0].file)] == ["http://www.example.com/", "http://www.example.com/page.html"]
+  assert len(sitemap.list_all()) == 3
+
+def test_sitemap_isolated_save2 ():
+  #保存中も別のスレッドから登録を続けることができる。
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"), max_count=100, isolated_save=True)
+  sitemap.register_many(URL("http://www.example.com/{:05d}.html".format(index), datetime.datetime(2025, 1, 23)) for index in range(1000))
+  def register ():
+    for index in range(1000, 2000):
+      sitemap.register("http://www.example.com/{:05d}.html".format(index), datetime.datetime(2025, 1, 23))
+  thread = threading.Thread(target=register)
+  thread.start()
+  sitemap_files = sitemap.save_files()
+  thread.join()
+  locs = [url.loc for sitemap_file in sitemap_files for url in iterparse_urls(sitemap_file.file)]
+  assert 1000 <= len(locs)
+  assert locs == ["http://www.example.com/{:05d}.html".format(index) for index in range(len(locs))]
+  assert len(sitemap.list_all()) == 2000
+
+def test_page_sitemap_snapshot ():
+
+  #PageSitemap, ExtensionSitemap も同様に直列化・復元できる。
+
+  page_sitemap = PageSitemap(TEST_DIR.joinpath("sample.xml"))
+  page_sitemap.register("http://www.example.com/", datetime.datetime(2025, 1, 23))
+  data = page_sitemap.snapshot()
+  page_sitemap.register("http://www.example.com/page.html", datetime.datetime(2025, 1, 23))
+  page_sitemap.restore(data)
+  assert [page.loc for page in page_sitemap.list_all()] == ["http://www.example.com/"]
+  clone = pickle.loads(pickle.dumps(page_sitemap))
+  assert clone.list_all() == page_sitemap.list_all()
+  news_sitemap = NewsSitemap(TEST_DIR.joinpath("news.xml"))
+  news_sitemap.register("http://www.example.com/", News("The Example Times", "en", datetime.datetime(2025, 1, 23), "title"))
+  data = news_sitemap.snapshot()
+  news_sitemap.clear()
+  news_sitemap.restore(data)
+  for clone in (copy.copy(news_sitemap), pickle.loads(pickle.dumps(news_sitemap))):
+    assert clone.list_all() == news_sitemap.list_all() != []
+
+def test_concurrent_read ():
+  #別のスレッドから登録を続けている間も、取得や保存を行うことができる。
+  sitemap = Sitemap(TEST_DIR.joinpath("sample.xml"), max_count=100)
+  image_sitemap = ImageSitemap(TEST_DIR.joinpath("image.xml"), max_count=100)
+  news_sitemap = NewsSitemap(TEST_DIR.joinpath("news.xml"), max_count=100)
+  def register ():
+    for index in range(2000):
+      loc = "http://www.example.com/{:05d}.html".format(index)
+      sitemap.register(loc, datetime.datetime(2025, 1, 23))
+      image_sitemap.register(loc, "http://www.example.com/{:05d}.png".format(index))
+      news_sitemap.register(loc, News("The Example Times", "en", datetime.datetime(2025, 1, 23), "title"))
+  thread = threading.Thread(target=register)
+  thread.start()
+  while thread.is_alive():
+    sitemap.chunk_count()
+    sitemap.chunk_last_mods()
+    sitemap.get("http://www.example.com/00000.html")
+    sitemap.get_alternates("http://www.example.com/00000.html")
+    image_sitemap.get("http://www.example.com/00000.html")
+    news_sitemap.get("http://www.example.com/00000.html")
+    sitemap.save_files()
+    image_sitemap.save_files()
+    news_sitemap.save_files()
+  thread.join()
+  assert len(sitemap.list_all()) == len(image_sitemap.list_all()) == len(news_sitemap.list_all()) == 2000
@@ -0,0 +1,46 @@
+import shutil
+import datetime
+from pathlib import Path
+from sitemap.video_sitemap import VideoSitemap, Video
+
+TEST_DIR = Path("./.test")
+
+def setup_function (function):
+  TEST_DIR.mkdir(parents=True, exist_ok=True)
+
+def teardown_function (function):
+  shutil.rmtree(TEST_DIR)
+
+#main
+
+def test_video_sitemap ():
+  video_sitemap = VideoSitemap(TEST_DIR.joinpath("sample.xml"))
+  video_sitemap.register("http://www.example.com/video.html", Video("http://www.example.com/thumbnail.jpg", "title", "description", content_loc="http://www.example.com/video.mp4", duration=600, rating=4.5, family_friendly=True, live=False))
+  video_sitemap.register("http://www.example.com/video.html", Video("http://www.example.com/thumbnail2.jpg", "title2", "description2", player_loc="http://www.example.com/player?video=2"))
+  assert [sitemap_file.file for sitemap_file in video_sitemap.save_files()] == [TEST_DIR.joinpath("sample.xml")]
+  with open(TEST_DIR.joinpath("sample.xml"), "r") as file:
+    assert file.read() == "<?xml version='1.0' encoding='utf-8'?>\n<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\" xmlns:video=\"http://www.google.com/schemas/sitemap-video/1.1\"><url><loc>http://www.example.com/video.html</loc><video:video><video:thumbnail_loc>http://www.example.com/thumbnail.jpg</video:thumbnail_loc><video:title>title</video:title><video:description>description</video:description><video:content_loc>http://www.example.com/video.mp4</video:content_loc><video:duration>600</video:duration><video:rating>4.5</video:rating><video:family_friendly>yes</video:family_friendly><video:live>no</video:live></video:video><video:video><video:thumbnail_loc>http://www.example.com/thumbnail2.jpg</video:thumbnail_loc><video:title>title2</video:title><video:description>description2</video:description><video:player_loc>http://www.example.com/player?video=2</video:player_loc></video:video></url></urlset>"
+
+def test_video_sitemap2 ():
+
+  #同一の thumbnail_loc を持つ動画は更新される。
+
+  video_sitemap = VideoSitemap(TEST_DIR.joinpath("sample.xml"))
+  video_sitemap.register("http://www.example.com/video.html", Video("http://www.example.com/thumbnail.jpg", "title", "description"))
+  video_sitemap.register("http://www.example.com/video.html", Video("http://www.example.com/thumbnail.jpg", "title2", "description2", view_count=10))
+  assert video_sitemap.get("http://www.example.com/video.html") == [Video("http://www.example.com/thumbnail.jpg", "title2", "description2", view_count=10)]
+  video_sitemap.unregister("http://www.example.com/video.html")
+  assert video_sitemap.list_all() == []
+
+def test_video_sitemap_load ():
+  video_sitemap = VideoSitemap(TEST_DIR.joinpath("sample.xml"), max_count=1)
+  video_sitemap.register("http://www.example.com/video.html", Video("http://www.example.com/thumbnail.jpg", "title", "description", content_loc="http://www.example.com/video.mp4", duration=600, expiration_date=datetime.datetime(2025, 12, 31, 23, 59), view_count=100, publication_date=datetime.datetime(2025, 1, 23, 12, 0), requires_subscription=False))
+  video_sitemap.register("http://www.example.com/video.html", Video("http://www.example.com/thumbnail2.jpg", "title2", "description2", player_loc="http://www.example.com/player", live=True))
+  video_sitemap.register("http://www.example.com/video2.html", Video("http://www.example.com/thumbnail3.jpg", "title3", "description3", player_loc="http://www.example.com/player"))
+  sitemap_files = video_sitemap.save_files()
+  assert len(sitemap_files) == 2
+  for lazy_load in (False, True):
+    loaded_video_sitemap = VideoSitemap(TEST_DIR.joinpath("sample2.xml"), lazy_load=lazy_load)
+    for sitemap_file in sitemap_files:
+      loaded_video_sitemap.load(sitemap_file.file)
+    assert loaded_video_sitemap.list_all() == video_sitemap.list_all()